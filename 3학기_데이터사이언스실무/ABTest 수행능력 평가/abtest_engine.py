@@ -0,0 +1,288 @@
+from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+from statsmodels.stats.multitest import multipletests
+
+
+class ArmStats():
+    '''
+    per-arm sufficient statistics (n, mean, centered sum of squares) for each metric.
+
+    chunks and workers each build their own ArmStats and merge() them, using the
+    pairwise update of Chan et al. so the variance stays stable for large n.
+    with segment_cols the table is keyed by (segment..., arm) for drill-down analysis.
+    '''
+
+    def __init__(self, group_col='release', metrics=('clicked', 'purchase_amount'), segment_cols=()):
+
+        self.group_col = group_col
+        self.metrics = list(metrics)
+        self.segment_cols = list(segment_cols)
+        self.table = {metric: pd.DataFrame(columns=['n', 'mean', 'm2'], dtype=float) for metric in self.metrics}
+
+    @staticmethod
+    def _combine(a, b):
+        a, b = a.align(b, join='outer', axis=0, fill_value=0.0)
+        n = a['n'] + b['n']
+        delta = b['mean'] - a['mean']
+        frac = (b['n'] / n).fillna(0.0)
+
+        return pd.DataFrame({
+            'n': n,
+            'mean': a['mean'] + delta * frac,
+            'm2': a['m2'] + b['m2'] + delta ** 2 * a['n'] * frac,
+        })
+
+    def update(self, df):
+        # a single groupby pass covers every segment, arm and metric of the chunk
+        keys = self.segment_cols + [self.group_col]
+        agg = df.groupby(keys, sort=True, observed=True)[self.metrics].agg(['count', 'mean', 'var'])
+        for metric in self.metrics:
+            chunk = pd.DataFrame({
+                'n': agg[(metric, 'count')].astype(float),
+                'mean': agg[(metric, 'mean')],
+                'm2': agg[(metric, 'var')].fillna(0.0) * (agg[(metric, 'count')] - 1),
+            })
+            self.table[metric] = chunk if self.table[metric].empty else self._combine(self.table[metric], chunk)
+        return self
+
+    def merge(self, other):
+        for metric in self.metrics:
+            if self.table[metric].empty:
+                self.table[metric] = other.table[metric]
+            elif not other.table[metric].empty:
+                self.table[metric] = self._combine(self.table[metric], other.table[metric])
+        return self
+
+    @property
+    def arms(self):
+        return sorted(self.table[self.metrics[0]].index.get_level_values(self.group_col).unique())
+
+    def n(self, metric):
+        return self.table[metric]['n']
+
+    def mean(self, metric):
+        return self.table[metric]['mean']
+
+    def var(self, metric, ddof=1):
+        return self.table[metric]['m2'] / (self.table[metric]['n'] - ddof)
+
+    def summary(self):
+        return pd.concat({metric: self.table[metric].assign(var=self.var(metric))
+                          for metric in self.metrics}, axis=1)
+
+
+def read_csv_stats(path, group_col='release', metrics=('clicked', 'purchase_amount'),
+                   chunksize=1000000, query=None, segment_cols=()):
+    # one pass over the CSV, holding a single chunk in memory at a time
+    arm_stats = ArmStats(group_col, metrics, segment_cols)
+    usecols = list(segment_cols) + [group_col] + list(metrics)
+
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunksize):
+        if query:
+            chunk = chunk.query(query)
+        arm_stats.update(chunk)
+
+    return arm_stats
+
+
+def read_csv_stats_parallel(paths, group_col='release', metrics=('clicked', 'purchase_amount'),
+                            chunksize=1000000, query=None, segment_cols=(), n_jobs=4):
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [executor.submit(read_csv_stats, path, group_col, metrics, chunksize, query, segment_cols)
+                   for path in paths]
+        parts = [future.result() for future in futures]
+
+    arm_stats = ArmStats(group_col, metrics, segment_cols)
+    for part in parts:
+        arm_stats.merge(part)
+    return arm_stats
+
+
+# group2 - group 1 신뢰구간 계산하기
+def calc_proportion_test_ci(n1, p1, n2, p2, alpha=0.05):
+    # minitab : https://support.minitab.com/ko-kr/minitab/18/help-and-how-to/statistics/basic-statistics/how-to/2-proportions/methods-and-formulas/methods-and-formulas/
+    se = np.sqrt(p1 * (1 - p1) / n1 + p2 * (1 - p2) / n2)
+    diff_prop = p2 - p1
+    z = stats.norm.ppf(1 - alpha / 2)
+    return diff_prop - z * se, diff_prop + z * se
+
+
+def _proportion_tests(n1, p1, n2, p2, alpha=0.05):
+    cl_ll, cl_ul = calc_proportion_test_ci(n1, p1, n2, p2, alpha=alpha)
+
+    # pooled two-proportion z-test, as statsmodels proportions_ztest
+    pooled = (p1 * n1 + p2 * n2) / (n1 + n2)
+    z_stat = (p1 - p2) / np.sqrt(pooled * (1 - pooled) * (1 / n1 + 1 / n2))
+    pval = 2 * stats.norm.sf(np.abs(z_stat))
+
+    return {
+        '평균차이': p2 - p1,
+        '신뢰구간_하한': cl_ll,
+        '신뢰구간_상한': cl_ul,
+        'z_통계량': z_stat,
+        'p값': pval,
+    }
+
+
+def _t_tests(n1, mu1, var1, n2, mu2, var2, alpha=0.05, eqvar=True):
+    # Student (eqvar=True) or Welch t-test from the per-arm mean / variance
+    t_stat, pval = stats.ttest_ind_from_stats(mu1, np.sqrt(var1), n1, mu2, np.sqrt(var2), n2, equal_var=eqvar)
+
+    diff_mean = mu1 - mu2
+    se_diff = np.sqrt(var1 / n1 + var2 / n2)
+    z = stats.norm.ppf(1 - alpha / 2)
+
+    return {
+        '평균차이': diff_mean,
+        '신뢰구간_하한': diff_mean - z * se_diff,
+        '신뢰구간_상한': diff_mean + z * se_diff,
+        'z_통계량': diff_mean / se_diff,
+        't_통계량': t_stat,
+        'p값': pval,
+    }
+
+
+def _pairs(arm_stats, groups=None):
+    groups = sorted(groups) if groups is not None else arm_stats.arms
+    return list(combinations(groups, 2))
+
+
+def _correct(result, alpha, method):
+    if method:
+        rejects, p_adj, _, _ = multipletests(result['p값'], alpha=alpha, method=method)
+        result['보정_p값'] = p_adj
+        result['기각'] = rejects
+    return result
+
+
+def analysis_pair_wise_abt(arm_stats, metric='clicked', groups=None, alpha=0.05, method='bonferroni'):
+    # same output as the notebook's analysis_pair_wise_abt, for every pair at once
+    pairs = _pairs(arm_stats, groups)
+    g1 = [pair[0] for pair in pairs]
+    g2 = [pair[1] for pair in pairs]
+
+    n, p = arm_stats.n(metric), arm_stats.mean(metric)
+    columns = _proportion_tests(n[g1].to_numpy(), p[g1].to_numpy(), n[g2].to_numpy(), p[g2].to_numpy(), alpha)
+
+    result = pd.DataFrame({'group1': g1, 'group2': g2, **columns})
+    return _correct(result, alpha, method)
+
+
+def analysis_pair_wise_abt_by_parametric(arm_stats, metric='purchase_amount', groups=None, alpha=0.05,
+                                         eqvar=True, method='bonferroni'):
+    pairs = _pairs(arm_stats, groups)
+    g1 = [pair[0] for pair in pairs]
+    g2 = [pair[1] for pair in pairs]
+
+    n, mu, var = arm_stats.n(metric), arm_stats.mean(metric), arm_stats.var(metric)
+    columns = _t_tests(n[g1].to_numpy(), mu[g1].to_numpy(), var[g1].to_numpy(),
+                       n[g2].to_numpy(), mu[g2].to_numpy(), var[g2].to_numpy(), alpha, eqvar)
+
+    result = pd.DataFrame({'group1': g1, 'group2': g2, **columns})
+    return _correct(result, alpha, method)
+
+
+def contingency_table(arm_stats, metric='clicked'):
+    # a 0/1 metric's contingency table is fully determined by n and the mean
+    n = arm_stats.n(metric)
+    clicked = np.round(arm_stats.mean(metric) * n)
+    return pd.DataFrame({0: n - clicked, 1: clicked}).astype(np.int64)
+
+
+def chi_square_test(arm_stats, metric='clicked'):
+    chi2, p, dof, expected = stats.chi2_contingency(contingency_table(arm_stats, metric))
+    return chi2, p, dof, expected
+
+
+def _segment_pairs(table, segment_cols, group_col):
+    # every (segment, group1 < group2) row with both arms' statistics side by side
+    flat = table.reset_index()
+    pairs = flat.merge(flat, on=segment_cols, suffixes=('1', '2'))
+    pairs = pairs[pairs[group_col + '1'] < pairs[group_col + '2']]
+    return pairs.rename(columns={group_col + '1': 'group1', group_col + '2': 'group2'}).reset_index(drop=True)
+
+
+def _segment_tests(table, segment_cols, group_col, test, alpha, eqvar):
+    pairs = _segment_pairs(table, segment_cols, group_col)
+    n1, mu1, n2, mu2 = (pairs[col].to_numpy() for col in ['n1', 'mean1', 'n2', 'mean2'])
+    if test == 'proportion':
+        columns = _proportion_tests(n1, mu1, n2, mu2, alpha)
+    elif test == 't':
+        var1, var2 = pairs['m21'].to_numpy() / (n1 - 1), pairs['m22'].to_numpy() / (n2 - 1)
+        columns = _t_tests(n1, mu1, var1, n2, mu2, var2, alpha, eqvar)
+    else:
+        raise ValueError(f'unknown test: {test}')
+
+    return pd.concat([pairs[segment_cols + ['group1', 'group2', 'n1', 'n2']],
+                      pd.DataFrame(columns, index=pairs.index)], axis=1)
+
+
+def _bh_adjust(pvals, families):
+    # Benjamini-Hochberg adjusted p-values within each family, vectorised over families
+    frame = pd.DataFrame({'p': np.asarray(pvals, dtype=float), 'family': np.asarray(families)})
+    frame = frame.sort_values(['family', 'p'], kind='stable')
+    rank = frame.groupby('family').cumcount() + 1
+    size = frame.groupby('family')['p'].transform('size')
+
+    scaled = (frame['p'] * size / rank)[::-1]
+    adjusted = scaled.groupby(frame['family'][::-1]).cummin()[::-1].clip(upper=1.0)
+    return adjusted.reindex(range(len(frame))).to_numpy()
+
+
+def hierarchical_fdr(result, segment_cols, alpha=0.05):
+    '''
+    two-level FDR control for drill-down results (Benjamini & Bogomolov, 2014).
+
+    segments are screened by BH on their Simes p-value, then pairs inside the R selected
+    segments (out of S) are tested by BH at level alpha * R / S.
+    '''
+    result = result.reset_index(drop=True)
+    segment = result[segment_cols].astype(str).agg('|'.join, axis=1)
+
+    # Simes combination of the pairwise p-values of each segment
+    order = result.assign(segment=segment).sort_values(['segment', 'p값'], kind='stable')
+    rank = order.groupby('segment').cumcount() + 1
+    size = order.groupby('segment')['p값'].transform('size')
+    simes = (order['p값'] * size / rank).groupby(order['segment']).min()
+
+    segment_p = _bh_adjust(simes.to_numpy(), np.zeros(len(simes)))
+    selected = pd.Series(segment_p <= alpha, index=simes.index)
+    level = alpha * selected.sum() / len(selected) if len(selected) else 0.0
+
+    result['세그먼트_p값'] = segment.map(simes).to_numpy()
+    result['세그먼트_보정_p값'] = segment.map(pd.Series(segment_p, index=simes.index)).to_numpy()
+    result['세그먼트_선택'] = segment.map(selected).to_numpy()
+    result['보정_p값'] = _bh_adjust(result['p값'], segment)
+    result['기각'] = result['세그먼트_선택'] & (result['보정_p값'] <= level)
+    return result
+
+
+def analysis_pair_wise_by_segment(arm_stats, metric='clicked', test='proportion', alpha=0.05, eqvar=True,
+                                  n_jobs=1):
+    '''
+    all pairwise tests for every segment of an ArmStats built with segment_cols.
+
+    tests are vectorised over (segment, pair) rows; for high-cardinality segments
+    the rows are split by segment across n_jobs processes.
+    '''
+    segment_cols = arm_stats.segment_cols
+    if not segment_cols:
+        raise ValueError('ArmStats has no segment_cols')
+
+    table = arm_stats.table[metric]
+    args = (segment_cols, arm_stats.group_col, test, alpha, eqvar)
+
+    if n_jobs == 1:
+        result = _segment_tests(table, *args)
+    else:
+        codes = pd.Series(table.index.droplevel(arm_stats.group_col).factorize()[0]) % n_jobs
+        parts = [table[(codes == k).to_numpy()] for k in range(n_jobs)]
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [executor.submit(_segment_tests, part, *args) for part in parts if len(part)]
+            result = pd.concat([future.result() for future in futures], ignore_index=True)
+        result = result.sort_values(segment_cols + ['group1', 'group2'], kind='stable')
+
+    return hierarchical_fdr(result, segment_cols, alpha)
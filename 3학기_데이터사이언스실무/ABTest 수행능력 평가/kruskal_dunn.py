@@ -0,0 +1,96 @@
+from itertools import combinations
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+from statsmodels.stats.multitest import multipletests
+
+
+class KruskalDunn():
+    '''
+    multi-arm rank test: Kruskal-Wallis omnibus plus Dunn pairwise contrasts.
+
+    all arms are ranked once; H and every Dunn z come from the same rank sums,
+    instead of re-ranking the pooled data of each pair as pairwise MannWhitney does.
+    '''
+
+    def __init__(self, groups, sig=0.05, method='bonferroni'):
+
+        # groups: {name: data} or a list of arrays (named 0..k-1)
+        if not isinstance(groups, dict):
+            groups = dict(enumerate(groups))
+
+        self.names = list(groups.keys())
+        self.data = [np.asarray(groups[name], dtype=float) for name in self.names]
+        self.sig = sig
+        self.method = method
+
+        self.sizes = np.array([len(data) for data in self.data])
+        if len(self.names) < 2:
+            raise ValueError('at least two groups are required')
+        if self.sizes.min() < 1:
+            raise ValueError('data is too small')
+
+    @classmethod
+    def from_frame(cls, df, group_col, value_col, sig=0.05, method='bonferroni'):
+        groups = {name: values.to_numpy() for name, values in df.groupby(group_col, sort=True)[value_col]}
+        return cls(groups, sig=sig, method=method)
+
+    def rank(self):
+        pooled = np.concatenate(self.data)
+        ranked = stats.rankdata(pooled)
+
+        bounds = np.cumsum(self.sizes)[:-1]
+        self.rank_sums = np.array([np.sum(part) for part in np.split(ranked, bounds)])
+        self.mean_ranks = self.rank_sums / self.sizes
+
+        _, ties = np.unique(pooled, return_counts=True)
+        self.tie_sum = np.sum(ties.astype(float) ** 3 - ties)
+        self.n = len(pooled)
+
+        return self.rank_sums
+
+    def test(self):
+        if not hasattr(self, 'rank_sums'):
+            self.rank()
+
+        n = float(self.n)
+        h = 12.0 / (n * (n + 1)) * np.sum(self.rank_sums ** 2 / self.sizes) - 3 * (n + 1)
+
+        T = 1 - self.tie_sum / (n ** 3 - n)
+        if T == 0:
+            raise ValueError('all values are identical')
+
+        self.stat = h / T
+        self.dof = len(self.names) - 1
+        self.p = stats.chi2.sf(self.stat, self.dof)
+        self.is_sig = self.p <= self.sig
+
+        return self.stat, self.p
+
+    def posthoc(self):
+        if not hasattr(self, 'rank_sums'):
+            self.rank()
+
+        n = float(self.n)
+        # Dunn (1964) variance with tie correction
+        var = n * (n + 1) / 12.0 - self.tie_sum / (12.0 * (n - 1))
+
+        pairs = list(combinations(range(len(self.names)), 2))
+        i, j = np.array(pairs).T
+
+        diff = self.mean_ranks[i] - self.mean_ranks[j]
+        z = diff / np.sqrt(var * (1.0 / self.sizes[i] + 1.0 / self.sizes[j]))
+        p = 2 * stats.norm.sf(np.abs(z))
+        reject, p_adj, _, _ = multipletests(p, alpha=self.sig, method=self.method)
+
+        self.pairwise = pd.DataFrame({
+            'group1': [self.names[k] for k in i],
+            'group2': [self.names[k] for k in j],
+            'mean_rank_diff': diff,
+            'z': z,
+            'p': p,
+            'p_adj': p_adj,
+            'reject': reject,
+        })
+
+        return self.pairwise
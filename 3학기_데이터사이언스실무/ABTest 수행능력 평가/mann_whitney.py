@@ -3,6 +3,7 @@ import numpy as np
 import scipy.stats as stats
 from scipy import optimize
 import math
+from rank_resampling import RankResampler
 
 class MannWhitney():
     '''
@@ -12,12 +13,12 @@ class MannWhitney():
     def __init__(self, data1, data2=None, tail='two-sided', sig=0.05):
 
         self.data1 = data1
-        self.data2 = data1 if data2 is None else data1
+        self.data2 = data1 if data2 is None else data2
         self.tail = tail
         self.sig = sig
 
         self.n1 = len(data1)
-        self.n2 = len(data2)
+        self.n2 = len(self.data2)
 
         self.crit_05 = pd.DataFrame(
             {'2': [-1.0, -1.0, -1.0, -1.0, -1.0, -1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0, 1.0, 2.0, 2.0, 2.0, 2.0,
@@ -119,8 +120,8 @@ class MannWhitney():
                 n1 *= decay
             else:
                 n2 *= decay
-        n1 = np.math.ceil(n1)
-        n2 = np.math.ceil(n2)
+        n1 = math.ceil(n1)
+        n2 = math.ceil(n2)
 
         if n1 != len(data1):
             data1 = np.random.choice(data1, size=n1, replace=False)
@@ -138,10 +139,23 @@ class MannWhitney():
 
         # the Kth smallest to the Kth largest of the n x m differences then determine ??? ??? ?? ??
         # the confidence interval, where K is:
-        k = np.math.ceil(self.n1 * self.n2 / 2 - (N * (self.n1 * self.n2 * (self.n1 + self.n2 + 1) / 12) ** 0.5))
+        k = math.ceil(self.n1 * self.n2 / 2 - (N * (self.n1 * self.n2 * (self.n1 + self.n2 + 1) / 12) ** 0.5))
 
         return round(diffs[k - 1], 3), round(mid, 3), round(diffs[len(diffs) - k], 3)
 
+    def resampler(self, n_resamples=10000, memory_budget=64 * 2 ** 20, n_jobs=1, seed=None):
+        return RankResampler(self.data1, self.data2, tail=self.tail, sig=self.sig, n_resamples=n_resamples,
+                             memory_budget=memory_budget, n_jobs=n_jobs, seed=seed)
+
+    def calc_effectsize_ci(self, **kwargs):
+        return self.resampler(**kwargs).calc_effectsize_ci()
+
+    def calc_median_diff_ci(self, **kwargs):
+        return self.resampler(**kwargs).calc_median_diff_ci()
+
+    def calc_permutation_p(self, **kwargs):
+        return self.resampler(**kwargs).calc_pvalue()
+
     def calc_power(self, n=None, mde=None):
         mu1 = np.mean(self.data1)
 
@@ -152,7 +166,7 @@ class MannWhitney():
         else:
             mu2 = np.mean(self.data2)
             effect_size = mu1 - mu2
-            n1, n2 = len(self.data1) / (np.pi / 3), len(self.data1) / (np.pi / 3)
+            n1, n2 = len(self.data1) / (np.pi / 3), len(self.data2) / (np.pi / 3)
 
         x = np.asarray(self.data1)
         y = np.asarray(self.data2)
@@ -162,7 +176,8 @@ class MannWhitney():
         parameter = effect_size / sd / np.sqrt(1 / n1 + 1 / n2)
         critic = stats.t.isf(self.sig / 2, dof)
         greater = stats.nct.sf(critic, dof, parameter)
-        less = stats.nct.cdf(-critic, dof, parameter)
+        # nct.cdf(-c, nc) == nct.sf(c, -nc); the cdf form returns nan far in the tail
+        less = stats.nct.sf(critic, dof, -parameter)
 
         if self.tail == 'two-sided':
             power = greater + less
@@ -195,7 +210,7 @@ class MannWhitney():
 
         elif 2 <= min(self.n1, self.n2) <= 20 and 2 <= max(self.n1, self.n2) <= 40:
 
-            if self.tail != 'two':
+            if self.tail != 'two-sided':
                 raise ValueError('data is too small')
 
             self.sample_size = 'Small'
@@ -203,11 +218,11 @@ class MannWhitney():
 
             if self.sig == 0.05:
                 criticalu = self.crit_05[str(min(self.n1, self.n2))][max(self.n1, self.n2) - 2]
-                self.is_sig = self.u <= criticalu
+                self.is_sig = self.stat <= criticalu
 
             elif self.sig == 0.1:
                 criticalu = self.crit_1[str(min(self.n1, self.n2))][max(self.n1, self.n2) - 2]
-                self.is_sig = self.u <= criticalu
+                self.is_sig = self.stat <= criticalu
 
         else:
 
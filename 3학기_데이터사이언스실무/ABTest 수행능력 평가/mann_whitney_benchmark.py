@@ -0,0 +1,188 @@
+import sys
+import math
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+
+from mann_whitney import MannWhitney
+from mann_whitney_hist import HistMannWhitney
+
+# calc_ci builds the n1 x n2 difference list in python, so it is only timed up to this size per arm
+MAX_CI_SIZE = 3000
+SIZES = [10, 100, 1000, 10000, 100000, 1000000, 10000000]
+
+
+def make_data(kind, n1, n2, rng, shift=0.1):
+    if kind == 'random':
+        return rng.normal(0.0, 1.0, n1), rng.normal(shift, 1.0, n2)
+    if kind == 'tied':
+        return rng.poisson(5.0, n1).astype(float), rng.poisson(5.0 + shift * 5, n2).astype(float)
+    if kind == 'skewed':
+        return rng.lognormal(0.0, 1.0, n1), rng.lognormal(shift, 1.0, n2)
+    raise ValueError(f'unknown kind: {kind}')
+
+
+def reference_ci(data1, data2, sig=0.05):
+    # brute-force Hodges-Lehmann interval with the same K as MannWhitney.calc_ci
+    n1, n2 = len(data1), len(data2)
+    diffs = np.sort(np.subtract.outer(data1, data2).ravel())
+    N = stats.norm.ppf(1 - sig / 2)
+    k = math.ceil(n1 * n2 / 2 - (N * (n1 * n2 * (n1 + n2 + 1) / 12) ** 0.5))
+    return round(diffs[k - 1], 3), round(np.median(diffs), 3), round(diffs[len(diffs) - k], 3)
+
+
+def reference_power(data1, data2, sig=0.05, n=None, mde=None):
+    # two-sample t-test power with the pi / 3 asymptotic relative efficiency used by calc_power
+    from statsmodels.stats.power import TTestIndPower
+
+    sd = np.std(np.concatenate((data1, data2)))
+    if n:
+        effect_size = np.mean(data1) * mde / sd
+        n1 = n2 = n / (np.pi / 3)
+    else:
+        effect_size = (np.mean(data1) - np.mean(data2)) / sd
+        n1, n2 = len(data1) / (np.pi / 3), len(data2) / (np.pi / 3)
+    return TTestIndPower().power(effect_size=effect_size, nobs1=n1, alpha=sig, ratio=n2 / n1)
+
+
+def check_test(data1, data2, tail):
+    mw = MannWhitney(data1, data2, tail=tail)
+    stat, p = mw.test()
+
+    res = stats.mannwhitneyu(data1, data2, alternative=tail, use_continuity=True, method='asymptotic')
+    ustat = min(res.statistic, len(data1) * len(data2) - res.statistic)
+
+    assert np.isclose(stat, ustat), (stat, ustat)
+    assert np.isclose(p, res.pvalue, rtol=1e-9, atol=1e-300), (p, res.pvalue)
+
+    hist = HistMannWhitney.from_data(data1, data2, tail=tail)
+    hstat, hp = hist.test()
+    assert np.isclose(hstat, stat) and np.isclose(hp, p, rtol=1e-9, atol=1e-300), (hstat, hp, stat, p)
+
+
+def check_small_sample(data1, data2):
+    mw = MannWhitney(data1, data2)
+    stat, p = mw.test()
+
+    res = stats.mannwhitneyu(data1, data2, method='exact')
+    assert mw.sample_size == 'Small' and p is None
+    assert np.isclose(stat, min(res.statistic, len(data1) * len(data2) - res.statistic))
+    # the tabulated critical values are conservative, so a table rejection must be an exact rejection
+    if mw.is_sig:
+        assert res.pvalue <= mw.sig, (stat, res.pvalue)
+
+
+def check_ci(data1, data2):
+    ci = MannWhitney(data1, data2).calc_ci()
+    expected = reference_ci(np.asarray(data1), np.asarray(data2))
+    assert np.allclose(ci, expected), (ci, expected)
+
+    hist_ci = HistMannWhitney.from_data(data1, data2).calc_ci()
+    assert np.allclose(hist_ci, expected), (hist_ci, expected)
+
+
+def check_power(data1, data2, tail='two-sided'):
+    mw = MannWhitney(data1, data2, tail=tail)
+
+    power = mw.calc_power()
+    assert np.isclose(power, reference_power(data1, data2)), power
+
+    # kept away from power ~ 1, where statsmodels' nct.cdf itself returns nan
+    power = mw.calc_power(n=500, mde=0.01)
+    assert np.isclose(power, reference_power(data1, data2, n=500, mde=0.01)), power
+
+
+def check_samplesize(data1, data2, power=0.8, mde=0.1):
+    mw = MannWhitney(data1, data2)
+    size = mw.calc_samplesize(power=power, mde=mde)
+
+    assert mw.calc_power(n=size, mde=mde) >= power
+    assert mw.calc_power(n=size - 1, mde=mde) < power
+
+
+def run_checks(seed=0, repeat=5):
+    rng = np.random.default_rng(seed)
+    results = []
+
+    for kind in ['random', 'tied', 'skewed']:
+        for _ in range(repeat):
+            n1, n2 = rng.integers(50, 400, 2)
+            data1, data2 = make_data(kind, n1, n2, rng)
+            checks = [
+                ('test two-sided', lambda: check_test(data1, data2, 'two-sided')),
+                ('test less', lambda: check_test(data1, data2, 'less')),
+                ('test greater', lambda: check_test(data1, data2, 'greater')),
+                ('calc_ci', lambda: check_ci(data1, data2)),
+                ('calc_power', lambda: check_power(data1 + 10, data2 + 10)),
+                ('calc_samplesize', lambda: check_samplesize(data1 + 10, data2 + 10)),
+            ]
+            if kind == 'random':
+                s1, s2 = rng.integers(2, 21), rng.integers(2, 41)
+                small1, small2 = make_data(kind, min(s1, s2), max(s1, s2), rng, shift=1.0)
+                checks.append(('test small sample', lambda: check_small_sample(small1, small2)))
+
+            for name, check in checks:
+                try:
+                    check()
+                    results.append({'kind': kind, 'n1': n1, 'n2': n2, 'check': name, 'ok': True, 'error': ''})
+                except (AssertionError, ValueError) as e:
+                    results.append({'kind': kind, 'n1': n1, 'n2': n2, 'check': name, 'ok': False, 'error': repr(e)})
+
+    return pd.DataFrame(results)
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run_benchmark(sizes=SIZES, kind='skewed', max_ci_size=MAX_CI_SIZE, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+
+    for n in sizes:
+        data1, data2 = make_data(kind, n, n, rng)
+        mw = MannWhitney(data1, data2)
+        hist = HistMannWhitney.from_data(np.round(data1, 2), np.round(data2, 2))
+
+        methods = [
+            ('test', mw.test),
+            ('calc_power', mw.calc_power),
+            ('calc_samplesize', mw.calc_samplesize),
+            ('hist.test', hist.test),
+            ('hist.calc_ci', hist.calc_ci),
+        ]
+        if n <= max_ci_size:
+            methods.append(('calc_ci', mw.calc_ci))
+
+        for name, method in methods:
+            elapsed, peak = measure(method)
+            rows.append({'n_per_arm': n, 'method': name, 'seconds': elapsed, 'peak_mb': peak / 2 ** 20})
+            print(f'{name:>16} n={n:<9} {elapsed:10.4f}s {peak / 2 ** 20:10.2f}MB', flush=True)
+
+    return pd.DataFrame(rows)
+
+
+def main():
+    checks = run_checks()
+    print(checks.groupby('check')['ok'].agg(['sum', 'count']))
+    failed = checks[~checks['ok']]
+    if not failed.empty:
+        print(failed.to_string())
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    timings = run_benchmark(sizes)
+    timings.to_csv('mann_whitney_benchmark.csv', index=False)
+
+    return failed.empty
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+
+
+class HistMannWhitney():
+    '''
+    Mann-Whitney U on value -> count tables, for heavily tied metrics (page counts, clicks, ratings).
+
+    everything is computed over the d distinct values instead of the n observations,
+    so the cost does not grow with the number of events. large-sample (normal) approximation only.
+    '''
+
+    # above this many distinct-value pairs the Hodges-Lehmann order statistics are found by bisection
+    max_pairs = 1000000
+
+    def __init__(self, counts1, counts2, tail='two-sided', sig=0.05):
+
+        self.values1, self.counts1 = self.to_table(counts1)
+        self.values2, self.counts2 = self.to_table(counts2)
+        self.tail = tail
+        self.sig = sig
+
+        self.n1 = int(self.counts1.sum())
+        self.n2 = int(self.counts2.sum())
+
+    @staticmethod
+    def to_table(counts):
+        # accepts {value: count}, a value_counts() Series or a (values, counts) pair
+        if isinstance(counts, dict):
+            counts = pd.Series(counts)
+        if isinstance(counts, pd.Series):
+            values, counts = counts.index.to_numpy(), counts.to_numpy()
+        else:
+            values, counts = counts
+
+        values = np.asarray(values, dtype=float)
+        counts = np.asarray(counts, dtype=np.int64)
+        if np.any(counts < 0):
+            raise ValueError('counts must be non-negative')
+
+        order = np.argsort(values, kind='stable')
+        values, inverse = np.unique(values[order], return_inverse=True)
+        return values, np.bincount(inverse, weights=counts[order], minlength=len(values)).astype(np.int64)
+
+    @classmethod
+    def from_data(cls, data1, data2, tail='two-sided', sig=0.05):
+        return cls(np.unique(np.asarray(data1), return_counts=True),
+                   np.unique(np.asarray(data2), return_counts=True), tail=tail, sig=sig)
+
+    def _pooled(self):
+        values = np.union1d(self.values1, self.values2)
+        c1 = np.zeros(len(values), dtype=np.int64)
+        c2 = np.zeros(len(values), dtype=np.int64)
+        c1[np.searchsorted(values, self.values1)] = self.counts1
+        c2[np.searchsorted(values, self.values2)] = self.counts2
+        return values, c1, c2
+
+    def test(self):
+        if min(self.n1, self.n2) < 2:
+            raise ValueError('data is too small')
+
+        values, c1, c2 = self._pooled()
+        t = (c1 + c2).astype(float)
+
+        # every tied block shares the midrank of its run in the pooled ordering
+        midrank = np.cumsum(t) - t + (t + 1) / 2.0
+        rank_sum1 = np.sum(c1 * midrank)
+
+        self.u1 = self.n1 * self.n2 + (self.n1 * (self.n1 + 1)) / 2.0 - rank_sum1
+        self.u2 = self.n1 * self.n2 - self.u1
+
+        self.stat = self.u1 if self.u1 < self.u2 else self.u2
+        self.effectsize = 1 - (2 * self.stat) / (self.n1 * self.n2)
+        self.sample_size = 'Large'
+
+        n = float(self.n1 + self.n2)
+        T = 1.0 - np.sum(t ** 3 - t) / (n ** 3 - n)
+        if T == 0:
+            raise ValueError('data is too small')
+        sd = np.sqrt(T * self.n1 * self.n2 * (self.n1 + self.n2 + 1) / 12.0)
+        meanrank = self.n1 * self.n2 / 2.0 + 0.5
+
+        if self.tail == 'two-sided':
+            bigu = max(self.u1, self.u2)
+        elif self.tail == 'less':
+            bigu = self.u1
+        elif self.tail == 'greater':
+            bigu = self.u2
+        self.z = (bigu - meanrank) / sd
+
+        if self.tail == 'two-sided':
+            self.p = 2 * stats.norm.sf(abs(self.z))
+        else:
+            self.p = stats.norm.sf(self.z)
+
+        self.is_sig = self.p <= self.sig
+
+        return self.stat, self.p
+
+    def _count_le(self, shift):
+        # number of pairs (i, j) with data1_i - data2_j <= shift
+        cum2 = np.cumsum(self.counts2[::-1])[::-1]
+        idx = np.searchsorted(self.values2, self.values1 - shift, side='left')
+        above = np.append(cum2, 0)[idx]
+        return np.sum(self.counts1 * above)
+
+    def order_stat(self, k):
+        # k-th smallest (1-based) of the n1 * n2 pairwise differences data1_i - data2_j
+        if len(self.values1) * len(self.values2) <= self.max_pairs:
+            diffs = np.subtract.outer(self.values1, self.values2).ravel()
+            weights = np.multiply.outer(self.counts1, self.counts2).ravel()
+            order = np.argsort(diffs, kind='stable')
+            cum = np.cumsum(weights[order])
+            return diffs[order][np.searchsorted(cum, k)]
+
+        low = self.values1[0] - self.values2[-1]
+        high = self.values1[-1] - self.values2[0]
+        for _ in range(200):
+            mid = (low + high) / 2.0
+            if mid == low or mid == high:
+                break
+            if self._count_le(mid) >= k:
+                high = mid
+            else:
+                low = mid
+        return high
+
+    def hodges_lehmann(self):
+        total = self.n1 * self.n2
+        if total % 2:
+            return self.order_stat((total + 1) // 2)
+        return (self.order_stat(total // 2) + self.order_stat(total // 2 + 1)) / 2.0
+
+    def calc_ci(self):
+        N = stats.norm.ppf(1 - self.sig / 2)
+        mid = self.hodges_lehmann()
+
+        # same K as MannWhitney.calc_ci, but without sub-sampling
+        k = int(np.ceil(self.n1 * self.n2 / 2 - (N * (self.n1 * self.n2 * (self.n1 + self.n2 + 1) / 12) ** 0.5)))
+        k = max(k, 1)
+
+        low = self.order_stat(k)
+        high = self.order_stat(self.n1 * self.n2 - k + 1)
+        return round(low, 3), round(mid, 3), round(high, 3)
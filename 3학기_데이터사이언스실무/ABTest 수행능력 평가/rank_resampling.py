@@ -0,0 +1,170 @@
+import time
+import numpy as np
+import scipy.stats as stats
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _bootstrap_chunk(x, y, size, seed):
+    # one chunk of bootstrap replicates, drawn as (size, n) index matrices
+    rng = np.random.default_rng(seed)
+    n1, n2 = len(x), len(y)
+
+    bx = x[rng.integers(0, n1, size=(size, n1))]
+    by = y[rng.integers(0, n2, size=(size, n2))]
+
+    ranked = stats.rankdata(np.concatenate((bx, by), axis=1), axis=1)
+    u1 = n1 * n2 + (n1 * (n1 + 1)) / 2.0 - ranked[:, :n1].sum(axis=1)
+
+    effectsize = 1 - (2 * u1) / (n1 * n2)
+    median_diff = np.median(bx, axis=1) - np.median(by, axis=1)
+
+    return effectsize, median_diff
+
+
+def _permutation_chunk(ranked, n1, size, seed):
+    # ranks are invariant under relabelling, so only the rank sum of data1 is recomputed
+    rng = np.random.default_rng(seed)
+    n = len(ranked)
+    n2 = n - n1
+
+    perm = rng.permuted(np.tile(np.arange(n), (size, 1)), axis=1)[:, :n1]
+    return n1 * n2 + (n1 * (n1 + 1)) / 2.0 - ranked[perm].sum(axis=1)
+
+
+class RankResampler():
+    '''
+    batched bootstrap / permutation engine for MannWhitney effect sizes.
+
+    replicates are generated as index matrices in chunks that fit in memory_budget bytes.
+    every chunk gets its own SeedSequence child, so results depend on seed only, not on n_jobs.
+    '''
+
+    def __init__(self, data1, data2, tail='two-sided', sig=0.05, n_resamples=10000,
+                 memory_budget=64 * 2 ** 20, n_jobs=1, seed=None):
+
+        self.data1 = np.asarray(data1, dtype=float)
+        self.data2 = np.asarray(data2, dtype=float)
+        self.tail = tail
+        self.sig = sig
+        self.n_resamples = n_resamples
+        self.memory_budget = memory_budget
+        self.n_jobs = n_jobs
+        self.seed = seed
+
+        self.n1 = len(self.data1)
+        self.n2 = len(self.data2)
+
+        if min(self.n1, self.n2) < 2:
+            raise ValueError('data is too small')
+
+    def chunk_size(self, width):
+        # index matrix, gathered values and ranks per replicate, 8 bytes each
+        per_replicate = 3 * 8 * width
+        return int(max(1, min(self.n_resamples, self.memory_budget // per_replicate)))
+
+    def _chunks(self, width):
+        size = self.chunk_size(width)
+        sizes = [size] * (self.n_resamples // size)
+        if self.n_resamples % size:
+            sizes.append(self.n_resamples % size)
+
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        return sizes, seeds
+
+    def _run(self, func, args, width):
+        sizes, seeds = self._chunks(width)
+
+        if self.n_jobs == 1 or len(sizes) == 1:
+            return [func(*args, size, seed) for size, seed in zip(sizes, seeds)]
+
+        with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+            futures = [executor.submit(func, *args, size, seed) for size, seed in zip(sizes, seeds)]
+            return [future.result() for future in futures]
+
+    def bootstrap(self):
+        chunks = self._run(_bootstrap_chunk, (self.data1, self.data2), self.n1 + self.n2)
+
+        self.boot_effectsize = np.concatenate([chunk[0] for chunk in chunks])
+        self.boot_median_diff = np.concatenate([chunk[1] for chunk in chunks])
+
+        return self.boot_effectsize, self.boot_median_diff
+
+    def permutation(self):
+        ranked = stats.rankdata(np.concatenate((self.data1, self.data2)))
+        chunks = self._run(_permutation_chunk, (ranked, self.n1), self.n1 + self.n2)
+
+        self.u1 = self.n1 * self.n2 + (self.n1 * (self.n1 + 1)) / 2.0 - np.sum(ranked[:self.n1])
+        self.perm_u1 = np.concatenate(chunks)
+
+        return self.perm_u1
+
+    def _percentile_ci(self, replicates, point):
+        low, high = np.quantile(replicates, [self.sig / 2, 1 - self.sig / 2])
+        return round(low, 3), round(point, 3), round(high, 3)
+
+    def calc_effectsize_ci(self):
+        # signed rank-biserial correlation; its absolute value is MannWhitney.effectsize
+        if not hasattr(self, 'boot_effectsize'):
+            self.bootstrap()
+
+        ranked = stats.rankdata(np.concatenate((self.data1, self.data2)))
+        u1 = self.n1 * self.n2 + (self.n1 * (self.n1 + 1)) / 2.0 - np.sum(ranked[:self.n1])
+        effectsize = 1 - (2 * u1) / (self.n1 * self.n2)
+
+        return self._percentile_ci(self.boot_effectsize, effectsize)
+
+    def calc_median_diff_ci(self):
+        if not hasattr(self, 'boot_median_diff'):
+            self.bootstrap()
+
+        median_diff = np.median(self.data1) - np.median(self.data2)
+        return self._percentile_ci(self.boot_median_diff, median_diff)
+
+    def calc_pvalue(self):
+        if not hasattr(self, 'perm_u1'):
+            self.permutation()
+
+        meanrank = self.n1 * self.n2 / 2.0
+        if self.tail == 'two-sided':
+            extreme = np.abs(self.perm_u1 - meanrank) >= abs(self.u1 - meanrank)
+        elif self.tail == 'less':
+            extreme = self.perm_u1 >= self.u1
+        elif self.tail == 'greater':
+            extreme = self.perm_u1 <= self.u1
+        else:
+            raise ValueError(f'unknown tail: {self.tail}')
+
+        # add-one estimate and Clopper-Pearson interval for the Monte Carlo error
+        k = int(np.sum(extreme))
+        b = len(self.perm_u1)
+        self.p = (k + 1) / (b + 1)
+
+        low = float(stats.beta.ppf(self.sig / 2, k, b - k + 1)) if k > 0 else 0.0
+        high = float(stats.beta.ppf(1 - self.sig / 2, k + 1, b - k)) if k < b else 1.0
+
+        return low, self.p, high
+
+
+def benchmark(sizes=(100, 1000, 10000), n_resamples=2000, n_jobs=(1, 4), seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+
+    for n in sizes:
+        x = rng.lognormal(0.0, 1.0, n)
+        y = rng.lognormal(0.1, 1.0, n)
+
+        for jobs in n_jobs:
+            resampler = RankResampler(x, y, n_resamples=n_resamples, n_jobs=jobs, seed=seed)
+            for name, method in (('bootstrap', resampler.bootstrap), ('permutation', resampler.permutation)):
+                start = time.perf_counter()
+                method()
+                elapsed = time.perf_counter() - start
+                rows.append({'n': n, 'n_jobs': jobs, 'method': name,
+                             'seconds': elapsed, 'replicates_per_sec': n_resamples / elapsed})
+
+    return rows
+
+
+if __name__ == '__main__':
+    for row in benchmark():
+        print('{method:>11} n={n:<6} n_jobs={n_jobs} {seconds:8.3f}s {replicates_per_sec:12.1f} rep/s'.format(**row))
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+
+
+# power functions, vectorised over every argument (two-sided where it applies)
+
+def power_ztest(nobs1, effect_size, alpha, ratio=1.0):
+    # statsmodels NormalIndPower
+    nobs = 1.0 / (1.0 / nobs1 + 1.0 / (nobs1 * ratio))
+    crit = stats.norm.isf(alpha / 2)
+    d = np.abs(effect_size) * np.sqrt(nobs)
+    return stats.norm.sf(crit - d) + stats.norm.cdf(-crit - d)
+
+
+def power_ttest(nobs1, effect_size, alpha, ratio=1.0):
+    # statsmodels TTestIndPower
+    nobs2 = nobs1 * ratio
+    df = nobs1 + nobs2 - 2
+    crit = stats.t.isf(alpha / 2, df)
+    nc = np.abs(effect_size) * np.sqrt(1.0 / (1.0 / nobs1 + 1.0 / nobs2))
+    # nct.cdf(-c, nc) == nct.sf(c, -nc); the cdf form returns nan far in the tail
+    return stats.nct.sf(crit, df, nc) + stats.nct.sf(crit, df, -nc)
+
+
+def power_chisquare(nobs, effect_size, alpha, n_bins=2):
+    # statsmodels GofChisquarePower
+    df = n_bins - 1
+    crit = stats.chi2.isf(alpha, df)
+    return stats.ncx2.sf(crit, df, effect_size ** 2 * nobs)
+
+
+def power_anova(nobs, effect_size, alpha, k_groups):
+    # statsmodels FTestAnovaPower, nobs is the total over all groups
+    df_num = k_groups - 1
+    df_denom = nobs - k_groups
+    crit = stats.f.isf(alpha, df_num, df_denom)
+    return stats.ncf.sf(crit, df_num, df_denom, effect_size ** 2 * nobs)
+
+
+def adjust_alpha(alpha, num_tests, correction='bonferroni'):
+    if correction == 'bonferroni':
+        return alpha / num_tests
+    if correction == 'sidak':
+        return 1 - (1 - alpha) ** (1.0 / num_tests)
+    if correction in (None, 'none'):
+        return alpha * np.ones_like(num_tests, dtype=float)
+    raise ValueError(f'unknown correction: {correction}')
+
+
+def num_comparisons(num_arms, comparisons='pairwise'):
+    # pairwise: k * (k - 1) / 2 as in estimate_sample_size_for_continuous_mvt, vs_control: k - 1
+    # fewer than two arms gives zero tests, and the corrected alpha would divide by zero
+    if np.any(np.asarray(num_arms) < 2):
+        raise ValueError('at least two arms are required')
+    if comparisons == 'pairwise':
+        return num_arms * (num_arms - 1) / 2
+    if comparisons == 'vs_control':
+        return num_arms - 1.0
+    raise ValueError(f'unknown comparisons: {comparisons}')
+
+
+def _initial_guess(test, effect_size, alpha, power, num_arms):
+    # normal-approximation closed forms, used to bracket the root
+    z_alpha = stats.norm.isf(alpha / 2)
+    z_beta = stats.norm.ppf(power)
+
+    if test in ('ztest', 'ttest'):
+        return 2 * ((z_alpha + z_beta) / effect_size) ** 2
+    if test == 'chisquare':
+        return ((stats.norm.isf(alpha) + z_beta) / effect_size) ** 2
+    if test == 'anova':
+        # Patnaik-style: noncentrality needed by the chi-square limit of the F test
+        df = num_arms - 1
+        crit = stats.chi2.isf(alpha, df)
+        nc = (np.sqrt(crit) + z_beta) ** 2
+        return nc / effect_size ** 2 + num_arms
+    raise ValueError(f'unknown test: {test}')
+
+
+def _power(test, nobs, effect_size, alpha, num_arms):
+    if test == 'ztest':
+        return power_ztest(nobs, effect_size, alpha)
+    if test == 'ttest':
+        return power_ttest(nobs, effect_size, alpha)
+    if test == 'chisquare':
+        return power_chisquare(nobs, effect_size, alpha)
+    return power_anova(nobs, effect_size, alpha, num_arms)
+
+
+def solve_nobs(test, effect_size, alpha, power, num_arms=2, iters=80):
+    '''
+    smallest nobs reaching the target power, solved for all cells at once.
+
+    a closed-form guess brackets the root, then every cell is bisected in the same
+    array operation (power is increasing in nobs for all tests here).
+    '''
+    effect_size, alpha, power, num_arms = np.broadcast_arrays(
+        np.abs(np.asarray(effect_size, dtype=float)), np.asarray(alpha, dtype=float),
+        np.asarray(power, dtype=float), np.asarray(num_arms, dtype=float))
+
+    guess = _initial_guess(test, effect_size, alpha, power, num_arms)
+    floor = num_arms + 1.0 if test == 'anova' else 2.0 + 1e-9
+
+    low = np.maximum(floor, guess / 2)
+    high = np.maximum(floor * 2, guess * 2)
+
+    # widen the bracket where the approximation was off
+    for _ in range(60):
+        below = _power(test, low, effect_size, alpha, num_arms) > power
+        above = _power(test, high, effect_size, alpha, num_arms) < power
+        if not (below & (low > floor)).any() and not above.any():
+            break
+        low = np.where(below, np.maximum(floor, low / 4), low)
+        high = np.where(above, high * 4, high)
+
+    for _ in range(iters):
+        mid = (low + high) / 2
+        reached = _power(test, mid, effect_size, alpha, num_arms) >= power
+        high = np.where(reached, mid, high)
+        low = np.where(reached, low, mid)
+
+    return high
+
+
+def plan_sample_size(effect_size, alpha=0.05, power=0.8, num_arms=3, correction=('bonferroni', 'sidak'),
+                     test='chisquare', comparisons='pairwise'):
+    '''
+    design table of required sample sizes over the full grid of the given values.
+
+    test: 'ztest' / 'ttest' (per-arm n for each pairwise comparison), 'chisquare' (GofChisquarePower)
+    or 'anova' (FTestAnovaPower, total n). alpha is corrected for the number of comparisons
+    implied by num_arms, like estimate_sample_size_for_*_mvt.
+    '''
+    def as_list(value):
+        return list(value) if isinstance(value, (list, tuple, np.ndarray, pd.Index)) else [value]
+
+    corrections = as_list(correction)
+    grid = pd.MultiIndex.from_product(
+        [as_list(effect_size), as_list(alpha), as_list(power), as_list(num_arms), range(len(corrections))],
+        names=['effect_size', 'alpha', 'power', 'num_arms', 'correction'],
+    ).to_frame(index=False)
+
+    tests = num_comparisons(grid['num_arms'].to_numpy(dtype=float), comparisons)
+    adjusted = np.empty(len(grid))
+    for i, name in enumerate(corrections):
+        mask = (grid['correction'] == i).to_numpy()
+        adjusted[mask] = adjust_alpha(grid['alpha'].to_numpy()[mask], tests[mask], name)
+
+    grid['correction'] = [corrections[i] for i in grid['correction']]
+    grid['num_tests'] = tests
+    grid['adjusted_alpha'] = adjusted
+
+    nobs = solve_nobs(test, grid['effect_size'].to_numpy(dtype=float), adjusted,
+                      grid['power'].to_numpy(dtype=float), grid['num_arms'].to_numpy(dtype=float))
+    grid['sample_size'] = np.ceil(nobs).astype(np.int64)
+
+    return grid
@@ -3,7 +3,9 @@ import matplotlib.pyplot as plt
 from wordcloud import WordCloud
 import matplotlib.font_manager as fm
 import os
-from collections import Counter
+import numpy as np
+from kyobo_review_store import ReviewStore, DEFAULT_STORE_PATH
+from kyobo_keyword_extractor import KeywordExtractor, load_keyword_reviews
 
 # 한글 폰트 설정
 plt.rcParams['font.family'] = 'NanumGothic'
@@ -21,7 +23,16 @@ def find_korean_font():
 # 데이터 로드
 def load_data():
     try:
-        df = pd.read_csv('data/kyobo_book_sentiment_analysis.csv')
+        # 워드클라우드에 필요한 컬럼만 읽기
+        df = pd.read_csv('data/kyobo_book_sentiment_analysis.csv', usecols=['도서코드', '리뷰번호', '감성', '감성점수', '리뷰내용'])
+        
+        # 분석 결과에는 리뷰내용이 100자까지만 있으므로 리뷰 저장소/파일의 전체 텍스트 사용 (없으면 결과의 리뷰내용)
+        store = ReviewStore(DEFAULT_STORE_PATH) if os.path.exists(DEFAULT_STORE_PATH) else None
+        reviews = load_keyword_reviews(store, 'data/kyobo_reviews')
+        reviews = reviews.astype({'도서코드': str, '리뷰번호': str}).drop_duplicates(['도서코드', '리뷰번호'])
+        full_text = df.astype({'도서코드': str, '리뷰번호': str}).merge(
+            reviews[['도서코드', '리뷰번호', '리뷰내용']], on=['도서코드', '리뷰번호'], how='left', suffixes=('', '_전체'))['리뷰내용_전체']
+        df['리뷰내용'] = full_text.fillna(df['리뷰내용']).to_numpy()
         return df
     except Exception as e:
         print(f"데이터 로드 중 오류 발생: {e}")
@@ -47,16 +58,13 @@ def create_wordcloud(text_dict, title, output_path, font_path):
     plt.savefig(output_path, dpi=300, bbox_inches='tight')
     plt.close()
 
-def process_keywords(keywords_series):
-    # 키워드 텍스트를 분리하고 빈도수 계산
-    all_keywords = []
-    for keywords in keywords_series:
-        if isinstance(keywords, str):
-            all_keywords.extend(keywords.split('|'))
+def process_keywords(review_texts, groups, top_k=100):
+    # 로컬 키워드 엔진으로 전체 리뷰 대비 그룹 리뷰에서 두드러지는 키워드 점수 계산 (로그 오즈비, 모든 그룹을 한 번에)
+    keywords = KeywordExtractor(top_k=top_k).fit(review_texts).log_odds(groups)
     
-    # 빈도수 계산 및 상위 100개 선택
-    keyword_freq = Counter(all_keywords)
-    return dict(keyword_freq.most_common(100))
+    # 워드클라우드 가중치로 쓸 수 있도록 양수 점수만 사용
+    keywords = keywords[keywords['점수'] > 0]
+    return {group: dict(zip(rows['키워드'], rows['점수'])) for group, rows in keywords.groupby('그룹')}
 
 def main():
     # 폰트 경로 설정
@@ -73,15 +81,18 @@ def main():
     top_20_books = df.sort_values('도서_감성평균', ascending=False)['도서코드'].unique()[:20]
     bottom_20_books = df.sort_values('도서_감성평균')['도서코드'].unique()[:20]
 
-    # 긍정/부정 리뷰 키워드 추출
-    positive_reviews = df[(df['도서코드'].isin(top_20_books)) & (df['감성'] == '긍정')]
-    negative_reviews = df[(df['도서코드'].isin(bottom_20_books)) & (df['감성'] == '부정')]
+    # 긍정/부정 리뷰 구분 (나머지 리뷰는 비교 대상)
+    is_positive = (df['도서코드'].isin(top_20_books)) & (df['감성'] == '긍정')
+    is_negative = (df['도서코드'].isin(bottom_20_books)) & (df['감성'] == '부정')
+    groups = np.where(is_positive, '긍정', np.where(is_negative, '부정', None))
 
     # 워드클라우드 생성
     os.makedirs('result/images', exist_ok=True)
     
-    positive_keywords = process_keywords(positive_reviews['키워드'])
-    negative_keywords = process_keywords(negative_reviews['키워드'])
+    # 긍정/부정 리뷰 키워드 추출
+    keywords = process_keywords(df['리뷰내용'], groups)
+    positive_keywords = keywords.get('긍정', {})
+    negative_keywords = keywords.get('부정', {})
     
     create_wordcloud(
         positive_keywords,
@@ -1,22 +1,41 @@
 """
 교보문고 리뷰 감성분석 스크립트
 - homework/data/kyobo_reviews 디렉토리의 리뷰 파일을 분석
+- 리뷰 통합 저장소(kyobo_review_store)가 있으면 파일 대신 도서별로 필요한 컬럼만 조회하여 분석
+- 배치 모드(batch_size > 1)에서는 토큰 예산 안에서 여러 리뷰를 한 번의 요청으로 분석
+- 고정 대기 대신 RPM/TPM 한도 안에서 여러 요청을 동시에 보내고 결과는 순서대로 저장 (kyobo_llm_scheduler)
+- API 호출 전 감성분석 결과 캐시(kyobo_sentiment_cache)를 조회하여 같은 리뷰 텍스트는 다시 분석하지 않음
+- 결과는 새 행만 JSONL 저널에 추가하고(kyobo_result_writer), 분석이 끝나면 중복을 제거한 CSV로 압축 저장
+- 로컬 감성 모델(kyobo_local_sentiment)로 모든 리뷰를 먼저 일괄 분석하고 신뢰도가 낮은 리뷰만 LLM으로 분석
+- 감성 사전 점수(kyobo_lexicon_sentiment)는 리뷰 목록 단위로 벡터화하여 계산 (테스트 모드, 로컬 모델 결과 검증)
+- 읽기(스레드) -> 선별 -> 로컬 점수(프로세스 풀) -> LLM 분석/저장 단계를 크기 제한 큐로 잇는 스트리밍 파이프라인으로 처리
+- 분석 전 전체 리뷰의 유사 중복 군집(kyobo_review_dedupe)을 찾아 군집마다 리뷰 1개만 분석하고 결과를 나머지에 복사
 - homework/data/kyobo_book_url.csv 파일의 도서 정보 활용
 - LLM을 사용한 감성분석 결과를 CSV 파일로 저장
 """
 
 import os
+import math
 import glob
 import pandas as pd
 import numpy as np
 import json
 import re
+import hashlib
 import logging
-import time
-import random
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from tqdm import tqdm
 import openai
+from kyobo_review_store import ReviewStore, DEFAULT_STORE_PATH
+from kyobo_llm_scheduler import LLMScheduler
+from kyobo_sentiment_cache import SentimentCache
+from kyobo_result_writer import ResultWriter
+from kyobo_local_sentiment import load_or_train, rating_to_label, SENTIMENT_LABELS as LOCAL_LABELS
+from kyobo_lexicon_sentiment import LexiconScorer
+from kyobo_review_pipeline import prefetch, ordered_map, ThreadedSink
+from kyobo_review_dedupe import MinHashDeduper, iter_dedupe_frames
 
 # 디렉토리 생성
 os.makedirs("result", exist_ok=True)
@@ -32,28 +51,104 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 토큰 수 추정용 글자당 토큰 수 (한글은 대략 글자당 1토큰, 보수적으로 추정)
+TOKENS_PER_CHAR = 1.0
+
+# 허용하는 감성 값
+SENTIMENTS = ("긍정", "부정", "중립")
+
+# 로컬 점수 계산 프로세스별 모델 (프로세스 시작 시 한 번만 전달)
+_scoring_state = {}
+
+
+def _init_scoring_worker(local_model, lexicon):
+    """로컬 점수 계산 프로세스 초기화"""
+    _scoring_state['local_model'] = local_model
+    _scoring_state['lexicon'] = lexicon
+
+
+def score_chunk(chunk, local_model, lexicon):
+    """
+    [점수 단계] 청크의 분석 대상 리뷰를 로컬 모델과 감성 사전으로 일괄 점수 계산
+    
+    Args:
+        chunk: select_pending을 거친 청크 dict
+        local_model: 로컬 감성 모델 (None이면 건너뜀)
+        lexicon: 감성 사전 점수기
+        
+    Returns:
+        dict: local_predictions, lexicon_sentiments가 추가된 청크
+    """
+    review_texts = [review_text for _, _, review_text in chunk['pending']]
+    if local_model is not None and review_texts:
+        chunk['local_predictions'] = local_model.predict(review_texts).to_dict('records')
+        chunk['lexicon_sentiments'] = lexicon.score(review_texts)['sentiment'].tolist()
+    return chunk
+
+
+def _score_chunk_in_worker(chunk):
+    """프로세스 풀 작업용 score_chunk"""
+    return score_chunk(chunk, _scoring_state['local_model'], _scoring_state['lexicon'])
+
+
 class KyoboReviewAnalyzer:
     """교보문고 리뷰 데이터 감성분석 클래스"""
     
-    def __init__(self, reviews_dir, book_info_file, output_file):
+    def __init__(self, reviews_dir, book_info_file, output_file, store=None, batch_size=1,
+                 batch_token_budget=3000, base_url=None, max_concurrency=4, rpm=60, tpm=60000,
+                 cache=None, local_model=None, confidence_threshold=0.8, score_workers=0, prefetch_size=4,
+                 deduper=None):
         """
         초기화 함수
         
         Args:
             reviews_dir: 리뷰 파일들이 저장된 디렉토리 경로
             book_info_file: 도서 정보가 포함된 CSV 파일 경로
-            output_file: 분석 결과를 저장할 CSV 파일 경로
+            output_file: 분석 결과를 저장할 CSV 파일 경로 (분석 중에는 같은 이름의 .jsonl 저널에 추가)
+            store: 리뷰 통합 저장소(ReviewStore), 지정하면 reviews_dir 대신 사용
+            batch_size: 한 번의 요청에 담을 최대 리뷰 수 (1이면 리뷰마다 요청)
+            batch_token_budget: 배치 요청 하나에 담을 리뷰 텍스트의 최대 토큰 수(추정)
+            base_url: OpenAI 호환 API 주소 (로컬 대역 LLM 서버로 테스트할 때 지정)
+            max_concurrency: 동시에 보낼 최대 API 요청 수
+            rpm: 분당 최대 API 요청 수
+            tpm: 분당 최대 토큰 수
+            cache: 감성분석 결과 캐시(SentimentCache), 지정하면 API 호출 전에 조회
+            local_model: 로컬 감성 모델(LocalSentimentModel), 지정하면 신뢰도가 낮은 리뷰만 LLM으로 분석
+            confidence_threshold: 로컬 모델 결과를 그대로 사용할 최소 신뢰도
+            score_workers: 로컬 점수 계산 프로세스 수 (0이면 현재 프로세스에서 계산)
+            prefetch_size: 분석 단계보다 미리 읽어 둘 최대 리뷰 파일 수
+            deduper: 유사 중복 탐지기(MinHashDeduper), 지정하면 유사 중복 군집마다 리뷰 1개만 분석
         """
         self.reviews_dir = reviews_dir
+        self.store = store
         self.book_info_file = book_info_file
         self.output_file = output_file
         self.book_info = {}  # 도서코드 -> 도서정보 매핑
-        self.results = []  # 분석 결과 저장
+        self.results = []  # 아직 저장하지 않은 분석 결과
+        self.result_sink = None  # 파이프라인 실행 중 저장 단계 (백그라운드 스레드)
+        self.writer = ResultWriter(os.path.splitext(output_file)[0] + '.jsonl')
+        self.batch_size = batch_size
+        self.batch_token_budget = batch_token_budget
+        self.cache = cache
+        self.local_model = local_model
+        self.confidence_threshold = confidence_threshold
+        self.score_workers = score_workers
+        self.prefetch_size = prefetch_size
+        self.cascade_stats = {'local': 0, 'escalated': 0, 'llm_agree': 0, 'llm_compared': 0, 'rating_agree': 0}
+        self.lexicon = LexiconScorer()
+        self.deduper = deduper
+        self.duplicate_of = {}  # (도서코드, 리뷰번호) -> 유사 중복 군집 대표 키 (2개 이상인 군집만)
+        self.claimed_clusters = set()  # 분석할 리뷰가 이미 정해진 군집
+        self.cluster_results = {}  # 군집 대표 키 -> 분석 결과
+        self.dedupe_stats = {'propagated': 0}
         
         # OpenAI API 키 설정 (환경 변수에서 가져오거나 직접 설정)
         openai.api_key = os.getenv("OPENAI_API_KEY")
         if not openai.api_key:
             logger.warning("OpenAI API 키가 설정되지 않았습니다. 테스트 모드로 실행됩니다.")
+        # 재시도는 스케줄러가 RPM/TPM 한도와 함께 처리하므로 클라이언트 자체 재시도는 끔
+        self.client = openai.OpenAI(api_key=openai.api_key, base_url=base_url, max_retries=0) if openai.api_key else None
+        self.scheduler = LLMScheduler(max_concurrency=max_concurrency, rpm=rpm, tpm=tpm)
         
         # LLM 모델 설정
         self.model = "gpt-3.5-turbo"
@@ -75,6 +170,31 @@ class KyoboReviewAnalyzer:
         JSON 형식으로만 응답해주세요.
         """
         
+        # 배치 감성분석 프롬프트 템플릿 (리뷰 id는 배치 안에서의 순번)
+        self.batch_prompt_template = """
+        다음은 도서 리뷰 목록입니다. 각 리뷰의 감성을 분석해주세요.
+        
+        리뷰 목록 (JSON 배열, id는 리뷰 식별자):
+        {reviews}
+        
+        각 리뷰마다 아래 형식의 객체를 담은 JSON 배열로만 응답해주세요:
+        [
+            {{
+                "id": 리뷰 id,
+                "sentiment": "긍정" 또는 "부정" 또는 "중립",
+                "score": -1부터 1 사이의 감성 점수(긍정: 0~1, 부정: -1~0, 중립: 0 부근),
+                "keywords": [감성을 판단하는데 중요한 단어 또는 구문 3개],
+                "summary": "리뷰의 핵심 내용을 한 문장으로 요약"
+            }}
+        ]
+        
+        모든 id에 대해 빠짐없이 응답하고, JSON 배열 외의 텍스트는 쓰지 마세요.
+        """
+        
+        # 프롬프트 버전 (템플릿이 바뀌면 캐시 키가 달라져 다시 분석)
+        self.prompt_version = hashlib.sha256(
+            (self.prompt_template + self.batch_prompt_template).encode('utf-8')).hexdigest()[:12]
+        
         logger.info("리뷰 분석기 초기화 완료")
     
     def load_book_info(self):
@@ -127,6 +247,37 @@ class KyoboReviewAnalyzer:
             return match.group(1)
         return None
     
+    def iter_review_frames(self, max_files=None):
+        """
+        분석할 리뷰를 도서 단위로 반환 - 리뷰 저장소가 있으면 도서별 조회, 없으면 리뷰 파일 순회
+        
+        Args:
+            max_files: 처리할 최대 파일(도서) 수
+            
+        Yields:
+            tuple: (출처 이름, 도서코드 또는 None, 리뷰 DataFrame 로더 (columns 인자로 읽을 컬럼 지정 가능))
+        """
+        if self.store is not None:
+            book_codes = self.store.book_codes()
+            logger.info(f"리뷰 저장소에서 총 {len(book_codes)}권 발견")
+            if max_files and max_files < len(book_codes):
+                book_codes = book_codes[:max_files]
+            default_columns = ['리뷰번호', '회원ID', '작성일시', '평점', '리뷰내용']
+            for book_code in book_codes:
+                yield f"{os.path.basename(self.store.db_path)}:{book_code}", book_code, \
+                    lambda columns=default_columns, code=book_code: self.store.load([code], columns=columns)
+            return
+        
+        review_files = glob.glob(os.path.join(self.reviews_dir, "*.csv"))
+        logger.info(f"총 {len(review_files)}개 리뷰 파일 발견")
+        if max_files and max_files < len(review_files):
+            review_files = review_files[:max_files]
+        for file_path in review_files:
+            file_name = os.path.basename(file_path)
+            yield file_name, self.extract_book_code_from_filename(file_name), \
+                lambda columns=None, path=file_path: pd.read_csv(
+                    path, usecols=(lambda column: column in columns) if columns else None)
+    
     def get_book_title(self, book_code):
         """
         도서코드로 제목 조회
@@ -151,7 +302,7 @@ class KyoboReviewAnalyzer:
         Returns:
             dict: 감성분석 결과
         """
-        if not openai.api_key:
+        if self.client is None:
             # API 키가 없는 경우 가상의 결과 반환 (테스트용)
             return self.simulate_sentiment_analysis(review_text)
         
@@ -165,19 +316,8 @@ class KyoboReviewAnalyzer:
             # 프롬프트 생성
             prompt = self.prompt_template.format(review=review_text)
             
-            # OpenAI API 호출
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "당신은 도서 리뷰의 감성을 분석하는 전문가입니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=300
-            )
-            
-            # 응답 텍스트 추출
-            result_text = response.choices[0].message.content.strip()
+            # OpenAI API 호출 및 응답 텍스트 추출
+            result_text = self.chat_completion(prompt, max_tokens=300)
             
             # JSON 형태가 아닌 경우 처리
             if not result_text.startswith('{') or not result_text.endswith('}'):
@@ -201,14 +341,292 @@ class KyoboReviewAnalyzer:
             return result
             
         except Exception as e:
+            if LLMScheduler.is_fatal(e):
+                raise
             logger.error(f"감성분석 중 오류: {str(e)}")
             # 오류 발생 시 기본값 반환
-            return {
-                "sentiment": "오류",
-                "score": 0,
-                "keywords": ["오류 발생"],
-                "summary": f"오류: {str(e)}"
-            }
+            return self.error_result(e)
+    
+    @staticmethod
+    def error_result(error):
+        """요청 실패 시 기록할 감성분석 결과"""
+        return {
+            "sentiment": "오류",
+            "score": 0,
+            "keywords": ["오류 발생"],
+            "summary": f"오류: {str(error)}"
+        }
+    
+    def chat_completion(self, prompt, max_tokens):
+        """
+        OpenAI ChatCompletion 호출
+        
+        Args:
+            prompt: 사용자 프롬프트
+            max_tokens: 최대 응답 토큰 수
+            
+        Returns:
+            str: 응답 텍스트
+        """
+        response = self.scheduler.call(
+            self.client.chat.completions.create,
+            tokens=self.estimate_tokens(prompt) + max_tokens,
+            model=self.model,
+            messages=[
+                {"role": "system", "content": "당신은 도서 리뷰의 감성을 분석하는 전문가입니다."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=max_tokens
+        )
+        return (response.choices[0].message.content or '').strip()
+    
+    @staticmethod
+    def estimate_tokens(text):
+        """텍스트의 토큰 수 추정"""
+        return math.ceil(len(text) * TOKENS_PER_CHAR)
+    
+    def make_batches(self, items):
+        """
+        리뷰를 요청 단위로 묶기 - batch_size와 토큰 예산을 넘지 않도록 순서대로 채움
+        
+        Args:
+            items: 리뷰 텍스트가 마지막 원소인 튜플 리스트
+            
+        Returns:
+            list: 배치(튜플 리스트) 리스트
+        """
+        batches = []
+        batch = []
+        tokens = 0
+        for item in items:
+            # 리뷰 텍스트 + id/구분자 오버헤드
+            item_tokens = self.estimate_tokens(str(item[-1])[:500]) + 10
+            if batch and (len(batch) >= self.batch_size or tokens + item_tokens > self.batch_token_budget):
+                batches.append(batch)
+                batch = []
+                tokens = 0
+            batch.append(item)
+            tokens += item_tokens
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    @staticmethod
+    def normalize_sentiment_result(item):
+        """
+        응답 항목 검증 및 정규화
+        
+        Returns:
+            dict 또는 None: 감성분석 결과, 형식이 맞지 않으면 None
+        """
+        if not isinstance(item, dict) or item.get('sentiment') not in SENTIMENTS:
+            return None
+        try:
+            score = max(-1.0, min(1.0, float(item.get('score', 0))))
+        except (TypeError, ValueError):
+            return None
+        
+        keywords = item.get('keywords', [])
+        if isinstance(keywords, str):
+            keywords = [keyword.strip() for keyword in keywords.split(',') if keyword.strip()]
+        
+        return {
+            "sentiment": item['sentiment'],
+            "score": score,
+            "keywords": [str(keyword) for keyword in keywords][:3],
+            "summary": str(item.get('summary', ''))
+        }
+    
+    def parse_batch_response(self, result_text):
+        """
+        배치 응답에서 id별 감성분석 결과 추출 - 배열 전체 파싱이 실패하면 객체 단위로 파싱
+        
+        Args:
+            result_text: LLM 응답 텍스트
+            
+        Returns:
+            dict: id(int) -> 감성분석 결과 (형식이 올바른 항목만)
+        """
+        items = []
+        start, end = result_text.find('['), result_text.rfind(']')
+        try:
+            if start == -1 or end <= start:
+                raise ValueError("JSON 배열 없음")
+            items = json.loads(result_text[start:end+1])
+        except ValueError:
+            # 잘린 응답 등: 중첩 없는 객체마다 개별 파싱
+            for match in re.finditer(r'\{[^{}]*\}', result_text):
+                try:
+                    items.append(json.loads(match.group(0)))
+                except ValueError:
+                    continue
+        
+        parsed = {}
+        for item in items if isinstance(items, list) else []:
+            result = self.normalize_sentiment_result(item)
+            try:
+                item_id = int(item.get('id'))
+            except (AttributeError, TypeError, ValueError):
+                continue
+            if result is not None:
+                parsed[item_id] = result
+        return parsed
+    
+    def analyze_sentiment_batch(self, review_texts):
+        """
+        여러 리뷰를 한 번의 요청으로 감성 분석 - 응답이 잘리거나 누락/잘못된 항목이 있으면 해당 리뷰만 반으로 나눠 재요청
+        
+        요청 자체가 실패하면 나누지 않음: 재시도할 수 없는 오류(인증, 잘못된 요청 등)는 그대로 발생시키고,
+        스케줄러의 재시도 횟수를 넘긴 오류는 배치 전체를 오류 결과로 반환
+        
+        Args:
+            review_texts: 분석할 리뷰 텍스트 리스트
+            
+        Returns:
+            list: 입력 순서대로 감성분석 결과 dict 리스트
+        """
+        if self.client is None:
+            return self.simulate_sentiment_batch(review_texts)
+        if len(review_texts) == 1:
+            return [self.analyze_sentiment(review_texts[0])]
+        
+        reviews = [{"id": i, "review": str(text)[:500]} for i, text in enumerate(review_texts)]
+        prompt = self.batch_prompt_template.format(reviews=json.dumps(reviews, ensure_ascii=False))
+        
+        try:
+            # 리뷰당 응답 약 120토큰
+            result_text = self.chat_completion(prompt, max_tokens=min(4096, 120 * len(reviews) + 100))
+        except Exception as e:
+            if LLMScheduler.error_status(e) is None:
+                raise
+            logger.error(f"배치 감성분석 중 오류 ({len(reviews)}개): {str(e)}")
+            return [self.error_result(e) for _ in review_texts]
+        
+        parsed = self.parse_batch_response(result_text)
+        missing = [i for i in range(len(review_texts)) if i not in parsed]
+        if missing:
+            logger.warning(f"배치 응답에서 {len(missing)}/{len(review_texts)}개 리뷰 누락, 나눠서 재요청")
+            half = (len(missing) + 1) // 2
+            for part in (missing[:half], missing[half:]):
+                if part:
+                    parsed.update(zip(part, self.analyze_sentiment_batch([review_texts[i] for i in part])))
+        
+        return [parsed[i] for i in range(len(review_texts))]
+    
+    def analyze_pending_batch(self, batch):
+        """
+        make_batches로 묶은 배치 1개 감성 분석
+        
+        Args:
+            batch: (리뷰번호, 리뷰 행, 리뷰 텍스트) 튜플 리스트
+            
+        Returns:
+            list: 배치 순서대로 감성분석 결과 dict 리스트
+        """
+        review_texts = [review_text for _, _, review_text in batch]
+        if self.client is None:
+            return self.simulate_sentiment_batch(review_texts)
+        if self.batch_size > 1:
+            results = self.analyze_sentiment_batch(review_texts)
+        else:
+            results = [self.analyze_sentiment(review_text) for review_text in review_texts]
+        
+        # 실제 API 분석 결과 중 정상 결과만 캐시에 저장
+        if self.cache is not None and self.client is not None:
+            self.cache.put_many([(text, result) for text, result in zip(review_texts, results) if self.is_cacheable(result)],
+                                self.model, self.prompt_version)
+        return results
+    
+    def is_cacheable(self, result):
+        """캐시에 저장할 결과인지 확인 (오류/분석 불가 결과 제외)"""
+        return self.normalize_sentiment_result(result) is not None and result.get('summary') != '분석 불가'
+    
+    def append_result(self, file_name, book_code, book_title, review_id, row, review_text, sentiment_result, method='llm'):
+        """리뷰 1개의 감성분석 결과를 결과 목록에 추가 (method: llm, local, cache, simulation, duplicate)"""
+        # 유사 중복 군집에서 분석한 리뷰의 결과는 같은 군집의 나머지 리뷰에 복사하기 위해 보관
+        # (오류/분석 불가 결과는 복사하지 않아 나머지 리뷰가 직접 분석됨)
+        cluster = self.duplicate_of.get((str(book_code), str(review_id)))
+        if cluster is not None and method != 'duplicate' and self.is_cacheable(sentiment_result):
+            self.cluster_results[cluster] = sentiment_result
+        
+        self.results.append({
+            '파일명': file_name,
+            '도서코드': book_code,
+            '도서제목': book_title,
+            '리뷰번호': review_id,
+            '회원ID': row.get('회원ID', ''),
+            '작성일시': row.get('작성일시', ''),
+            '평점': row.get('평점', 0),
+            '리뷰내용': review_text[:100] + ('...' if len(review_text) > 100 else ''),
+            '감성': sentiment_result.get('sentiment', ''),
+            '감성점수': sentiment_result.get('score', 0),
+            '키워드': ', '.join(sentiment_result.get('keywords', [])),
+            '요약': sentiment_result.get('summary', ''),
+            '분석방식': method
+        })
+    
+    def apply_local_model(self, chunk, processed_reviews):
+        """
+        로컬 모델 점수 적용 - 신뢰도가 기준 이상이고 감성 사전 결과와 충돌하지 않는 결과는 바로 저장하고
+        나머지는 LLM 분석 대상으로 반환
+        
+        Args:
+            chunk: score_chunk를 거친 청크 dict
+            processed_reviews: 처리 완료한 리뷰 키 집합
+            
+        Returns:
+            tuple: (LLM으로 분석할 리뷰 튜플 리스트, 리뷰번호 -> 로컬 예측 감성 dict)
+        """
+        pending = chunk['pending']
+        file_name, book_code, book_title = chunk['file_name'], chunk['book_code'], chunk['book_title']
+        predictions = chunk['local_predictions']
+        lexicon_sentiments = chunk['lexicon_sentiments']
+        ratings = rating_to_label([row.get('평점') for _, row, _ in pending])
+        
+        escalated = []
+        local_sentiments = {}
+        for item, prediction, lexicon_sentiment, rating_label in zip(pending, predictions, lexicon_sentiments, ratings):
+            review_id, row, review_text = item
+            conflict = lexicon_sentiment != "중립" and lexicon_sentiment != prediction['sentiment']
+            if prediction['confidence'] < self.confidence_threshold or conflict:
+                escalated.append(item)
+                local_sentiments[review_id] = prediction['sentiment']
+                continue
+            
+            self.append_result(file_name, book_code, book_title, review_id, row, review_text, {
+                "sentiment": prediction['sentiment'],
+                "score": prediction['score'],
+                "keywords": prediction['keywords'],
+                "summary": f"로컬 모델 분석 (신뢰도 {prediction['confidence']:.2f})"
+            }, method='local')
+            processed_reviews.add(f"{file_name}_{review_id}")
+            self.cascade_stats['local'] += 1
+            if rating_label >= 0 and LOCAL_LABELS[rating_label] == prediction['sentiment']:
+                self.cascade_stats['rating_agree'] += 1
+        
+        self.cascade_stats['escalated'] += len(escalated)
+        return escalated, local_sentiments
+    
+    def log_cascade_summary(self):
+        """로컬 모델 처리 비율(LLM 분석 비율)과 일치율을 로그로 출력"""
+        stats = self.cascade_stats
+        total = stats['local'] + stats['escalated']
+        if not total:
+            return
+        rating_agreement = stats['rating_agree'] / stats['local'] if stats['local'] else 0.0
+        llm_agreement = stats['llm_agree'] / stats['llm_compared'] if stats['llm_compared'] else 0.0
+        logger.info(f"단계적 분석: 로컬 {stats['local']}개, LLM {stats['escalated']}개 (LLM 분석 비율 {stats['escalated'] / total:.1%}), "
+                    f"로컬 결과-평점 일치율 {rating_agreement:.1%}, LLM 분석 리뷰의 로컬 예측 일치율 {llm_agreement:.1%}")
+    
+    def log_dedupe_summary(self):
+        """유사 중복 리뷰 결과 복사로 생략한 분석 수를 로그로 출력"""
+        if self.deduper is None:
+            return
+        detected = self.dedupe_stats.get('detected', {})
+        logger.info(f"유사 중복 리뷰: 군집 {detected.get('clusters', 0)}개, "
+                    f"결과 복사로 분석 생략 {self.dedupe_stats['propagated']}개 "
+                    f"(탐지 시 추정 {detected.get('duplicates', 0)}개)")
     
     def simulate_sentiment_analysis(self, review_text):
         """
@@ -220,38 +638,189 @@ class KyoboReviewAnalyzer:
         Returns:
             dict: 가상의 감성분석 결과
         """
-        # 간단한 감성 분석 규칙 (실제 분석과는 다름)
-        positive_words = ['좋', '훌륭', '추천', '최고', '재미', '만족', '행복']
-        negative_words = ['별로', '실망', '후회', '싫', '나쁨', '불만', '최악']
-        
-        # 긍정/부정 단어 수 계산
-        positive_count = sum([1 for word in positive_words if word in str(review_text)])
-        negative_count = sum([1 for word in negative_words if word in str(review_text)])
-        
-        # 감성 결정
-        if positive_count > negative_count:
-            sentiment = "긍정"
-            score = min(0.5 + (positive_count - negative_count) * 0.1, 1.0)
-            keywords = [word for word in positive_words if word in str(review_text)][:3]
-        elif negative_count > positive_count:
-            sentiment = "부정"
-            score = max(-0.5 - (negative_count - positive_count) * 0.1, -1.0)
-            keywords = [word for word in negative_words if word in str(review_text)][:3]
-        else:
-            sentiment = "중립"
-            score = 0.0
-            keywords = ["중립적", "보통", "평범"]
-        
-        # 키워드 부족한 경우 보완
-        while len(keywords) < 3:
-            keywords.append("기타")
+        return self.simulate_sentiment_batch([review_text])[0]
+    
+    def simulate_sentiment_batch(self, review_texts):
+        """
+        API 키가 없을 때 여러 리뷰를 감성 사전 점수로 한 번에 시뮬레이션 (테스트용, 실제 분석과는 다름)
         
-        return {
+        Args:
+            review_texts: 분석할 리뷰 텍스트 리스트
+            
+        Returns:
+            list: 입력 순서대로 가상의 감성분석 결과 dict 리스트
+        """
+        scores = self.lexicon.score(review_texts)
+        return [{
             "sentiment": sentiment,
-            "score": score,
-            "keywords": keywords,
+            "score": float(score),
+            "keywords": list(keywords),
             "summary": f"이 리뷰는 {sentiment}적인 내용입니다. (시뮬레이션)"
-        }
+        } for sentiment, score, keywords in zip(scores['sentiment'], scores['score'], scores['keywords'])]
+    
+    def read_review_chunks(self, sources, max_reviews_per_file=None):
+        """
+        [읽기 단계] 리뷰 출처를 하나씩 읽어 청크로 반환 (prefetch로 백그라운드 스레드에서 실행)
+        
+        Args:
+            sources: iter_review_frames 결과 리스트
+            max_reviews_per_file: 각 파일에서 분석할 최대 리뷰 수
+            
+        Yields:
+            dict: file_name, book_code, book_title, rows((인덱스, 리뷰 dict) 리스트)
+        """
+        for file_name, book_code, load_reviews in sources:
+            # 도서코드 확인
+            if not book_code:
+                logger.warning(f"파일명에서 도서코드를 추출할 수 없음: {file_name}")
+                continue
+            
+            try:
+                # 리뷰 데이터 로드
+                reviews_df = load_reviews()
+            except Exception as e:
+                logger.error(f"파일 처리 중 오류: {file_name} - {str(e)}")
+                continue
+            
+            if reviews_df.empty:
+                logger.warning(f"빈 리뷰 파일: {file_name}")
+                continue
+            
+            # 필수 컬럼 확인
+            if '리뷰내용' not in reviews_df.columns:
+                logger.warning(f"리뷰내용 컬럼이 없음: {file_name}")
+                continue
+            
+            # 리뷰 샘플링 (최대 개수 제한)
+            if max_reviews_per_file and len(reviews_df) > max_reviews_per_file:
+                reviews_df = reviews_df.sample(max_reviews_per_file, random_state=42)
+            
+            yield {
+                'file_name': file_name,
+                'book_code': book_code,
+                'book_title': self.get_book_title(book_code),
+                'rows': list(reviews_df.to_dict('index').items()),
+            }
+    
+    def select_pending(self, chunk, processed_reviews):
+        """
+        [선별 단계] 이미 처리된 리뷰와 빈 리뷰를 제외하고, 캐시에 결과가 있는 리뷰와
+        유사 중복 군집에서 이미 다른 리뷰를 분석하기로 한 리뷰는 분석 대상에서 분리
+        
+        Args:
+            chunk: read_review_chunks 청크
+            processed_reviews: 처리 완료한 리뷰 키 집합
+            
+        Returns:
+            dict: pending((리뷰번호, 리뷰 dict, 리뷰 텍스트) 리스트), cached(캐시 결과 포함 튜플 리스트),
+                duplicates(군집 대표 키 포함 튜플 리스트)가 추가된 청크
+        """
+        pending = []
+        cached = []
+        duplicates = []
+        for idx, row in chunk.pop('rows'):
+            # 이미 처리된 리뷰인지 확인
+            review_id = row.get('리뷰번호', str(idx))
+            if f"{chunk['file_name']}_{review_id}" in processed_reviews:
+                continue
+            
+            # 리뷰 내용 확인
+            review_text = row.get('리뷰내용', '')
+            if not isinstance(review_text, str) or not review_text.strip():
+                continue
+            
+            # 유사 중복 군집은 먼저 선별된 리뷰 1개만 분석하고 나머지는 분석 후 결과 복사
+            cluster = self.duplicate_of.get((str(chunk['book_code']), str(review_id)))
+            if cluster is not None:
+                if cluster in self.claimed_clusters:
+                    duplicates.append((review_id, row, review_text, cluster))
+                    continue
+                self.claimed_clusters.add(cluster)
+            
+            # 캐시에 같은 리뷰 텍스트의 결과가 있으면 API 호출 없이 사용
+            result = self.cache.get(review_text, self.model, self.prompt_version) if self.cache is not None else None
+            if result is not None:
+                cached.append((review_id, row, review_text, result))
+                continue
+            
+            pending.append((review_id, row, review_text))
+        
+        chunk['pending'] = pending
+        chunk['cached'] = cached
+        chunk['duplicates'] = duplicates
+        return chunk
+    
+    def scoring_pool(self):
+        """로컬 점수 단계용 프로세스 풀 (로컬 모델이 없거나 score_workers가 0이면 풀 없음)"""
+        if self.local_model is None or not self.score_workers:
+            return nullcontext()
+        return ProcessPoolExecutor(max_workers=self.score_workers, initializer=_init_scoring_worker,
+                                   initargs=(self.local_model, self.lexicon))
+    
+    def analyze_chunk(self, chunk, processed_reviews):
+        """
+        [분석/저장 단계] 캐시 결과와 로컬 모델 결과를 저장하고, 나머지 리뷰는 LLM으로 분석하여 배치마다 저장한 뒤
+        유사 중복 리뷰에 군집에서 분석한 결과 복사 (청크는 순서대로 분석되므로 먼저 선별된 리뷰의 결과가 이미 있음)
+        
+        Args:
+            chunk: score_chunk를 거친 청크 dict
+            processed_reviews: 처리 완료한 리뷰 키 집합
+        """
+        file_name, book_code, book_title = chunk['file_name'], chunk['book_code'], chunk['book_title']
+        
+        for review_id, row, review_text, result in chunk['cached']:
+            self.append_result(file_name, book_code, book_title, review_id, row, review_text, result, method='cache')
+            processed_reviews.add(f"{file_name}_{review_id}")
+        
+        # 로컬 모델 결과 적용, 신뢰도가 낮은 리뷰만 LLM으로 분석
+        pending = chunk['pending']
+        local_sentiments = {}
+        if 'local_predictions' in chunk:
+            pending, local_sentiments = self.apply_local_model(chunk, processed_reviews)
+        self.analyze_batches(chunk, pending, local_sentiments, processed_reviews)
+        
+        # 유사 중복 리뷰 결과 복사 (군집에서 분석한 리뷰가 실패해 정상 결과가 없으면 직접 분석)
+        unresolved = []
+        for review_id, row, review_text, cluster in chunk['duplicates']:
+            result = self.cluster_results.get(cluster)
+            if result is None:
+                unresolved.append((review_id, row, review_text))
+                continue
+            self.append_result(file_name, book_code, book_title, review_id, row, review_text, result, method='duplicate')
+            processed_reviews.add(f"{file_name}_{review_id}")
+            self.dedupe_stats['propagated'] += 1
+        if unresolved:
+            self.analyze_batches(chunk, unresolved, {}, processed_reviews)
+    
+    def analyze_batches(self, chunk, pending, local_sentiments, processed_reviews):
+        """
+        리뷰 목록을 LLM으로 분석하여 배치마다 저장
+        
+        Args:
+            chunk: 청크 dict (파일명, 도서코드, 도서제목)
+            pending: (리뷰번호, 리뷰 행, 리뷰 텍스트) 튜플 리스트
+            local_sentiments: 리뷰번호 -> 로컬 예측 감성 dict (일치율 집계용)
+            processed_reviews: 처리 완료한 리뷰 키 집합
+        """
+        file_name, book_code, book_title = chunk['file_name'], chunk['book_code'], chunk['book_title']
+        
+        # 요청 단위로 묶어서 동시에 감성 분석 (batch_size가 1이면 리뷰마다 요청), 결과는 입력 순서대로 반환
+        # 테스트 모드(API 키 없음)는 요청이 없으므로 파일 전체를 한 번에 시뮬레이션
+        batches = self.make_batches(pending) if self.client is not None else [pending] if pending else []
+        batch_results = self.scheduler.map(self.analyze_pending_batch, batches)
+        for batch, sentiment_results in tqdm(zip(batches, batch_results), total=len(batches), desc=f"분석 중: {file_name}"):
+            for (review_id, row, review_text), sentiment_result in zip(batch, sentiment_results):
+                # 결과 저장
+                self.append_result(file_name, book_code, book_title, review_id, row, review_text, sentiment_result,
+                                   method='llm' if self.client is not None else 'simulation')
+                # 로컬/LLM 일치율은 LLM이 정상 결과를 낸 리뷰만 비교 (요청 실패는 불일치로 세지 않음)
+                if review_id in local_sentiments and self.is_cacheable(sentiment_result):
+                    self.cascade_stats['llm_compared'] += 1
+                    self.cascade_stats['llm_agree'] += local_sentiments[review_id] == sentiment_result.get('sentiment')
+                processed_reviews.add(f"{file_name}_{review_id}")
+            
+            # 배치마다 새 결과만 저널에 추가
+            self.save_results()
     
     def process_reviews(self, max_files=None, max_reviews_per_file=10):
         """
@@ -270,138 +839,92 @@ class KyoboReviewAnalyzer:
                 if not self.load_book_info():
                     return False
             
-            # 리뷰 파일 목록 가져오기
-            review_files = glob.glob(os.path.join(self.reviews_dir, "*.csv"))
+            # 리뷰 출처(저장소의 도서 또는 리뷰 파일) 목록 가져오기
+            sources = list(self.iter_review_frames(max_files))
             
-            if not review_files:
+            if not sources:
                 logger.warning(f"리뷰 파일을 찾을 수 없음: {self.reviews_dir}")
                 return False
             
-            logger.info(f"총 {len(review_files)}개 리뷰 파일 발견")
+            # 저널이 없고 이전 버전의 결과 CSV만 있는 경우 저널로 가져오기
+            try:
+                self.writer.import_csv(self.output_file)
+            except Exception as e:
+                logger.error(f"기존 결과 로드 중 오류: {str(e)}")
             
-            # 이미 결과 파일이 있는 경우 로드
-            if os.path.exists(self.output_file):
-                try:
-                    existing_results = pd.read_csv(self.output_file)
-                    self.results = existing_results.to_dict('records')
-                    logger.info(f"기존 분석 결과 로드: {len(self.results)}개 항목")
-                except Exception as e:
-                    logger.error(f"기존 결과 로드 중 오류: {str(e)}")
-            
-            # 이미 처리된 파일/리뷰 확인
-            processed_reviews = set()
-            if self.results:
-                for result in self.results:
-                    if '파일명' in result and '리뷰번호' in result:
-                        key = f"{result['파일명']}_{result['리뷰번호']}"
-                        processed_reviews.add(key)
-            
-            # 파일 처리
-            if max_files and max_files < len(review_files):
-                review_files = review_files[:max_files]
-            
-            for file_idx, file_path in enumerate(review_files):
-                file_name = os.path.basename(file_path)
-                logger.info(f"파일 처리 중 ({file_idx+1}/{len(review_files)}): {file_name}")
-                
-                # 도서코드 추출
-                book_code = self.extract_book_code_from_filename(file_name)
-                if not book_code:
-                    logger.warning(f"파일명에서 도서코드를 추출할 수 없음: {file_name}")
-                    continue
-                
-                # 도서 제목 가져오기
-                book_title = self.get_book_title(book_code)
+            # 이미 처리된 파일/리뷰 확인 (저널 인덱스의 재개 키)
+            processed_reviews = self.writer.load_keys()
+            if processed_reviews:
+                logger.info(f"기존 분석 결과: {len(processed_reviews)}개 항목")
+            
+            # 전체 리뷰의 유사 중복 군집 탐색 (군집마다 리뷰 1개만 분석)
+            if self.deduper is not None:
+                self.duplicate_of, self.dedupe_stats['detected'] = self.deduper.find_duplicates(
+                    iter_dedupe_frames(sources))
+            
+            # 스트리밍 파이프라인: 읽기(백그라운드 스레드) -> 선별(재개 키/캐시) -> 로컬 점수(프로세스 풀) -> LLM 분석/저장
+            chunks = prefetch(self.read_review_chunks(sources, max_reviews_per_file), maxsize=self.prefetch_size)
+            chunks = (self.select_pending(chunk, processed_reviews) for chunk in chunks)
+            with self.scoring_pool() as pool, ThreadedSink(self.write_results) as self.result_sink:
+                if pool is None:
+                    chunks = (score_chunk(chunk, self.local_model, self.lexicon) for chunk in chunks)
+                else:
+                    chunks = ordered_map(_score_chunk_in_worker, chunks, pool, max_pending=2 * self.score_workers)
                 
-                try:
-                    # 리뷰 데이터 로드
-                    reviews_df = pd.read_csv(file_path)
-                    
-                    if reviews_df.empty:
-                        logger.warning(f"빈 리뷰 파일: {file_name}")
-                        continue
-                    
-                    # 필수 컬럼 확인
-                    if '리뷰내용' not in reviews_df.columns:
-                        logger.warning(f"리뷰내용 컬럼이 없음: {file_name}")
-                        continue
-                    
-                    # 리뷰 샘플링 (최대 개수 제한)
-                    if max_reviews_per_file and len(reviews_df) > max_reviews_per_file:
-                        reviews_df = reviews_df.sample(max_reviews_per_file, random_state=42)
-                    
-                    # 각 리뷰 처리
-                    for idx, row in tqdm(reviews_df.iterrows(), total=len(reviews_df), desc=f"분석 중: {file_name}"):
-                        # 이미 처리된 리뷰인지 확인
-                        review_id = row.get('리뷰번호', str(idx))
-                        review_key = f"{file_name}_{review_id}"
-                        
-                        if review_key in processed_reviews:
-                            continue
-                        
-                        # 리뷰 내용 확인
-                        review_text = row.get('리뷰내용', '')
-                        if not isinstance(review_text, str) or not review_text.strip():
-                            continue
-                        
-                        # 리뷰 메타데이터
-                        reviewer = row.get('회원ID', '')
-                        date = row.get('작성일시', '')
-                        rating = row.get('평점', 0)
-                        
-                        # 감성 분석
-                        sentiment_result = self.analyze_sentiment(review_text)
-                        
-                        # 결과 저장
-                        result = {
-                            '파일명': file_name,
-                            '도서코드': book_code,
-                            '도서제목': book_title,
-                            '리뷰번호': review_id,
-                            '회원ID': reviewer,
-                            '작성일시': date,
-                            '평점': rating,
-                            '리뷰내용': review_text[:100] + ('...' if len(review_text) > 100 else ''),
-                            '감성': sentiment_result.get('sentiment', ''),
-                            '감성점수': sentiment_result.get('score', 0),
-                            '키워드': ', '.join(sentiment_result.get('keywords', [])),
-                            '요약': sentiment_result.get('summary', '')
-                        }
-                        
-                        self.results.append(result)
-                        processed_reviews.add(review_key)
-                        
-                        # API 요청 사이에 대기 (1-2초)
-                        time.sleep(random.uniform(1, 2))
+                for file_idx, chunk in enumerate(chunks):
+                    logger.info(f"파일 처리 중 ({file_idx+1}/{len(sources)}): {chunk['file_name']}")
+                    try:
+                        self.analyze_chunk(chunk, processed_reviews)
+                    except Exception as e:
+                        # 인증 실패 등 모든 요청이 실패할 오류는 다음 파일로 넘어가지 않고 중단
+                        if LLMScheduler.is_fatal(e):
+                            raise
+                        logger.error(f"파일 처리 중 오류: {chunk['file_name']} - {str(e)}")
                     
                     # 각 파일 처리 후 중간 결과 저장
                     self.save_results()
-                    
-                except Exception as e:
-                    logger.error(f"파일 처리 중 오류: {file_name} - {str(e)}")
+            self.result_sink = None
             
-            # 최종 결과 저장
+            # 최종 결과 저장 후 중복을 제거한 CSV로 압축
             self.save_results()
-            logger.info(f"모든 리뷰 처리 완료: {len(self.results)}개 항목")
+            total = self.writer.compact(self.output_file)
+            logger.info(f"모든 리뷰 처리 완료: {total}개 항목")
+            self.scheduler.log_summary()
+            self.log_cascade_summary()
+            self.log_dedupe_summary()
+            if self.cache is not None:
+                self.cache.log_summary()
             return True
             
         except Exception as e:
             logger.error(f"리뷰 처리 중 오류: {str(e)}")
-            # 오류 발생 시에도 중간 결과 저장
+            # 오류 발생 시에도 중간 결과 저장 (저장 단계 스레드는 이미 종료되었으므로 바로 저장)
+            self.result_sink = None
             if self.results:
                 self.save_results()
             return False
     
+    def write_results(self, row_groups):
+        """
+        [저장 단계] 결과 행 묶음들을 한 번에 저널에 추가
+        
+        Args:
+            row_groups: 결과 dict 리스트의 리스트
+        """
+        count = self.writer.append([row for rows in row_groups for row in rows])
+        logger.info(f"결과 저장 완료: {self.writer.path} (+{count}개 항목)")
+    
     def save_results(self):
-        """분석 결과를 CSV 파일로 저장"""
+        """아직 저장하지 않은 분석 결과를 저장 단계로 넘기기 (파이프라인 밖에서는 바로 저널에 추가)"""
         try:
             if not self.results:
-                logger.warning("저장할 결과가 없습니다.")
                 return
             
-            df = pd.DataFrame(self.results)
-            df.to_csv(self.output_file, index=False, encoding='utf-8-sig')
-            logger.info(f"결과 저장 완료: {self.output_file} ({len(self.results)}개 항목)")
+            rows, self.results = self.results, []
+            if self.result_sink is not None:
+                self.result_sink.put(rows)
+            else:
+                self.write_results([rows])
             
         except Exception as e:
             logger.error(f"결과 저장 중 오류: {str(e)}")
@@ -414,13 +937,26 @@ if __name__ == "__main__":
     book_info_file = "homework/data/kyobo_book_url.csv"
     output_file = "result/kyobo_book_sentiment_analysis.csv"
     
-    # 감성분석 객체 생성 및 실행
-    analyzer = KyoboReviewAnalyzer(reviews_dir, book_info_file, output_file)
+    # 리뷰 통합 저장소가 있으면 파일 대신 저장소에서 조회
+    store = ReviewStore(DEFAULT_STORE_PATH) if os.path.exists(DEFAULT_STORE_PATH) else None
+    
+    # 감성분석 결과 캐시
+    cache = SentimentCache()
+    
+    # 로컬 감성 모델 (저장된 모델이 없으면 수집한 리뷰의 평점으로 학습)
+    local_model = load_or_train(store=store, reviews_dir=reviews_dir)
+    
+    # 감성분석 객체 생성 및 실행 (로컬 모델 신뢰도가 낮은 리뷰만 20개씩 묶어서 LLM 요청,
+    # 로컬 점수 계산은 메인 프로세스 몫 1개를 뺀 나머지 CPU 코어에서 실행, 유사 중복 리뷰는 군집마다 1개만 분석)
+    analyzer = KyoboReviewAnalyzer(reviews_dir, book_info_file, output_file, store=store, batch_size=20, cache=cache,
+                                   local_model=local_model, score_workers=(os.cpu_count() or 1) - 1,
+                                   deduper=MinHashDeduper())
     
     # 모든 리뷰 처리 (필요에 따라 파일 수와 리뷰 수 제한 가능)
     # max_files=None: 모든 파일 처리
     # max_reviews_per_file=10: 각 파일에서 최대 10개 리뷰만 처리 (테스트용, 실제로는 더 많이 처리 가능)
     success = analyzer.process_reviews(max_files=None, max_reviews_per_file=None)
+    cache.close()
     
     if success:
         print(f"감성분석 완료! 결과가 {output_file}에 저장되었습니다.")
@@ -0,0 +1,416 @@
+"""
+교보문고 도서 리뷰 비동기 수집 스크립트
+- asyncio + aiohttp로 여러 도서의 리뷰 페이지를 동시에 요청
+- 고정 sleep 대신 호스트별 토큰 버킷(초당 요청 수, 버스트)으로 요청 속도 제어
+- 429/5xx/네트워크 오류 시 Retry-After 및 지수 백오프로 재시도 (그 밖의 4xx는 재시도 없이 실패)
+- base_url을 바꾸면 로컬 대역 서버(canned 리뷰 페이지)로 테스트 가능
+- 크롤링 상태 저장소(CrawlLedger)를 넘기면 완료된 도서는 건너뛰고 실패한 도서만 백오프 후 재시도
+- 증분 모드에서는 도서별 최신 리뷰(작성일시, 리뷰번호) 이후의 새 리뷰만 받아 기존 CSV에 추가
+- 리뷰 통합 저장소(ReviewStore)를 넘기면 도서별 CSV 대신 저장소에 중복 제거 upsert
+- 요청 소요 시간, 재시도, 응답 바이트, 페이지/리뷰 처리량을 CrawlMetrics로 집계
+"""
+
+import os
+import glob
+import json
+import time
+import random
+import asyncio
+import logging
+from datetime import datetime
+from urllib.parse import urlparse
+
+import aiohttp
+import pandas as pd
+
+from kyobo_crawl_metrics import CrawlMetrics
+
+logger = logging.getLogger(__name__)
+
+# 교보문고 리뷰 목록 API
+REVIEW_API_URL = "https://product.kyobobook.co.kr/api/review/list"
+
+# API 응답 필드 -> 저장 CSV 컬럼 (scrap_review 출력과 동일한 컬럼명)
+REVIEW_FIELDS = {
+    'revwNum': '리뷰번호',
+    'mmbrId': '회원ID',
+    'cretDttm': '작성일시',
+    'revwRvgr': '평점',
+    'revwCntt': '리뷰내용',
+}
+
+# 리뷰 CSV 컬럼 순서 (기존 수집 파일과 동일, API 응답에 없는 감정키워드는 빈 값)
+CSV_COLUMNS = ['리뷰번호', '회원ID', '작성일시', '리뷰내용', '감정키워드', '평점']
+
+# 리뷰 정렬 코드 (최신순) - 증분 수집은 최신 리뷰가 앞 페이지에 온다는 전제로 동작
+REVIEW_SORT = '001'
+
+
+class TokenBucket:
+    """호스트별 요청 속도 제한용 토큰 버킷"""
+
+    def __init__(self, rate, burst):
+        """
+        Args:
+            rate: 초당 보충되는 토큰 수 (초당 요청 수)
+            burst: 버킷 최대 용량 (연속으로 보낼 수 있는 최대 요청 수)
+        """
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """토큰 1개를 얻을 때까지 대기"""
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncReviewCollector:
+    """교보문고 리뷰 비동기 수집 클래스"""
+
+    def __init__(self, output_dir, base_url=REVIEW_API_URL, max_concurrency=8, rate=2.0, burst=4,
+                 page_limit=10, max_retries=5, backoff_base=1.0, backoff_max=60.0, timeout=30, ledger=None,
+                 incremental=False, store=None, metrics=None):
+        """
+        Args:
+            output_dir: 리뷰 CSV 저장 디렉토리
+            base_url: 리뷰 목록 API URL (테스트 시 로컬 서버 URL)
+            max_concurrency: 동시에 진행할 최대 요청 수
+            rate: 호스트별 초당 요청 수
+            burst: 호스트별 버스트 허용량
+            page_limit: 페이지당 리뷰 수
+            max_retries: 요청당 최대 재시도 횟수
+            backoff_base: 지수 백오프 기본 대기 시간(초)
+            backoff_max: 백오프 최대 대기 시간(초)
+            timeout: 요청 타임아웃(초)
+            ledger: 크롤링 상태 저장소(CrawlLedger), None이면 항상 전체 도서 수집
+            incremental: True면 이미 수집한 도서도 새 리뷰만 확인하여 기존 파일에 추가
+            store: 리뷰 통합 저장소(ReviewStore), None이면 도서별 CSV 파일로 저장
+            metrics: 처리량 지표(CrawlMetrics), None이면 새로 생성
+        """
+        self.output_dir = output_dir
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst
+        self.page_limit = page_limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.buckets = {}  # 호스트 -> TokenBucket
+        self.ledger = ledger
+        self.incremental = incremental
+        self.store = store
+        self.metrics = metrics if metrics is not None else CrawlMetrics()
+
+    def get_bucket(self, url):
+        """URL의 호스트에 해당하는 토큰 버킷 반환"""
+        host = urlparse(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """
+        재시도 대기 시간 계산 - Retry-After 헤더가 있으면 우선 적용
+
+        Args:
+            attempt: 재시도 횟수 (0부터)
+            retry_after: Retry-After 헤더 값
+
+        Returns:
+            float: 대기 시간(초)
+        """
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        delay = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def fetch_json(self, session, params):
+        """
+        토큰 버킷과 재시도를 적용하여 리뷰 API 호출
+
+        Args:
+            session: aiohttp.ClientSession
+            params: 요청 파라미터
+
+        Returns:
+            dict: 응답 JSON
+        """
+        bucket = self.get_bucket(self.base_url)
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            retry_reason = None
+            start = time.monotonic()
+            try:
+                # 동시 요청 자리를 먼저 얻은 뒤 토큰을 사용 (자리를 기다리는 동안 토큰이 소모되지 않도록)
+                async with self.semaphore:
+                    await bucket.acquire()
+                    start = time.monotonic()
+                    async with session.get(self.base_url, params=params) as response:
+                        body = await response.read()
+                        self.metrics.observe_request(time.monotonic() - start, response.status, len(body))
+                        if response.status == 429 or response.status >= 500:
+                            retry_after = response.headers.get('Retry-After')
+                            last_error = f"HTTP {response.status}"
+                            retry_reason = '429' if response.status == 429 else '5xx'
+                        else:
+                            response.raise_for_status()
+                            self.metrics.add_pages()
+                            return json.loads(body)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # 429/5xx 외의 HTTP 오류(400/403/404 등)는 재시도해도 같은 결과이므로 바로 실패
+                if isinstance(e, aiohttp.ClientResponseError) and e.status < 500 and e.status != 429:
+                    raise RuntimeError(f"HTTP {e.status}: {params}") from e
+                self.metrics.observe_request(time.monotonic() - start, type(e).__name__)
+                last_error = str(e) or type(e).__name__
+                retry_reason = type(e).__name__
+
+            if attempt < self.max_retries:
+                self.metrics.add_retry(retry_reason)
+                delay = self.backoff_delay(attempt, retry_after)
+                logger.warning(f"요청 실패 ({last_error}), {delay:.1f}초 후 재시도 ({attempt+1}/{self.max_retries}): {params}")
+                await asyncio.sleep(delay)
+
+        raise RuntimeError(f"최대 재시도 초과: {last_error}")
+
+    def review_params(self, book_code, page):
+        """리뷰 목록 요청 파라미터"""
+        return {
+            'page': page,
+            'pageLimit': self.page_limit,
+            'reviewSort': REVIEW_SORT,
+            'revwPatrCode': '000',
+            'saleCmdtid': book_code,
+        }
+
+    @staticmethod
+    def parse_reviews(payload):
+        """
+        리뷰 API 응답에서 리뷰 목록과 전체 리뷰 수 추출
+
+        Returns:
+            tuple: (리뷰 dict 리스트, 전체 리뷰 수)
+        """
+        data = payload.get('data') or {}
+        reviews = [{column: item.get(field) for field, column in REVIEW_FIELDS.items()}
+                   for item in data.get('reviewList') or []]
+        return reviews, int(data.get('totalCount') or 0)
+
+    async def collect_book(self, session, book_code):
+        """
+        도서 1권의 전체 리뷰 수집 - 첫 페이지로 전체 수를 확인한 뒤 나머지 페이지를 동시에 요청
+
+        Returns:
+            list: 리뷰 dict 리스트
+        """
+        first = await self.fetch_json(session, self.review_params(book_code, 1))
+        reviews, total = self.parse_reviews(first)
+
+        pages = range(2, (total + self.page_limit - 1) // self.page_limit + 1)
+        payloads = await asyncio.gather(*[self.fetch_json(session, self.review_params(book_code, page))
+                                          for page in pages])
+        for payload in payloads:
+            reviews.extend(self.parse_reviews(payload)[0])
+
+        return reviews
+
+    @staticmethod
+    def review_key(review):
+        """리뷰 선후 비교용 키 (작성일시, 리뷰번호)"""
+        try:
+            number = int(review.get('리뷰번호') or 0)
+        except (TypeError, ValueError):
+            number = 0
+        return str(review.get('작성일시') or ''), number
+
+    def load_watermark(self, book_code):
+        """
+        도서별 마지막 수집 위치 조회 - 리뷰 저장소, 상태 저장소 기록 순으로 사용하고, 없으면 기존 CSV 파일에서 계산
+
+        Returns:
+            tuple: (기존 파일 경로, 최신 리뷰 키) 또는 이전 수집 기록이 없으면 (None, None)
+        """
+        if self.store is not None:
+            latest = self.store.latest_key(book_code)
+            return (self.store.db_path, latest) if latest is not None else (None, None)
+
+        if self.ledger is not None:
+            record = self.ledger.get('review', book_code)
+            saved = (record or {}).get('result') or {}
+            if saved.get('latest') and saved.get('file') and os.path.exists(saved['file']):
+                return saved['file'], tuple(saved['latest'])
+
+        files = sorted(glob.glob(os.path.join(self.output_dir, f"교보_{book_code}_리뷰_*.csv")))
+        if not files:
+            return None, None
+
+        df = pd.read_csv(files[-1], encoding='utf-8-sig')
+        if df.empty:
+            return files[-1], ('', 0)
+        return files[-1], max(self.review_key(row) for row in df.to_dict('records'))
+
+    async def collect_book_delta(self, session, book_code, latest):
+        """
+        새 리뷰만 수집 - 최신순 페이지를 차례로 요청하다가 이미 수집한 리뷰를 만나면 중단
+
+        Args:
+            latest: 이미 수집한 최신 리뷰 키 (작성일시, 리뷰번호)
+
+        Returns:
+            list: 새 리뷰 dict 리스트
+        """
+        reviews = []
+        page = 1
+        while True:
+            items, total = self.parse_reviews(await self.fetch_json(session, self.review_params(book_code, page)))
+            new = [item for item in items if self.review_key(item) > latest]
+            reviews.extend(new)
+            if len(new) < len(items) or not items or page * self.page_limit >= total:
+                break
+            page += 1
+
+        logger.info(f"증분 수집: {book_code} - {page}페이지 확인, 새 리뷰 {len(reviews)}개")
+        return reviews
+
+    def append_reviews(self, file_path, reviews):
+        """기존 리뷰 CSV에 새 리뷰 추가 (헤더 없이 추가하므로 기존 파일의 컬럼 순서에 맞춤)"""
+        if reviews:
+            header = pd.read_csv(file_path, nrows=0, encoding='utf-8-sig').columns
+            pd.DataFrame(reviews).reindex(columns=header).to_csv(
+                file_path, mode='a', header=False, index=False, encoding='utf-8-sig')
+        return file_path
+
+    def save_reviews(self, book_code, reviews):
+        """리뷰를 교보_<도서코드>_리뷰_<timestamp>.csv 로 저장"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        file_path = os.path.join(self.output_dir, f"교보_{book_code}_리뷰_{timestamp}.csv")
+        pd.DataFrame(reviews).reindex(columns=CSV_COLUMNS).to_csv(file_path, index=False, encoding='utf-8-sig')
+        return file_path
+
+    async def collect_one(self, session, book_code, book_title=''):
+        """
+        도서 1권 수집 및 저장, 결과를 dict로 반환
+
+        Returns:
+            dict: 도서코드, 상태(success/empty/failure), 리뷰 수, 파일 경로, 오류 메시지
+        """
+        result = {'도서코드': book_code, '도서 제목': book_title, 'status': 'failure',
+                  'review_count': 0, 'new_count': 0, 'file': None, 'error': None}
+        try:
+            file_path, latest = self.load_watermark(book_code) if self.incremental else (None, None)
+
+            if latest is not None:
+                reviews = await self.collect_book_delta(session, book_code, latest)
+            else:
+                reviews = await self.collect_book(session, book_code)
+            result['new_count'] = len(reviews)
+
+            if self.store is not None:
+                # 리뷰 저장소에 중복 제거 upsert
+                result['new_count'] = self.store.upsert(book_code, reviews)
+                result['file'] = self.store.db_path
+                result['review_count'] = self.store.count(book_code)
+                latest = self.store.latest_key(book_code) or ('', 0)
+            elif latest is not None:
+                # 증분 수집: 새 리뷰만 기존 파일에 추가
+                result['file'] = self.append_reviews(file_path, reviews)
+                previous = self.ledger.get('review', book_code) if self.ledger is not None else None
+                previous_count = ((previous or {}).get('result') or {}).get('review_count')
+                if previous_count is None:
+                    previous_count = len(pd.read_csv(file_path, encoding='utf-8-sig')) - len(reviews)
+                result['review_count'] = previous_count + len(reviews)
+                latest = max([latest] + [self.review_key(review) for review in reviews])
+            else:
+                result['file'] = self.save_reviews(book_code, reviews)
+                result['review_count'] = len(reviews)
+                latest = max([self.review_key(review) for review in reviews], default=('', 0))
+
+            result['status'] = 'success' if result['review_count'] else 'empty'
+            logger.info(f"리뷰 수집 완료: {book_title} ({book_code}) - {result['review_count']}개 (신규 {result['new_count']}개)")
+            self.metrics.add_outcome(result['status'], len(reviews))
+            if self.ledger is not None:
+                self.ledger.mark_done('review', book_code, status=result['status'],
+                                      result={'review_count': result['review_count'], 'file': result['file'],
+                                              'latest': list(latest)},
+                                      content_hash=self.ledger.content_hash(reviews))
+        except Exception as e:
+            result['error'] = str(e)
+            logger.error(f"리뷰 수집 실패: {book_title} ({book_code}) - {str(e)}")
+            self.metrics.add_outcome('failure')
+            if self.ledger is not None:
+                self.ledger.mark_failure('review', book_code, e)
+        return result
+
+    def ledger_result(self, book_code, book_title=''):
+        """
+        상태 저장소 기준으로 건너뛸 도서의 결과 dict 반환 (수집해야 하면 None)
+
+        Returns:
+            dict 또는 None: 완료(success/empty)는 저장된 결과, 재시도 대기 중인 실패 도서는 skipped 상태
+        """
+        if self.ledger is None or self.ledger.should_fetch('review', book_code):
+            return None
+
+        record = self.ledger.get('review', book_code)
+        if self.incremental and record['status'] != 'failure':
+            return None  # 증분 모드에서는 완료된 도서도 새 리뷰 확인
+
+        saved = record['result'] or {}
+        return {'도서코드': book_code, '도서 제목': book_title,
+                'status': record['status'] if record['status'] != 'failure' else 'skipped',
+                'review_count': saved.get('review_count', 0), 'new_count': 0, 'file': saved.get('file'),
+                'error': record['error']}
+
+    async def collect(self, books):
+        """
+        여러 도서의 리뷰를 동시에 수집
+
+        Args:
+            books: (도서코드, 도서 제목) 튜플 리스트
+
+        Returns:
+            list: 도서별 결과 dict 리스트 (입력 순서 유지)
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.metrics.start()
+
+        # 상태 저장소에 완료/재시도 대기로 기록된 도서는 요청하지 않음
+        results = [self.ledger_result(code, title) for code, title in books]
+        todo = [i for i, result in enumerate(results) if result is None]
+        if len(todo) < len(books):
+            logger.info(f"상태 저장소 기준 {len(books) - len(todo)}권 건너뜀, {len(todo)}권 수집")
+            for _ in range(len(books) - len(todo)):
+                self.metrics.add_outcome('skipped')
+
+        async with aiohttp.ClientSession(timeout=self.timeout) as session:
+            collected = await asyncio.gather(*[self.collect_one(session, *books[i]) for i in todo])
+
+        for i, result in zip(todo, collected):
+            results[i] = result
+        self.metrics.finish()
+        self.metrics.log_summary()
+        return results
+
+    def run(self, books):
+        """동기 코드에서 호출하기 위한 진입점"""
+        return asyncio.run(self.collect(books))
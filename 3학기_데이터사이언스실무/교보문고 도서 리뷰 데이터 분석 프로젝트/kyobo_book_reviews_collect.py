@@ -3,10 +3,17 @@
 - homework/data/kyobo_book_list.csv 파일에서 도서 코드를 읽어옴
 - ch03/ref/scraper_kyobo.py의 함수를 활용하여 각 도서의 리뷰 정보 추출
 - 추출된 리뷰 정보를 homework/data/kyobo_reviews/ 폴더에 저장
+- 기본은 kyobo_book_reviews_async의 비동기 수집기 사용 (동시 요청 + 토큰 버킷 속도 제어)
+- 크롤링 상태 저장소(kyobo_crawl_ledger)로 재실행 시 유효 기간 안에 완료된 도서는 건너뛰고 남은 도서만 수집
+- 증분 모드(incremental=True)로 실행하면 도서별 새 리뷰만 받아 기존 리뷰 파일에 추가 (일일 갱신용)
+- 리뷰는 도서별 CSV 대신 리뷰 통합 저장소(kyobo_review_store, SQLite)에 중복 제거하여 저장
+- 도서별 결과를 dict 리스트로 반환하고, 실행마다 처리량 지표를 Prometheus 텍스트/JSON 파일로 저장
 """
 
 import os
+import re
 import sys
+import glob
 import pandas as pd
 import logging
 from datetime import datetime
@@ -16,6 +23,10 @@ import random
 # ch03/ref 경로를 시스템 경로에 추가하여 scraper_kyobo 모듈을 임포트할 수 있게 함
 sys.path.append(os.path.abspath('ch03/ref'))
 from scraper_kyobo import scrap_review
+from kyobo_book_reviews_async import AsyncReviewCollector
+from kyobo_crawl_ledger import CrawlLedger, DEFAULT_MAX_AGE
+from kyobo_review_store import ReviewStore
+from kyobo_crawl_metrics import CrawlMetrics
 
 # 로깅 설정
 logging.basicConfig(
@@ -28,9 +39,60 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def extract_reviews_from_booklist():
+# 수집 지표 파일 (Prometheus textfile collector용 / JSON 요약)
+METRICS_PROM_FILE = "homework/data/kyobo_review_metrics.prom"
+METRICS_JSON_FILE = "homework/data/kyobo_review_metrics.json"
+
+def parse_scrap_result(book_code, book_title, message):
+    """
+    scrap_review 반환 메시지를 구조화된 결과 dict로 변환 (비동기 수집기 결과와 같은 형식)
+    
+    Args:
+        book_code: 도서코드
+        book_title: 도서 제목
+        message: scrap_review 반환 메시지 (예: "... 총 N개의 리뷰가 ... 저장되었습니다")
+        
+    Returns:
+        dict: 도서코드, 상태(success/empty/failure), 리뷰 수, 오류 메시지
+    """
+    result = {'도서코드': book_code, '도서 제목': book_title, 'status': 'failure',
+              'review_count': 0, 'new_count': 0, 'file': None, 'error': None}
+    
+    match = re.search(r'총\s*(\d+)개의 리뷰', message or '')
+    if "저장되었습니다" in (message or '') and match:
+        result['review_count'] = result['new_count'] = int(match.group(1))
+        result['status'] = 'success' if result['review_count'] > 0 else 'empty'
+    else:
+        result['error'] = message
+    return result
+
+def log_results(results, metrics):
+    """도서별 결과 집계 로그 출력 및 수집 지표 파일 저장"""
+    counts = pd.Series([result['status'] for result in results], dtype=object).value_counts()
+    logger.info("=" * 50)
+    logger.info(f"리뷰 추출 완료")
+    logger.info(f"총 처리 도서: {len(results)}권")
+    logger.info(f"신규 리뷰: {sum(result['new_count'] for result in results)}개")
+    logger.info(f"성공: {counts.get('success', 0)}권 (리뷰 있음)")
+    logger.info(f"빈 리뷰: {counts.get('empty', 0)}권 (리뷰 없음)")
+    logger.info(f"실패: {counts.get('failure', 0)}권 (오류 발생)")
+    logger.info(f"건너뜀: {counts.get('skipped', 0)}권 (상태 저장소 기준)")
+    logger.info("=" * 50)
+    
+    # 처리량 지표 저장 (Prometheus 텍스트 + JSON 요약)
+    metrics.write(METRICS_PROM_FILE)
+    metrics.write(METRICS_JSON_FILE)
+
+def extract_reviews_from_booklist(ledger=None, store=None):
     """
     kyobo_book_list.csv 파일에서 도서 코드를 읽어와 리뷰 정보 추출
+    
+    Args:
+        ledger: 크롤링 상태 저장소(CrawlLedger), 완료된 도서는 건너뜀
+        store: 리뷰 통합 저장소(ReviewStore), scrap_review가 저장한 CSV를 가져와 upsert
+        
+    Returns:
+        list 또는 None: 도서별 결과 dict 리스트, 실패 시 None
     """
     try:
         # 디렉토리 확인 및 생성
@@ -53,75 +115,156 @@ def extract_reviews_from_booklist():
         if valid_books < total_books:
             logger.warning(f"도서 코드가 없는 항목 {total_books - valid_books}개 제외됨")
         
-        # 리뷰 추출 결과 추적
-        success_count = 0
-        empty_count = 0
-        failure_count = 0
+        # 리뷰 추출 결과 및 처리량 지표 (scrap_review 호출 1회를 요청 1건으로 기록)
+        results = []
+        metrics = CrawlMetrics()
+        metrics.start()
         
         # 각 도서에 대해 리뷰 추출
         for idx, row in df.iterrows():
             book_code = row['도서코드']
             book_title = row['도서 제목']
             
+            # 상태 저장소에 완료/재시도 대기로 기록된 도서는 건너뜀
+            if ledger is not None and not ledger.should_fetch('review', book_code):
+                logger.info(f"상태 저장소 기준 건너뜀: {book_title} (코드: {book_code})")
+                results.append({'도서코드': book_code, '도서 제목': book_title, 'status': 'skipped',
+                                'review_count': 0, 'new_count': 0, 'file': None, 'error': None})
+                metrics.add_outcome('skipped')
+                continue
+            
             logger.info(f"도서 리뷰 추출 시작 ({idx+1}/{valid_books}): {book_title} (코드: {book_code})")
             
+            start = time.monotonic()
             try:
                 # scrap_review 함수를 사용하여 리뷰 추출
                 # output_path를 지정하여 리뷰를 CSV 파일로 저장
-                result = scrap_review(book_code, output_path=output_dir)
+                message = scrap_review(book_code, output_path=output_dir)
+                result = parse_scrap_result(book_code, book_title, message)
+                metrics.observe_request(time.monotonic() - start, 'ok' if result['status'] != 'failure' else 'failure')
                 
-                # 결과 메시지 확인으로 성공/실패 여부 판단
-                if "저장되었습니다" in result:
-                    review_count = int(result.split('총 ')[1].split('개의 리뷰')[0])
-                    if review_count > 0:
-                        success_count += 1
-                        logger.info(f"리뷰 추출 성공: {book_title} - {review_count}개의 리뷰")
-                    else:
-                        empty_count += 1
-                        logger.warning(f"리뷰 없음: {book_title}")
+                if result['status'] == 'success':
+                    logger.info(f"리뷰 추출 성공: {book_title} - {result['review_count']}개의 리뷰")
+                elif result['status'] == 'empty':
+                    logger.warning(f"리뷰 없음: {book_title}")
                 else:
-                    failure_count += 1
-                    logger.error(f"리뷰 추출 실패: {book_title} - {result}")
+                    logger.error(f"리뷰 추출 실패: {book_title} - {message}")
                 
-                # 서버 부하 방지를 위한 랜덤 대기 시간 (2~5초)
-                time.sleep(random.uniform(2, 5))
+                if result['status'] != 'failure':
+                    # scrap_review가 저장한 최신 CSV를 통합 저장소로 가져오기
+                    files = sorted(glob.glob(os.path.join(output_dir, f"교보_{book_code}_리뷰_*.csv")))
+                    if files:
+                        result['file'] = files[-1]
+                        if store is not None:
+                            result['new_count'] = store.import_csv(files[-1], book_code)
+                            result['file'] = store.db_path
+                    if ledger is not None:
+                        ledger.mark_done('review', book_code, status=result['status'],
+                                         result={'review_count': result['review_count'], 'file': result['file']},
+                                         content_hash=ledger.content_hash(message))
+                elif ledger is not None:
+                    ledger.mark_failure('review', book_code, message)
                 
             except Exception as e:
-                failure_count += 1
+                metrics.observe_request(time.monotonic() - start, type(e).__name__)
                 logger.error(f"리뷰 추출 중 오류 발생: {book_title} - {str(e)}")
-                time.sleep(random.uniform(2, 5))  # 오류 발생 시에도 대기
+                result = {'도서코드': book_code, '도서 제목': book_title, 'status': 'failure',
+                          'review_count': 0, 'new_count': 0, 'file': None, 'error': str(e)}
+                if ledger is not None:
+                    ledger.mark_failure('review', book_code, e)
+            
+            results.append(result)
+            metrics.add_outcome(result['status'], result['review_count'])
+            
+            # 서버 부하 방지를 위한 랜덤 대기 시간 (2~5초, 오류 발생 시에도 대기)
+            time.sleep(random.uniform(2, 5))
                 
             # 진행 상황 로깅 (5권마다)
             if (idx + 1) % 5 == 0:
-                logger.info(f"진행 상황: {idx+1}/{valid_books} 완료 (성공: {success_count}, 빈 리뷰: {empty_count}, 실패: {failure_count})")
+                done = pd.Series([result['status'] for result in results]).value_counts()
+                logger.info(f"진행 상황: {idx+1}/{valid_books} 완료 (성공: {done.get('success', 0)}, "
+                            f"빈 리뷰: {done.get('empty', 0)}, 실패: {done.get('failure', 0)})")
+        
+        # 최종 결과 로깅 및 지표 저장
+        metrics.finish()
+        metrics.log_summary()
+        log_results(results, metrics)
+        
+        return results
+    
+    except FileNotFoundError:
+        logger.error(f"파일을 찾을 수 없음: {input_file}")
+        return None
+    except Exception as e:
+        logger.error(f"리뷰 추출 중 오류 발생: {str(e)}")
+        return None
+
+def extract_reviews_from_booklist_async(max_concurrency=8, rate=2.0, burst=4, ledger=None, incremental=False,
+                                        store=None):
+    """
+    kyobo_book_list.csv 파일의 도서 리뷰를 비동기로 수집
+    
+    Args:
+        max_concurrency: 동시에 진행할 최대 요청 수
+        rate: 초당 요청 수 (토큰 버킷 보충 속도)
+        burst: 연속 요청 허용량 (토큰 버킷 용량)
+        ledger: 크롤링 상태 저장소(CrawlLedger), 완료된 도서는 건너뜀
+        incremental: True면 수집한 적 있는 도서는 새 리뷰만 받아 기존 파일에 추가
+        store: 리뷰 통합 저장소(ReviewStore), None이면 도서별 CSV 파일로 저장
+        
+    Returns:
+        list 또는 None: 도서별 결과 dict 리스트, 실패 시 None
+    """
+    input_file = "homework/data/kyobo_book_list.csv"
+    output_dir = "homework/data/kyobo_reviews"
+    
+    try:
+        logger.info(f"파일 읽기 시작: {input_file}")
+        df = pd.read_csv(input_file)
+        df = df[df['도서코드'].notna() & (df['도서코드'] != '')]
+        logger.info(f"도서 데이터 로드 완료: 총 {len(df)}권")
+        
+        collector = AsyncReviewCollector(output_dir, max_concurrency=max_concurrency, rate=rate, burst=burst, ledger=ledger,
+                                         incremental=incremental, store=store)
+        results = collector.run(list(zip(df['도서코드'], df['도서 제목'])))
         
-        # 최종 결과 로깅
-        logger.info("=" * 50)
-        logger.info(f"리뷰 추출 완료")
-        logger.info(f"총 처리 도서: {valid_books}권")
-        logger.info(f"성공: {success_count}권 (리뷰 있음)")
-        logger.info(f"빈 리뷰: {empty_count}권 (리뷰 없음)")
-        logger.info(f"실패: {failure_count}권 (오류 발생)")
-        logger.info("=" * 50)
+        # 상태별 집계 및 지표 저장
+        log_results(results, collector.metrics)
         
-        return True
+        return results
     
     except FileNotFoundError:
         logger.error(f"파일을 찾을 수 없음: {input_file}")
-        return False
+        return None
     except Exception as e:
         logger.error(f"리뷰 추출 중 오류 발생: {str(e)}")
-        return False
+        return None
 
-def main():
-    """메인 함수"""
+def main(use_async=True, incremental=False, ledger_max_age=DEFAULT_MAX_AGE):
+    """
+    메인 함수
+    
+    Args:
+        use_async: 비동기 수집기 사용 여부
+        incremental: 증분 수집 여부 (이전 수집 이후 새 리뷰만 수집)
+        ledger_max_age: 완료된 도서를 건너뛰는 유효 기간(초), 지나면 다시 수집 (None이면 만료 없음)
+    """
     start_time = datetime.now()
     logger.info("교보문고 도서 리뷰 추출 시작")
-    success = extract_reviews_from_booklist()
+    ledger = CrawlLedger(max_age=ledger_max_age)
+    store = ReviewStore()
+    try:
+        if use_async:
+            results = extract_reviews_from_booklist_async(ledger=ledger, incremental=incremental, store=store)
+        else:
+            results = extract_reviews_from_booklist(ledger=ledger, store=store)
+    finally:
+        store.close()
+        ledger.close()
     end_time = datetime.now()
     duration = end_time - start_time
     
-    status = "성공" if success else "실패"
+    status = "성공" if results is not None else "실패"
     logger.info(f"교보문고 도서 리뷰 추출 {status}")
     logger.info(f"총 소요 시간: {duration}")
 
@@ -2,6 +2,11 @@
 교보문고 2024년 종합연간베스트 페이지 크롤링 스크립트
 - 리뷰 수 500개 이상인 도서의 상세 페이지 URL 수집
 - 도서 제목, 상세페이지 URL, 리뷰 수를 CSV 파일로 저장
+- 기본은 HTTP(requests) 고속 경로로 수집하고, JavaScript가 필요한 페이지만 Selenium으로 처리
+- Selenium 대상 상세 페이지는 헤드리스 드라이버 풀(kyobo_driver_pool)로 병렬 처리 가능
+- 크롤링 상태 저장소(kyobo_crawl_ledger)를 사용하면 재실행 시 유효 기간 안에 완료된 페이지/도서는 건너뜀
+- 디스크 응답 캐시(kyobo_http_cache)로 HTTP 응답과 Selenium 렌더링 결과를 재사용 (조건부 요청으로 재검증)
+- 고정 sleep 대신 필요한 요소가 나타날 때까지 WebDriverWait로 대기하고, 요청 간격은 서버 응답 시간/오류율에 맞춰 자동 조절
 """
 
 import os
@@ -19,7 +24,13 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException,
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import random
+from kyobo_driver_pool import DriverPool
+from kyobo_crawl_ledger import CrawlLedger, DEFAULT_MAX_AGE
+from kyobo_http_cache import ResponseCache
+from kyobo_politeness import AdaptiveDelay, RequestMetrics
 
 # 로깅 설정 - 파일과 콘솔에 함께 출력
 logging.basicConfig(
@@ -32,25 +43,99 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 도서 정보 추출 실패 시 get_book_info가 반환하는 제목
+FAILED_TITLES = ("오류", "페이지 로드 실패")
+
+# 상세 페이지의 리뷰 수 요소 선택자 (Selenium 대기 조건 및 방법 4에서 사용)
+REVIEW_SELECTORS = [
+    'span.review_desc',
+    'div.klover_review_box span.review_count',
+    'span.text.kloverTotal',
+    'div.prod_rating_area span.review_count'
+]
+
+# main()의 Selenium 상세 페이지 드라이버 풀 크기 (헤드리스 Chrome 하나가 CPU 코어 하나 정도를 사용)
+DEFAULT_POOL_SIZE = min(4, os.cpu_count() or 1)
+
+# 목록 페이지의 도서 링크 선택자
+BOOK_LINK_SELECTORS = ['a.prod_link', 'div.prod_item a[href*="detail"]']
+
 class KyoboBookScraper:
     """교보문고 베스트셀러 도서 정보 스크래핑 클래스"""
     
-    def __init__(self):
+    def __init__(self, use_http=True, http_delay=(0.3, 0.8), headless=False, pool_size=0, page_budget=50, ledger=None, cache=None,
+                 load_timeout=15, metrics=None, session=None):
         """
-        스크래퍼 초기화 - 웹드라이버 설정 및 기본 변수 초기화
+        스크래퍼 초기화 - HTTP 세션 설정 및 기본 변수 초기화
+        
+        Args:
+            use_http: HTTP 고속 경로 사용 여부 (False면 항상 Selenium 사용)
+            http_delay: HTTP 요청 사이 랜덤 대기 시간 범위(초)
+            headless: 헤드리스 모드로 Chrome 실행 여부
+            pool_size: Selenium 상세 페이지 처리용 드라이버 풀 크기 (1 이하이면 단일 드라이버 사용)
+            page_budget: 풀 워커가 드라이버를 재생성하기 전까지 로드할 최대 페이지 수
+            ledger: 크롤링 상태 저장소(CrawlLedger), None이면 매번 처음부터 수집
+            cache: 디스크 응답 캐시(ResponseCache), None이면 캐시 없이 요청
+            load_timeout: 페이지 로드 후 필요한 요소가 나타날 때까지 기다릴 최대 시간(초)
+            metrics: 요청 시간 기록(RequestMetrics), None이면 새로 생성 (드라이버 풀 워커는 부모와 공유)
+            session: HTTP 세션(requests.Session), None이면 새로 생성 (드라이버 풀 워커는 부모와 공유, 부모가 종료)
         """
         # 결과 저장을 위한 리스트와 최소 리뷰 수 설정
         self.results = []
         self.min_review_count = 500
-        self.initialize_driver()
+        self.use_http = use_http
+        self.http_delay = http_delay
+        self.headless = headless
+        self.pool_size = pool_size
+        self.page_budget = page_budget
+        self.driver_pool = None
+        self.pages_loaded = 0
+        self.ledger = ledger
+        self.cache = cache
+        self.load_timeout = load_timeout
+        
+        # 서버 응답 시간/오류율 기반 요청 간격 조절 및 요청 시간 기록
+        self.politeness = AdaptiveDelay()
+        self.metrics = metrics if metrics is not None else RequestMetrics()
+        
+        # 웹드라이버는 Selenium이 실제로 필요할 때 생성
+        self.driver = None
+        if session is not None:
+            self.session = session
+        else:
+            self.initialize_session()
+        if not self.use_http:
+            self.initialize_driver()
         
         logger.info("스크래퍼 초기화 완료")
         
+    def initialize_session(self):
+        """HTTP 세션 초기화 - 연결 풀 재사용 및 상태 코드 기반 재시도"""
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+            "Accept-Language": "ko-KR,ko;q=0.9",
+        })
+        
+        logger.info("HTTP 세션 초기화 완료")
+        
     def initialize_driver(self):
         """웹드라이버 초기화 - 세션 무효화 문제 해결을 위해 별도 메서드로 분리"""
         # 웹드라이버 옵션 설정
         self.chrome_options = Options()
-        # self.chrome_options.add_argument("--headless")  # 헤드리스 모드 비활성화(문제 해결을 위해)
+        # 헤드리스 모드는 선택 사항 (기본 비활성화, 드라이버 풀 워커는 헤드리스로 실행)
+        if self.headless:
+            self.chrome_options.add_argument("--headless=new")
         self.chrome_options.add_argument("--no-sandbox")
         self.chrome_options.add_argument("--disable-dev-shm-usage")
         self.chrome_options.add_argument("--disable-gpu")
@@ -160,20 +245,13 @@ class KyoboBookScraper:
             int 또는 None: 리뷰 수 또는 추출 실패 시 None
         """
         try:
-            # 다양한 선택자로 시도
-            selectors = [
-                'span.review_desc', 
-                'div.klover_review_box span.review_count',
-                'span.text.kloverTotal',
-                'div.prod_rating_area span.review_count'
-            ]
+            # 선택자 중 하나라도 나타날 때까지 한 번만 대기 (선택자마다 따로 기다리지 않음)
+            if not self.wait_for_elements(REVIEW_SELECTORS):
+                return None
             
-            for selector in selectors:
+            # 다양한 선택자로 시도
+            for selector in REVIEW_SELECTORS:
                 try:
-                    # 명시적 대기 추가
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
                     review_element = self.driver.find_element(By.CSS_SELECTOR, selector)
                     review_text = review_element.text.strip()
                     
@@ -185,12 +263,34 @@ class KyoboBookScraper:
                         count_match = re.search(r'(\d+)', review_text)
                         if count_match:
                             return int(count_match.group(1))
-                except (NoSuchElementException, TimeoutException):
+                except NoSuchElementException:
                     continue
         except Exception as e:
             logger.error(f"Selenium 리뷰 수 추출 오류: {str(e)}")
         return None
 
+    def wait_for_elements(self, selectors=None):
+        """
+        선택자 중 하나에 해당하는 요소가 나타날 때까지 대기 (선택자가 없으면 문서 로드 완료까지 대기)
+        
+        Args:
+            selectors: CSS 선택자 리스트
+            
+        Returns:
+            bool: 제한 시간 안에 조건을 만족하면 True
+        """
+        if selectors:
+            conditions = [EC.presence_of_element_located((By.CSS_SELECTOR, selector)) for selector in selectors]
+        else:
+            conditions = [lambda driver: driver.execute_script("return document.readyState") == "complete"]
+        
+        try:
+            WebDriverWait(self.driver, self.load_timeout).until(EC.any_of(*conditions))
+            return True
+        except TimeoutException:
+            logger.warning(f"{self.load_timeout}초 안에 대기 조건을 만족하지 못했습니다: {selectors}")
+            return False
+
     def get_book_title(self, soup):
         """
         도서 제목 추출 - 여러 방법 시도
@@ -219,7 +319,9 @@ class KyoboBookScraper:
         except Exception as e:
             logger.error(f"BeautifulSoup 제목 추출 오류: {str(e)}")
         
-        # 방법 4: Selenium으로 시도
+        # 방법 4: Selenium으로 시도 (HTTP 경로에서는 드라이버가 없음)
+        if self.driver is None:
+            return "제목 추출 실패"
         try:
             title_element = self.driver.find_element(By.CSS_SELECTOR, 'h1.prod_title')
             return title_element.text.strip()
@@ -230,6 +332,8 @@ class KyoboBookScraper:
 
     def is_driver_valid(self):
         """웹드라이버 세션이 유효한지 확인"""
+        if self.driver is None:
+            return False
         try:
             # 간단한 명령을 실행해서 세션 상태 확인
             self.driver.current_url
@@ -239,6 +343,11 @@ class KyoboBookScraper:
 
     def restart_driver_if_needed(self):
         """필요한 경우 드라이버 재시작"""
+        if self.driver is None:
+            logger.info("Selenium이 필요한 페이지입니다. 드라이버를 시작합니다.")
+            self.initialize_driver()
+            return True
+        
         if not self.is_driver_valid():
             logger.warning("세션이 무효화되었습니다. 드라이버를 재시작합니다.")
             try:
@@ -250,18 +359,22 @@ class KyoboBookScraper:
             return True
         return False
 
-    def get_page_with_retry(self, url, max_retries=5):
+    def get_page_with_retry(self, url, max_retries=5, wait_selectors=None):
         """
         세션 무효화 문제를 처리하며 페이지 로드
         
         Args:
             url: 로드할 URL
             max_retries: 최대 재시도 횟수
+            wait_selectors: 로드 후 나타날 때까지 기다릴 요소의 CSS 선택자 리스트
             
         Returns:
             bool: 성공 여부
         """
         for retry in range(max_retries):
+            # 적응형 요청 간격 (서버 응답 시간과 오류율에 따라 자동 조절)
+            self.politeness.wait()
+            start = time.monotonic()
             try:
                 # 드라이버 상태 확인 및 필요시 재시작
                 if self.restart_driver_if_needed():
@@ -270,25 +383,207 @@ class KyoboBookScraper:
                 # 페이지 로드 시도
                 logger.info(f"페이지 로드 시도 {retry+1}/{max_retries}: {url}")
                 self.driver.get(url)
+                self.pages_loaded += 1
                 
-                # 충분한 로딩 시간 부여 (8~12초)
-                time.sleep(random.uniform(8, 12))
+                # 고정 대기 대신 추출에 필요한 요소가 나타날 때까지 대기
+                # 대기 시간 초과(느리거나 빈 페이지)는 요청 제한의 주요 신호이므로 오류로 기록하여 요청 간격을 늘림
+                ready = self.wait_for_elements(wait_selectors)
+                seconds = time.monotonic() - start
+                self.metrics.record('selenium', url, seconds, ok=ready)
+                self.politeness.record(seconds, ok=ready)
+                logger.info(f"페이지 로드 {'완료' if ready else '대기 시간 초과'} ({seconds:.2f}초, "
+                            f"다음 요청 간격 {self.politeness.delay:.2f}초)")
                 return True
                 
             except InvalidSessionIdException as e:
                 logger.error(f"세션 무효화 오류 발생 (시도 {retry+1}/{max_retries}): {str(e)}")
+                self.record_failure('selenium', url, start)
                 self.restart_driver_if_needed()
-                if retry < max_retries - 1:
-                    time.sleep(random.uniform(2, 5))
                 
             except Exception as e:
                 logger.error(f"페이지 로드 중 오류 발생 (시도 {retry+1}/{max_retries}): {str(e)}")
+                self.record_failure('selenium', url, start)
                 self.restart_driver_if_needed()
-                if retry < max_retries - 1:
-                    time.sleep(random.uniform(2, 5))
         
         return False
 
+    def record_failure(self, kind, url, start):
+        """실패한 요청을 기록 - 오류율이 올라가면 다음 요청 간격이 늘어남"""
+        self.metrics.record(kind, url, time.monotonic() - start, ok=False)
+        self.politeness.record(time.monotonic() - start, ok=False)
+
+    def fetch_html(self, url, timeout=15):
+        """
+        HTTP 세션으로 페이지 HTML 가져오기
+        
+        Args:
+            url: 요청할 URL
+            timeout: 요청 타임아웃(초)
+            
+        Returns:
+            str 또는 None: HTML 또는 실패 시 None
+        """
+        start = time.monotonic()
+        try:
+            if self.cache is not None:
+                status_code, html = self.cache.fetch(self.session, url, timeout=timeout)
+            else:
+                response = self.session.get(url, timeout=timeout)
+                status_code = response.status_code
+                html = response.text if status_code == 200 else None
+            
+            self.metrics.record('http', url, time.monotonic() - start, ok=html is not None)
+            if html is not None:
+                return html
+            logger.warning(f"HTTP 요청 실패 ({status_code}): {url}")
+        except requests.RequestException as e:
+            self.metrics.record('http', url, time.monotonic() - start, ok=False)
+            logger.warning(f"HTTP 요청 오류: {url} - {str(e)}")
+        return None
+
+    def get_book_info_http(self, book_url):
+        """
+        HTTP로 받은 정적 HTML에서 도서 정보 추출 (BeautifulSoup 추출 방법 1~3 재사용)
+        
+        Args:
+            book_url: 도서 상세 페이지 URL
+            
+        Returns:
+            tuple 또는 None: (도서 제목, URL, 리뷰 수) 또는 JavaScript 렌더링이 필요한 경우 None
+        """
+        html = self.fetch_html(book_url)
+        if not html:
+            return None
+        
+        return self.extract_book_info(BeautifulSoup(html, 'html.parser'), book_url, "HTTP 경로")
+
+    def extract_book_info(self, soup, book_url, source):
+        """
+        정적 HTML에서 추출 방법 1~3으로 도서 정보 추출
+        
+        Args:
+            soup: BeautifulSoup 객체
+            book_url: 도서 상세 페이지 URL
+            source: 로그에 표시할 HTML 출처
+            
+        Returns:
+            tuple 또는 None: (도서 제목, URL, 리뷰 수) 또는 리뷰 수를 찾지 못한 경우 None
+        """
+        methods = [self.extract_review_count_method1, self.extract_review_count_method2, self.extract_review_count_method3]
+        for i, method in enumerate(methods, start=1):
+            review_count = method(soup)
+            if review_count is not None:
+                logger.info(f"{source} 방법 {i}로 리뷰 수 추출 성공: {review_count}")
+                return self.get_book_title(soup), book_url, review_count
+        
+        return None
+
+    def get_driver_pool(self):
+        """
+        헤드리스 드라이버 풀 반환 (처음 필요할 때 생성하여 페이지 간 재사용)
+        워커 스크래퍼는 응답 캐시(잠금으로 보호), 요청 시간 기록, HTTP 세션을 부모와 공유
+        (워커 재생성/풀 종료 시 닫을 세션이 따로 생기지 않음)
+        """
+        if self.driver_pool is None:
+            self.driver_pool = DriverPool(
+                lambda: KyoboBookScraper(use_http=False, headless=True, cache=self.cache, metrics=self.metrics,
+                                         load_timeout=self.load_timeout, session=self.session),
+                size=self.pool_size,
+                page_budget=self.page_budget
+            )
+        return self.driver_pool
+
+    def collect_book_infos(self, book_urls):
+        """
+        여러 도서의 상세 정보 추출 - HTTP 고속 경로로 먼저 처리하고,
+        Selenium이 필요한 도서만 모아서 드라이버 풀(또는 단일 드라이버)로 처리
+        
+        Args:
+            book_urls: 도서 상세 페이지 URL 리스트
+            
+        Returns:
+            list: (도서 제목, URL, 리뷰 수) 리스트 (입력 순서 유지)
+        """
+        infos = {}
+        fetched = []
+        pending = []
+        
+        for i, book_url in enumerate(book_urls):
+            # 상태 저장소에 완료 기록이 있으면 재사용, 재시도 대기 중인 실패 도서는 건너뜀
+            if self.ledger is not None:
+                cached = self.ledger.done_result('book', book_url)
+                if cached is not None:
+                    infos[book_url] = tuple(cached)
+                    continue
+                if not self.ledger.should_fetch('book', book_url):
+                    logger.info(f"재시도 대기 중인 도서 건너뜀: {book_url}")
+                    infos[book_url] = ("오류", book_url, 0)
+                    continue
+            
+            logger.info(f"도서 정보 추출 중 ({i+1}/{len(book_urls)}): {book_url}")
+            fetched.append(book_url)
+            info = self.get_book_info_http(book_url) if self.use_http else None
+            if info is not None:
+                infos[book_url] = info
+                time.sleep(random.uniform(*self.http_delay))
+            else:
+                pending.append(book_url)
+        
+        if pending and self.pool_size > 1:
+            logger.info(f"Selenium 대상 {len(pending)}권을 드라이버 풀({self.pool_size}개)로 처리")
+            infos.update(zip(pending, self.get_driver_pool().map(pending)))
+        else:
+            for book_url in pending:
+                try:
+                    infos[book_url] = self.get_book_info(book_url)
+                except InvalidSessionIdException:
+                    logger.error("도서 정보 추출 중 세션 무효화 오류 발생")
+                    self.restart_driver_if_needed()
+                    infos[book_url] = ("오류", book_url, 0)
+                except Exception as e:
+                    logger.error(f"도서 정보 추출 중 오류: {str(e)}")
+                    infos[book_url] = ("오류", book_url, 0)
+        
+        for book_url in fetched:
+            self.record_book_info(book_url, infos[book_url])
+        
+        return [infos[book_url] for book_url in book_urls]
+
+    def record_book_info(self, book_url, info):
+        """도서 정보 추출 결과를 상태 저장소에 기록 (실패 시 백오프 후 재시도 대상)"""
+        if self.ledger is None:
+            return
+        if info[0] in FAILED_TITLES:
+            self.ledger.mark_failure('book', book_url, info[0])
+        else:
+            self.ledger.mark_done('book', book_url, result=list(info), content_hash=self.ledger.content_hash(list(info)))
+
+    def get_page_book_urls(self, url, page):
+        """
+        목록 페이지의 도서 URL 추출 - 상태 저장소에 완료 기록이 있으면 재사용
+        
+        Returns:
+            tuple: (도서 URL 리스트, 상태 저장소 재사용 여부)
+        """
+        if self.ledger is not None:
+            cached = self.ledger.done_result('page', url)
+            if cached:
+                logger.info(f"페이지 {page}: 상태 저장소의 도서 URL {len(cached)}개 재사용")
+                return cached, True
+        
+        book_urls = self.get_book_urls(url, page)
+        
+        # URL 정규화 (상대 경로를 절대 경로로 변환)
+        book_urls = [book_url if book_url.startswith('http') else f"https://store.kyobobook.co.kr{book_url}" for book_url in book_urls]
+        
+        if self.ledger is not None:
+            if book_urls:
+                self.ledger.mark_done('page', url, result=book_urls, content_hash=self.ledger.content_hash(book_urls))
+            else:
+                self.ledger.mark_failure('page', url, "도서 URL 없음")
+        
+        return book_urls, False
+
     def get_book_info(self, book_url):
         """
         각 도서의 상세 페이지에서 정보(제목, URL, 리뷰 수) 추출
@@ -299,6 +594,14 @@ class KyoboBookScraper:
         Returns:
             tuple: (도서 제목, URL, 리뷰 수)
         """
+        # 캐시된 Selenium 렌더링 결과가 있으면 브라우저 없이 추출
+        if self.cache is not None:
+            page_source = self.cache.get_fresh(book_url, variant='selenium')
+            if page_source is not None:
+                info = self.extract_book_info(BeautifulSoup(page_source, 'html.parser'), book_url, "렌더링 캐시")
+                if info is not None:
+                    return info
+        
         retry_count = 0
         max_retries = 3
         
@@ -307,7 +610,7 @@ class KyoboBookScraper:
                 logger.info(f"도서 상세 페이지 방문: {book_url} (시도 {retry_count+1}/{max_retries})")
                 
                 # 세션 무효화 문제 처리하며 페이지 로드
-                if not self.get_page_with_retry(book_url, max_retries=3):
+                if not self.get_page_with_retry(book_url, max_retries=3, wait_selectors=REVIEW_SELECTORS):
                     retry_count += 1
                     if retry_count < max_retries:
                         continue
@@ -317,6 +620,8 @@ class KyoboBookScraper:
                 # 페이지 HTML 가져오기
                 page_source = self.driver.page_source
                 soup = BeautifulSoup(page_source, 'html.parser')
+                if self.cache is not None:
+                    self.cache.put(book_url, page_source, variant='selenium')
                 
                 # 도서 제목 가져오기
                 book_title = self.get_book_title(soup)
@@ -348,11 +653,10 @@ class KyoboBookScraper:
                     logger.info(f"Selenium으로 리뷰 수 추출 성공: {review_count}")
                     return book_title, book_url, review_count
                 
-                # 모든 방법 실패 시 재시도
+                # 모든 방법 실패 시 재시도 (재시도 간격은 get_page_with_retry의 적응형 대기로 조절)
                 retry_count += 1
                 if retry_count < max_retries:
                     logger.warning(f"리뷰 수 추출 실패, 재시도 중... ({retry_count}/{max_retries})")
-                    time.sleep(random.uniform(2, 4))
                     continue
                 
                 logger.warning(f"모든 방법으로 리뷰 수 추출 실패: {book_url}")
@@ -360,22 +664,129 @@ class KyoboBookScraper:
                 
             except InvalidSessionIdException as e:
                 logger.error(f"도서 정보 추출 중 세션 무효화 오류: {str(e)}")
+                self.politeness.record(0.0, ok=False)
                 self.restart_driver_if_needed()
                 retry_count += 1
                 if retry_count < max_retries:
-                    time.sleep(random.uniform(3, 5))
                     continue
                 
             except Exception as e:
                 logger.error(f"도서 정보 추출 중 오류 발생: {str(e)}")
                 retry_count += 1
+                self.politeness.record(0.0, ok=False)
                 if retry_count < max_retries:
                     logger.warning(f"오류 발생, 재시도 중... ({retry_count}/{max_retries})")
-                    time.sleep(random.uniform(3, 5))
                     continue
                 
         return "오류", book_url, 0
 
+    def get_book_urls_http(self, url):
+        """
+        HTTP로 받은 정적 HTML에서 도서 링크 추출
+        
+        Args:
+            url: 베스트셀러 목록 페이지 URL
+            
+        Returns:
+            list: 도서 URL 리스트 (JavaScript 렌더링이 필요한 경우 빈 리스트)
+        """
+        html = self.fetch_html(url)
+        if not html:
+            return []
+        
+        soup = BeautifulSoup(html, 'html.parser')
+        book_elements = soup.select('a.prod_link, div.prod_item a[href*="detail"]')
+        book_urls = list(dict.fromkeys(element.get('href') for element in book_elements if element.get('href')))
+        logger.info(f"HTTP 경로로 {len(book_urls)}개의 도서 URL 추출")
+        return book_urls
+
+    def get_book_urls_selenium(self, url, page):
+        """
+        Selenium으로 페이지를 로드하여 도서 링크 추출
+        
+        Args:
+            url: 베스트셀러 목록 페이지 URL
+            page: 페이지 번호 (로그용)
+            
+        Returns:
+            list: 도서 URL 리스트
+        """
+        # 캐시된 렌더링 결과가 있으면 브라우저 없이 링크 추출
+        if self.cache is not None:
+            page_source = self.cache.get_fresh(url, variant='selenium')
+            if page_source is not None:
+                book_urls = self.parse_book_urls(page_source)
+                if book_urls:
+                    logger.info(f"페이지 {page}: 렌더링 캐시에서 {len(book_urls)}개의 도서 URL 추출")
+                    return book_urls
+        
+        # 세션 무효화 문제 처리하며 페이지 로드
+        if not self.get_page_with_retry(url, max_retries=5, wait_selectors=BOOK_LINK_SELECTORS):
+            logger.error(f"페이지 {page} 로드 실패, 다음 페이지로 넘어갑니다.")
+            return []
+        
+        # 페이지가 로드되면 도서 링크 추출
+        logger.info(f"페이지 {page} 로드 성공, 도서 링크 추출 시작")
+        if self.cache is not None:
+            self.cache.put(url, self.driver.page_source, variant='selenium')
+        
+        # 도서 링크 추출 전략들
+        book_urls = []
+        
+        # 전략 1: Selenium으로 prod_link 클래스를 가진 a 태그 찾기
+        try:
+            book_elements = self.driver.find_elements(By.CSS_SELECTOR, BOOK_LINK_SELECTORS[0])
+            if book_elements:
+                book_urls = [element.get_attribute('href') for element in book_elements if element.get_attribute('href')]
+                logger.info(f"전략 1로 {len(book_urls)}개의 도서 URL 추출")
+        except Exception as e:
+            logger.error(f"전략 1 실패: {str(e)}")
+        
+        # 전략 2: Selenium으로 다른 선택자 시도
+        if not book_urls:
+            try:
+                book_elements = self.driver.find_elements(By.CSS_SELECTOR, BOOK_LINK_SELECTORS[1])
+                book_urls = [element.get_attribute('href') for element in book_elements if element.get_attribute('href')]
+                logger.info(f"전략 2로 {len(book_urls)}개의 도서 URL 추출")
+            except Exception as e:
+                logger.error(f"전략 2 실패: {str(e)}")
+        
+        # 전략 3: BeautifulSoup 사용
+        if not book_urls:
+            try:
+                book_urls = self.parse_book_urls(self.driver.page_source)
+                logger.info(f"전략 3으로 {len(book_urls)}개의 도서 URL 추출")
+            except Exception as e:
+                logger.error(f"전략 3 실패: {str(e)}")
+        
+        return book_urls
+
+    @staticmethod
+    def parse_book_urls(page_source):
+        """렌더링된 HTML에서 BeautifulSoup으로 도서 링크 추출 (전략 3)"""
+        soup = BeautifulSoup(page_source, 'html.parser')
+        book_elements = soup.select('div.prod_item a.prod_link, div.prod_item a[href*="detail"]')
+        return [element.get('href') for element in book_elements if element.get('href')]
+
+    def get_book_urls(self, url, page):
+        """
+        도서 링크 추출 - HTTP 고속 경로 우선, 링크가 없으면(JavaScript 렌더링 페이지) Selenium 사용
+        
+        Args:
+            url: 베스트셀러 목록 페이지 URL
+            page: 페이지 번호 (로그용)
+            
+        Returns:
+            list: 도서 URL 리스트
+        """
+        if self.use_http:
+            book_urls = self.get_book_urls_http(url)
+            if book_urls:
+                return book_urls
+            logger.info(f"페이지 {page}의 정적 HTML에 도서 링크가 없어 Selenium으로 전환")
+        
+        return self.get_book_urls_selenium(url, page)
+
     def scrape_bestseller_list(self):
         """
         종합연간베스트 페이지에서 도서 목록을 스크랩하고 리뷰 수가 500개 이상인 도서 정보만 저장
@@ -387,48 +798,7 @@ class KyoboBookScraper:
                 url = f"https://store.kyobobook.co.kr/bestseller/total/annual?page={page}"
                 logger.info(f"페이지 방문: {url} ({page}/10)")
                 
-                # 세션 무효화 문제 처리하며 페이지 로드
-                if not self.get_page_with_retry(url, max_retries=5):
-                    logger.error(f"페이지 {page} 로드 실패, 다음 페이지로 넘어갑니다.")
-                    continue
-                
-                # 페이지가 로드되면 도서 링크 추출
-                logger.info(f"페이지 {page} 로드 성공, 도서 링크 추출 시작")
-                
-                # 도서 링크 추출 전략들
-                book_urls = []
-                
-                # 전략 1: Selenium으로 prod_link 클래스를 가진 a 태그 찾기
-                try:
-                    book_elements = self.driver.find_elements(By.CSS_SELECTOR, 'a.prod_link')
-                    if book_elements:
-                        book_urls = [element.get_attribute('href') for element in book_elements if element.get_attribute('href')]
-                        logger.info(f"전략 1로 {len(book_urls)}개의 도서 URL 추출")
-                except Exception as e:
-                    logger.error(f"전략 1 실패: {str(e)}")
-                
-                # 전략 2: Selenium으로 다른 선택자 시도
-                if not book_urls:
-                    try:
-                        book_elements = self.driver.find_elements(By.CSS_SELECTOR, 'div.prod_item a[href*="detail"]')
-                        book_urls = [element.get_attribute('href') for element in book_elements if element.get_attribute('href')]
-                        logger.info(f"전략 2로 {len(book_urls)}개의 도서 URL 추출")
-                    except Exception as e:
-                        logger.error(f"전략 2 실패: {str(e)}")
-                
-                # 전략 3: BeautifulSoup 사용
-                if not book_urls:
-                    try:
-                        page_source = self.driver.page_source
-                        soup = BeautifulSoup(page_source, 'html.parser')
-                        book_elements = soup.select('div.prod_item a.prod_link, div.prod_item a[href*="detail"]')
-                        book_urls = [element.get('href') for element in book_elements if element.get('href')]
-                        logger.info(f"전략 3으로 {len(book_urls)}개의 도서 URL 추출")
-                    except Exception as e:
-                        logger.error(f"전략 3 실패: {str(e)}")
-                
-                # URL 정규화 (상대 경로를 절대 경로로 변환)
-                book_urls = [url if url.startswith('http') else f"https://store.kyobobook.co.kr{url}" for url in book_urls]
+                book_urls, from_ledger = self.get_page_book_urls(url, page)
                 
                 # URL이 없으면 다음 페이지로
                 if not book_urls:
@@ -438,44 +808,29 @@ class KyoboBookScraper:
                 logger.info(f"페이지 {page}에서 {len(book_urls)}개의 도서 URL 추출 완료")
                 
                 # 각 도서의 상세 정보 추출
-                for i, book_url in enumerate(book_urls):
-                    try:
-                        logger.info(f"도서 정보 추출 중 ({i+1}/{len(book_urls)}): {book_url}")
-                        
-                        # 세션 무효화 확인 및 필요시 재시작
-                        if self.restart_driver_if_needed():
-                            logger.info("드라이버 재시작 후 도서 정보 추출 시도")
-                        
-                        book_title, url, review_count = self.get_book_info(book_url)
-                        
-                        # 리뷰 수가 500개 이상인 경우만 저장
-                        if review_count >= self.min_review_count:
-                            self.results.append({
-                                '도서 제목': book_title,
-                                '상세페이지 URL': url,
-                                '리뷰 수': review_count
-                            })
-                            logger.info(f"저장 대상: {book_title} (리뷰 수: {review_count})")
-                        else:
-                            logger.info(f"저장 제외: {book_title} (리뷰 수: {review_count})")
-                            
-                        # 서버 부하를 줄이기 위한 랜덤 대기 (3~5초)
-                        time.sleep(random.uniform(3, 5))
-                        
-                    except InvalidSessionIdException:
-                        logger.error("도서 정보 추출 중 세션 무효화 오류 발생")
-                        self.restart_driver_if_needed()
-                        
-                    except Exception as e:
-                        logger.error(f"도서 정보 추출 중 오류: {str(e)}")
-                        continue
+                for book_title, url, review_count in self.collect_book_infos(book_urls):
+                    # 리뷰 수가 500개 이상인 경우만 저장
+                    if review_count >= self.min_review_count:
+                        self.results.append({
+                            '도서 제목': book_title,
+                            '상세페이지 URL': url,
+                            '리뷰 수': review_count
+                        })
+                        logger.info(f"저장 대상: {book_title} (리뷰 수: {review_count})")
+                    else:
+                        logger.info(f"저장 제외: {book_title} (리뷰 수: {review_count})")
                 
                 # 진행상황 저장 (페이지마다 중간 결과 저장)
                 self.save_results(f"kyobo_book_url_page_{page}.csv")
                 
-                # 다음 페이지 방문 전 충분한 대기 (8~15초)
+                # 다음 페이지 방문 전 대기 (상태 저장소를 재사용한 페이지는 대기 생략, Selenium을 사용한 경우 적응형 간격)
+                if from_ledger:
+                    continue
                 logger.info(f"페이지 {page} 처리 완료, 다음 페이지로 이동 전 대기 중...")
-                time.sleep(random.uniform(8, 15))
+                if self.driver is None:
+                    time.sleep(random.uniform(*self.http_delay))
+                else:
+                    self.politeness.wait()
                 
         except Exception as e:
             logger.error(f"베스트셀러 리스트 스크랩 중 오류: {str(e)}")
@@ -483,11 +838,18 @@ class KyoboBookScraper:
         finally:
             # 최종 결과를 CSV 파일로 저장
             self.save_results()
-            # 브라우저 종료
-            try:
-                self.driver.quit()
-            except Exception:
-                pass
+            # 드라이버 풀 및 브라우저 종료
+            if self.driver_pool is not None:
+                self.driver_pool.close()
+            if self.driver is not None:
+                try:
+                    self.driver.quit()
+                except Exception:
+                    pass
+            self.session.close()
+            if self.ledger is not None:
+                logger.info(f"상태 저장소 도서 집계: {self.ledger.summary('book')}")
+            self.metrics.log_summary()
 
     def save_results(self, filename="kyobo_book_url.csv"):
         """
@@ -509,13 +871,21 @@ class KyoboBookScraper:
         except Exception as e:
             logger.error(f"결과 저장 중 오류: {str(e)}")
 
-def main():
+def main(ledger_max_age=DEFAULT_MAX_AGE, pool_size=DEFAULT_POOL_SIZE):
     """
     메인 함수: 스크래퍼 초기화 및 실행
+    
+    Args:
+        ledger_max_age: 완료된 페이지/도서를 건너뛰는 유효 기간(초), 지나면 다시 수집 (None이면 만료 없음)
+        pool_size: Selenium 상세 페이지 처리용 드라이버 풀 크기 (1 이하이면 단일 드라이버 사용)
     """
     logger.info("교보문고 2024년 종합연간베스트 도서 스크래핑 시작")
-    scraper = KyoboBookScraper()
+    ledger = CrawlLedger(max_age=ledger_max_age)
+    cache = ResponseCache()
+    scraper = KyoboBookScraper(pool_size=pool_size, ledger=ledger, cache=cache)
     scraper.scrape_bestseller_list()
+    cache.close()
+    ledger.close()
     logger.info("교보문고 2024년 종합연간베스트 도서 스크래핑 완료")
 
 if __name__ == "__main__":
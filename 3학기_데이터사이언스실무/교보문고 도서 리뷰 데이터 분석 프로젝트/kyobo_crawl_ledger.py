@@ -0,0 +1,213 @@
+"""
+교보문고 수집 파이프라인 크롤링 상태 저장소 (SQLite)
+- 작업 종류(kind)와 키(URL/도서코드)별로 상태, 시도 횟수, 마지막 수집 시각, 콘텐츠 해시를 기록
+- 스크립트가 중간에 중단되어도 재실행 시 완료된 작업은 건너뛰고 남은 작업만 수행
+- 완료 후 유효 기간(max_age)이 지난 작업은 다시 수행 (베스트셀러 목록, 도서 정보, 리뷰 갱신)
+- 실패한 작업은 지수 백오프 후 재시도, 최대 시도 횟수를 넘으면 재시도 중단
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 기본 상태 저장소 경로
+DEFAULT_DB_PATH = "homework/data/kyobo_crawl_state.db"
+
+# 완료로 간주하는 상태 (재실행 시 건너뜀)
+DONE_STATUSES = ('success', 'empty')
+
+# 완료된 작업의 기본 유효 기간(초), 지나면 다시 수집
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+
+class CrawlLedger:
+    """SQLite 기반 크롤링 상태 저장소"""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, max_attempts=5, backoff_base=60.0, backoff_max=3600.0,
+                 max_age=DEFAULT_MAX_AGE):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+            max_attempts: 작업당 최대 시도 횟수
+            backoff_base: 실패 후 재시도까지의 기본 대기 시간(초), 실패할 때마다 2배씩 증가
+            backoff_max: 재시도 대기 시간 상한(초)
+            max_age: 완료된 작업을 재사용할 유효 기간(초), None이면 만료 없음
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_age = max_age
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_state (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_fetch REAL,
+                next_retry REAL,
+                content_hash TEXT,
+                result TEXT,
+                error TEXT,
+                PRIMARY KEY (kind, key)
+            )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def content_hash(content):
+        """문자열/바이트/JSON 직렬화 가능한 객체의 SHA-256 해시"""
+        if not isinstance(content, (str, bytes)):
+            content = json.dumps(content, ensure_ascii=False, sort_keys=True, default=str)
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        return hashlib.sha256(content).hexdigest()
+
+    def get(self, kind, key):
+        """
+        작업 상태 조회
+
+        Returns:
+            dict: 상태 레코드 (없으면 None), result는 JSON 디코딩된 값
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT * FROM crawl_state WHERE kind = ? AND key = ?", (kind, str(key))
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        record['result'] = json.loads(record['result']) if record['result'] is not None else None
+        return record
+
+    def is_done(self, record, now=None):
+        """유효 기간 안에 완료된 작업인지 확인"""
+        if record is None or record['status'] not in DONE_STATUSES:
+            return False
+        if self.max_age is None:
+            return True
+        now = time.time() if now is None else now
+        return now - record['last_fetch'] < self.max_age
+
+    def should_fetch(self, kind, key, now=None):
+        """
+        작업 수행 여부 판단 - 유효 기간 안에 완료된 작업, 재시도 대기 중이거나 시도 횟수를 초과한 실패 작업은 건너뜀
+
+        Returns:
+            bool: 수행해야 하면 True
+        """
+        record = self.get(kind, key)
+        if record is None:
+            return True
+        if record['status'] in DONE_STATUSES:
+            return not self.is_done(record, now)
+        if record['attempts'] >= self.max_attempts:
+            return False
+        now = time.time() if now is None else now
+        return record['next_retry'] is None or record['next_retry'] <= now
+
+    def done_result(self, kind, key):
+        """유효 기간 안에 완료된 작업의 저장 결과 반환 (완료되지 않았거나 만료되었으면 None)"""
+        record = self.get(kind, key)
+        if not self.is_done(record):
+            return None
+        return record['result']
+
+    def mark_done(self, kind, key, status='success', result=None, content_hash=None):
+        """
+        작업 완료 기록
+
+        Args:
+            kind: 작업 종류 (예: 'page', 'book', 'review')
+            key: URL 또는 도서코드
+            status: 'success' 또는 'empty'
+            result: 재실행 시 재사용할 결과 (JSON 직렬화 가능)
+            content_hash: 수집한 콘텐츠의 해시
+        """
+        with self.lock:
+            self.conn.execute("""
+                INSERT INTO crawl_state (kind, key, status, attempts, last_fetch, next_retry, content_hash, result, error)
+                VALUES (?, ?, ?, 1, ?, NULL, ?, ?, NULL)
+                ON CONFLICT(kind, key) DO UPDATE SET
+                    status = excluded.status,
+                    attempts = crawl_state.attempts + 1,
+                    last_fetch = excluded.last_fetch,
+                    next_retry = NULL,
+                    content_hash = excluded.content_hash,
+                    result = excluded.result,
+                    error = NULL
+            """, (kind, str(key), status, time.time(), content_hash,
+                  json.dumps(result, ensure_ascii=False, default=str)))
+            self.conn.commit()
+
+    def mark_failure(self, kind, key, error):
+        """
+        작업 실패 기록 - 시도 횟수를 늘리고 다음 재시도 시각을 지수 백오프로 설정
+
+        Returns:
+            int: 누적 시도 횟수
+        """
+        record = self.get(kind, key)
+        # 만료된 완료 작업을 다시 수행하다 실패하면 시도 횟수를 처음부터 셈
+        attempts = (record['attempts'] if record and record['status'] not in DONE_STATUSES else 0) + 1
+        now = time.time()
+        next_retry = now + min(self.backoff_base * (2 ** (attempts - 1)), self.backoff_max)
+
+        with self.lock:
+            self.conn.execute("""
+                INSERT INTO crawl_state (kind, key, status, attempts, last_fetch, next_retry, error)
+                VALUES (?, ?, 'failure', ?, ?, ?, ?)
+                ON CONFLICT(kind, key) DO UPDATE SET
+                    status = 'failure',
+                    attempts = excluded.attempts,
+                    last_fetch = excluded.last_fetch,
+                    next_retry = excluded.next_retry,
+                    error = excluded.error
+            """, (kind, str(key), attempts, now, next_retry, str(error)))
+            self.conn.commit()
+
+        if attempts >= self.max_attempts:
+            logger.error(f"최대 시도 횟수({self.max_attempts}) 초과, 재시도 중단: {kind} {key}")
+        return attempts
+
+    def reset(self, kind=None, status=None):
+        """상태 초기화 (kind/status 조건에 맞는 레코드 삭제), 강제로 다시 수집할 때 사용"""
+        query = "DELETE FROM crawl_state WHERE 1 = 1"
+        params = []
+        if kind is not None:
+            query += " AND kind = ?"
+            params.append(kind)
+        if status is not None:
+            query += " AND status = ?"
+            params.append(status)
+        with self.lock:
+            self.conn.execute(query, params)
+            self.conn.commit()
+
+    def summary(self, kind):
+        """작업 종류별 상태 집계 (예: {'success': 10, 'failure': 2})"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT status, COUNT(*) FROM crawl_state WHERE kind = ? GROUP BY status", (kind,)
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self):
+        """DB 연결 종료"""
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,189 @@
+"""
+교보문고 리뷰 수집기 처리량 지표
+- 요청 소요 시간 히스토그램, 상태 코드별 요청 수, 재시도 수(사유별), 응답 바이트 수
+- 수집 페이지/리뷰 수와 초당 처리량(pages/sec, reviews/sec), 도서별 결과(success/empty/failure) 집계
+- 실행이 끝나면 Prometheus 텍스트 형식(.prom, node_exporter textfile collector용) 또는 JSON으로 저장
+"""
+
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 요청 소요 시간 히스토그램 구간(초)
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class CrawlMetrics:
+    """수집 실행 1회의 처리량 지표"""
+
+    def __init__(self, prefix='kyobo_review', buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            prefix: Prometheus 지표 이름 접두사
+            buckets: 요청 소요 시간 히스토그램 구간(초)
+        """
+        self.prefix = prefix
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * (len(self.buckets) + 1)  # 마지막은 +Inf
+        self.duration_sum = 0.0
+        self.requests = {}   # 상태 코드 -> 요청 수
+        self.retries = {}    # 재시도 사유 -> 횟수
+        self.outcomes = {}   # 도서 결과 상태 -> 도서 수
+        self.bytes = 0
+        self.pages = 0
+        self.reviews = 0
+        self.started = None
+        self.finished = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        """수집 시작 시각 기록"""
+        self.started = time.time()
+        self.finished = None
+
+    def finish(self):
+        """수집 종료 시각 기록"""
+        self.finished = time.time()
+
+    def observe_request(self, seconds, status, size=0):
+        """
+        요청 1건 기록
+
+        Args:
+            seconds: 소요 시간(초)
+            status: HTTP 상태 코드 또는 오류 이름
+            size: 응답 본문 바이트 수
+        """
+        with self.lock:
+            self.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.duration_sum += seconds
+            self.requests[str(status)] = self.requests.get(str(status), 0) + 1
+            self.bytes += size
+
+    def add_retry(self, reason):
+        """재시도 1회 기록 (사유: 429, 5xx, 네트워크 오류 등)"""
+        with self.lock:
+            self.retries[str(reason)] = self.retries.get(str(reason), 0) + 1
+
+    def add_pages(self, count=1):
+        """수집한 리뷰 페이지 수 추가"""
+        with self.lock:
+            self.pages += count
+
+    def add_outcome(self, status, reviews=0):
+        """도서 1권의 수집 결과와 수집한 리뷰 수 기록"""
+        with self.lock:
+            self.outcomes[status] = self.outcomes.get(status, 0) + 1
+            self.reviews += reviews
+
+    @property
+    def elapsed(self):
+        """수집 경과 시간(초)"""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def to_dict(self):
+        """
+        지표 요약
+
+        Returns:
+            dict: 요청/재시도/처리량/도서 결과 집계
+        """
+        elapsed = self.elapsed
+        count = sum(self.bucket_counts)
+        cumulative = 0
+        histogram = {}
+        for bound, bucket_count in zip(list(self.buckets) + ['+Inf'], self.bucket_counts):
+            cumulative += bucket_count
+            histogram[str(bound)] = cumulative
+
+        return {
+            'elapsed_seconds': round(elapsed, 3),
+            'requests': dict(self.requests),
+            'request_count': count,
+            'request_seconds_sum': round(self.duration_sum, 3),
+            'request_seconds_mean': round(self.duration_sum / count, 3) if count else 0.0,
+            'request_seconds_histogram': histogram,
+            'retries': dict(self.retries),
+            'bytes': self.bytes,
+            'pages': self.pages,
+            'reviews': self.reviews,
+            'pages_per_second': round(self.pages / elapsed, 3) if elapsed else 0.0,
+            'reviews_per_second': round(self.reviews / elapsed, 3) if elapsed else 0.0,
+            'outcomes': dict(self.outcomes),
+        }
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 노출 형식 문자열"""
+        summary = self.to_dict()
+        name = self.prefix
+        lines = [
+            f"# HELP {name}_request_duration_seconds 리뷰 API 요청 소요 시간",
+            f"# TYPE {name}_request_duration_seconds histogram",
+        ]
+        for bound, cumulative in summary['request_seconds_histogram'].items():
+            lines.append(f'{name}_request_duration_seconds_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_request_duration_seconds_sum {summary['request_seconds_sum']}")
+        lines.append(f"{name}_request_duration_seconds_count {summary['request_count']}")
+
+        def labeled(metric, help_text, label, values):
+            lines.append(f"# HELP {name}_{metric} {help_text}")
+            lines.append(f"# TYPE {name}_{metric} counter")
+            for key, value in sorted(values.items()):
+                lines.append(f'{name}_{metric}{{{label}="{key}"}} {value}')
+
+        def single(metric, help_text, kind, value):
+            lines.append(f"# HELP {name}_{metric} {help_text}")
+            lines.append(f"# TYPE {name}_{metric} {kind}")
+            lines.append(f"{name}_{metric} {value}")
+
+        labeled('requests_total', '상태 코드별 요청 수', 'status', summary['requests'])
+        labeled('retries_total', '사유별 재시도 수', 'reason', summary['retries'])
+        labeled('books_total', '결과 상태별 도서 수', 'status', summary['outcomes'])
+        single('response_bytes_total', '응답 본문 바이트 수', 'counter', summary['bytes'])
+        single('pages_total', '수집한 리뷰 페이지 수', 'counter', summary['pages'])
+        single('reviews_total', '수집한 리뷰 수', 'counter', summary['reviews'])
+        single('run_duration_seconds', '수집 실행 시간', 'gauge', summary['elapsed_seconds'])
+        single('pages_per_second', '초당 수집 페이지 수', 'gauge', summary['pages_per_second'])
+        single('reviews_per_second', '초당 수집 리뷰 수', 'gauge', summary['reviews_per_second'])
+        single('last_run_timestamp_seconds', '마지막 수집 종료 시각', 'gauge', round(self.finished or time.time(), 3))
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+        지표 파일 저장 - 확장자가 .json이면 JSON, 그 외에는 Prometheus 텍스트 형식
+        (임시 파일에 쓴 뒤 교체하여 수집 중인 exporter가 불완전한 파일을 읽지 않도록 함)
+
+        Returns:
+            str: 저장한 파일 경로
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if path.endswith('.json'):
+            content = json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+        else:
+            content = self.to_prometheus()
+
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+        logger.info(f"수집 지표 저장: {path}")
+        return path
+
+    def log_summary(self):
+        """주요 지표를 로그로 출력"""
+        summary = self.to_dict()
+        logger.info(f"수집 지표: 요청 {summary['request_count']}건 (평균 {summary['request_seconds_mean']}초), "
+                    f"재시도 {sum(summary['retries'].values())}회, {summary['bytes']:,}바이트, "
+                    f"{summary['pages_per_second']} pages/sec, {summary['reviews_per_second']} reviews/sec")
@@ -0,0 +1,127 @@
+"""
+교보문고 상세 페이지 추출용 헤드리스 브라우저 워커 풀
+- N개의 워커가 각자 헤드리스 Chrome 드라이버를 유지하며 공유 작업 큐에서 URL을 가져와 처리
+- 작업 전 드라이버 상태 점검(health check), 고장 난 드라이버만 재시작
+- 워커별 페이지 처리 한도(page budget)에 도달하면 드라이버를 재생성하여 메모리 누수 방지
+"""
+
+import time
+import queue
+import random
+import logging
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPool:
+    """재사용 가능한 헤드리스 브라우저 워커 풀"""
+
+    def __init__(self, factory, size=4, page_budget=50, delay=(1, 2)):
+        """
+        Args:
+            factory: 워커용 스크래퍼(KyoboBookScraper 호환 객체)를 생성하는 함수
+            size: 워커(드라이버) 수
+            page_budget: 드라이버 재생성 전까지 워커가 로드할 최대 페이지 수
+            delay: 워커별 작업 사이 랜덤 대기 시간 범위(초)
+        """
+        self.factory = factory
+        self.size = size
+        self.page_budget = page_budget
+        self.delay = delay
+        self.tasks = queue.Queue()
+        self.workers = []
+        self.scrapers = []
+
+        for worker_id in range(size):
+            thread = threading.Thread(target=self._worker, args=(worker_id,), daemon=True)
+            thread.start()
+            self.workers.append(thread)
+
+        logger.info(f"드라이버 풀 시작: 워커 {size}개, 페이지 한도 {page_budget}")
+
+    def _recycle(self, scraper, worker_id):
+        """페이지 한도에 도달한 드라이버를 종료하고 새로 생성"""
+        logger.info(f"워커 {worker_id}: 페이지 한도({self.page_budget}) 도달, 드라이버 재생성")
+        try:
+            scraper.driver.quit()
+        except Exception:
+            pass  # 이미 종료된 경우 무시
+        scraper.initialize_driver()
+        scraper.pages_loaded = 0
+
+    def _worker(self, worker_id):
+        """공유 큐에서 URL을 가져와 get_book_info를 실행하는 워커 루프"""
+        try:
+            scraper = self.factory()
+        except Exception as e:
+            logger.error(f"워커 {worker_id}: 드라이버 생성 실패 - {str(e)}")
+            scraper = None
+        self.scrapers.append(scraper)
+
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                self.tasks.task_done()
+                break
+
+            book_url, future = task
+            result = ("오류", book_url, 0)
+            try:
+                if scraper is None:
+                    raise RuntimeError("사용 가능한 드라이버가 없습니다.")
+
+                # 작업 전 상태 점검 - 세션이 깨진 경우에만 재시작
+                scraper.restart_driver_if_needed()
+                result = scraper.get_book_info(book_url)
+            except Exception as e:
+                logger.error(f"워커 {worker_id}: 도서 정보 추출 중 오류 - {book_url} - {str(e)}")
+            finally:
+                # 결과는 한 번만 설정 (예외가 나도 map()이 future.result()에서 멈추지 않도록 항상 설정)
+                if not future.done():
+                    future.set_result(result)
+                self.tasks.task_done()
+
+            # 페이지 한도 도달 시 드라이버 재생성 (실패해도 워커는 유지, 다음 작업 전 상태 점검에서 다시 시작)
+            if scraper is not None and scraper.pages_loaded >= self.page_budget:
+                try:
+                    self._recycle(scraper, worker_id)
+                except Exception as e:
+                    logger.error(f"워커 {worker_id}: 드라이버 재생성 실패 - {str(e)}")
+                    scraper.driver = None
+                    scraper.pages_loaded = 0
+
+            # 서버 부하를 줄이기 위한 워커별 랜덤 대기
+            time.sleep(random.uniform(*self.delay))
+
+        if scraper is not None and scraper.driver is not None:
+            try:
+                scraper.driver.quit()
+            except Exception:
+                pass
+
+    def map(self, book_urls):
+        """
+        도서 URL 목록을 워커들에 분배하여 상세 정보 추출
+
+        Args:
+            book_urls: 도서 상세 페이지 URL 리스트
+
+        Returns:
+            list: (도서 제목, URL, 리뷰 수) 리스트 (입력 순서 유지)
+        """
+        futures = []
+        for book_url in book_urls:
+            future = Future()
+            self.tasks.put((book_url, future))
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def close(self):
+        """모든 워커 종료 및 드라이버 정리"""
+        for _ in self.workers:
+            self.tasks.put(None)
+        for thread in self.workers:
+            thread.join()
+        logger.info("드라이버 풀 종료")
@@ -0,0 +1,131 @@
+"""
+교보문고 스크래퍼용 디스크 응답 캐시 (SQLite)
+- URL + 요청 파라미터(+ 수집 경로 구분: http/selenium)를 키로 본문, ETag/Last-Modified, 수집 시각 저장
+- 유효 기간(max_age) 안에는 네트워크 요청 없이 캐시 본문 반환
+- 유효 기간이 지나면 If-None-Match/If-Modified-Since 조건부 요청으로 재검증 (304면 캐시 재사용)
+- 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+"""
+
+import json
+import time
+import hashlib
+import logging
+
+from kyobo_sqlite_lru import LRUTable
+
+logger = logging.getLogger(__name__)
+
+# 기본 캐시 경로
+DEFAULT_CACHE_PATH = "homework/data/kyobo_http_cache.db"
+
+
+class ResponseCache:
+    """크기 제한이 있는 디스크 응답 캐시"""
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH, max_bytes=200 * 1024 * 1024, max_age=3600):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+            max_bytes: 캐시 본문 전체 크기 상한(바이트)
+            max_age: 재검증 없이 캐시를 그대로 사용할 유효 기간(초), 0이면 항상 조건부 요청
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stats = {'hit': 0, 'revalidated': 0, 'miss': 0}
+        self.table = LRUTable(db_path, 'responses', [
+            "url TEXT NOT NULL",
+            "body TEXT NOT NULL",
+            "etag TEXT",
+            "last_modified TEXT",
+            "fetched_at REAL NOT NULL",
+        ], max_bytes)
+
+    @staticmethod
+    def make_key(url, params=None, variant='http'):
+        """URL, 정렬된 요청 파라미터, 수집 경로로 캐시 키 생성"""
+        raw = json.dumps([variant, url, sorted((params or {}).items())], ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, url, params=None, variant='http'):
+        """
+        캐시 항목 조회 (조회 시 마지막 사용 시각 갱신)
+
+        Returns:
+            dict 또는 None: 캐시 항목
+        """
+        row = self.table.get(self.make_key(url, params, variant))
+        return dict(row) if row is not None else None
+
+    def is_fresh(self, record):
+        """유효 기간 안의 캐시인지 확인"""
+        return record is not None and time.time() - record['fetched_at'] < self.max_age
+
+    def get_fresh(self, url, params=None, variant='http'):
+        """유효 기간 안의 캐시 본문 반환 (없거나 만료되면 None)"""
+        record = self.get(url, params, variant)
+        if self.is_fresh(record):
+            self.stats['hit'] += 1
+            return record['body']
+        return None
+
+    def put(self, url, body, params=None, variant='http', etag=None, last_modified=None):
+        """캐시 저장 후 크기 상한을 넘으면 오래된 항목 삭제"""
+        self.table.put_many([{
+            'key': self.make_key(url, params, variant),
+            'url': url,
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time(),
+            'size': len(body.encode('utf-8')),
+        }])
+
+    def touch(self, url, params=None, variant='http'):
+        """304 재검증 성공 시 수집 시각 갱신"""
+        self.table.touch(self.make_key(url, params, variant), fetched_at=time.time())
+
+    def fetch(self, session, url, params=None, timeout=15):
+        """
+        캐시를 거쳐 HTTP GET 요청 - 유효 기간 안이면 캐시 반환, 만료되었으면 조건부 요청으로 재검증
+
+        Args:
+            session: requests.Session
+            url: 요청할 URL
+            params: 요청 파라미터
+            timeout: 요청 타임아웃(초)
+
+        Returns:
+            tuple: (상태 코드, 본문) - 캐시 적중/304 재검증은 (200, 캐시 본문), 실패 시 본문은 None
+        """
+        record = self.get(url, params)
+        if self.is_fresh(record):
+            self.stats['hit'] += 1
+            return 200, record['body']
+
+        headers = {}
+        if record is not None:
+            if record['etag']:
+                headers['If-None-Match'] = record['etag']
+            if record['last_modified']:
+                headers['If-Modified-Since'] = record['last_modified']
+
+        response = session.get(url, params=params, headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and record is not None:
+            self.stats['revalidated'] += 1
+            self.touch(url, params)
+            return 200, record['body']
+
+        if response.status_code == 200:
+            self.stats['miss'] += 1
+            self.put(url, response.text, params,
+                     etag=response.headers.get('ETag'), last_modified=response.headers.get('Last-Modified'))
+            return 200, response.text
+
+        return response.status_code, None
+
+    def close(self):
+        """DB 연결 종료"""
+        logger.info(f"응답 캐시 통계: {self.stats}")
+        self.table.close()
@@ -0,0 +1,316 @@
+"""
+리뷰 코퍼스 전체 대상 한국어 키워드 추출 (API 호출 없음)
+- 리뷰를 이어 붙인 문자열 하나에서 어절을 한 번에 찾고, 어절마다 조사/어미를 떼어 낸 어간을 캐시 (같은 어절은 한 번만 처리)
+- 리뷰 x 단어 희소 행렬(존재 여부, 좌표 배열)을 만든 뒤 그룹(도서, 감성) x 단어 빈도를 한 번에 집계
+- 도서별 키워드: TF-IDF (그룹 안 리뷰 비율 x 도서 간 역빈도)
+- 감성별 키워드: 전체 코퍼스 사전분포를 쓰는 로그 오즈비 z 점수 (나머지 리뷰 대비 특징적인 단어)
+- python kyobo_keyword_extractor.py: 도서별/감성별 키워드 표를 result/kyobo_book_keywords.csv로 저장
+"""
+
+import os
+import re
+import glob
+import time
+import logging
+
+import numpy as np
+import pandas as pd
+
+from kyobo_local_sentiment import rating_to_label, SENTIMENT_LABELS
+
+logger = logging.getLogger(__name__)
+
+# 어절 패턴 (한글, 영문, 숫자 연속)
+WORD_PATTERN = re.compile(r'[가-힣]+|[A-Za-z]+|[0-9]+')
+
+# 어절 끝에서 떼어 낼 조사/어미 (긴 것부터 검사)
+SUFFIXES = sorted([
+    '이에요', '예요', '입니다', '이었다', '였다', '이다', '이고', '이며', '이라', '이라고', '라고',
+    '합니다', '했습니다', '하였습니다', '습니다', '됩니다', '했어요', '해요', '하고', '하는', '하게', '하여',
+    '해서', '했다', '하다', '하네요', '네요', '어요', '아요', '었어요', '았어요', '였어요', '어서', '아서',
+    '으로', '에서', '에게', '까지', '부터', '보다', '처럼', '만큼', '이랑', '하며',
+    '은', '는', '이', '가', '을', '를', '에', '의', '도', '만', '와', '과', '로', '고', '며', '게', '지', '요',
+], key=len, reverse=True)
+
+# 키워드에서 제외할 단어 (어간 기준)
+STOPWORDS = {
+    '정말', '너무', '진짜', '그냥', '아주', '매우', '많이', '조금', '이런', '그런', '저런', '어떤',
+    '그리고', '하지만', '그래서', '그런데', '그러나', '또한', '이번', '다시', '모두', '우리', '저는', '제가',
+    '이책', '책을', '책이', '책은', '책도', '책의', '책으로', '책입니다', '책이에요', '책이다',
+    '있는', '있다', '없는', '같은', '같다', '것이', '것은', '정도', '때문', '이게', '그래', '하지', '않은', '않고', '되었',
+    '읽었', '읽고', '읽는', '읽어', '읽을', '읽기', '입니', '합니', '했습니', '있습니', '있었', '없었',
+}
+
+# 결과 키워드 표 기본 저장 경로
+DEFAULT_OUTPUT_PATH = "result/kyobo_book_keywords.csv"
+
+
+class KoreanTokenizer:
+    """규칙 기반 한국어 어절 토크나이저 (조사/어미 제거, 어절별 결과 캐시)"""
+
+    def __init__(self, min_length=2, suffixes=SUFFIXES, stopwords=STOPWORDS):
+        """
+        Args:
+            min_length: 키워드로 사용할 최소 글자 수
+            suffixes: 떼어 낼 조사/어미 리스트
+            stopwords: 제외할 단어 집합
+        """
+        self.min_length = min_length
+        self.suffixes = sorted(suffixes, key=len, reverse=True)
+        self.stopwords = set(stopwords)
+        self.cache = {}  # 어절 -> 어간 (제외 단어면 None)
+
+    def stem(self, word):
+        """
+        어절 1개의 어간 (남는 글자가 min_length 이상인 가장 긴 조사/어미를 한 번 제거, 결과는 캐시)
+
+        Returns:
+            str 또는 None: 어간 (너무 짧거나 제외 단어면 None)
+        """
+        if word in self.cache:
+            return self.cache[word]
+
+        stem = word.lower()
+        if '가' <= stem[0] <= '힣':
+            for suffix in self.suffixes:
+                if stem.endswith(suffix) and len(stem) - len(suffix) >= self.min_length:
+                    stem = stem[:-len(suffix)]
+                    break
+        if len(stem) < self.min_length or stem in self.stopwords or stem.isdigit():
+            stem = None
+
+        self.cache[word] = stem
+        return stem
+
+    def tokenize(self, text):
+        """리뷰 1개의 어간 리스트"""
+        return [stem for stem in map(self.stem, WORD_PATTERN.findall(str(text))) if stem is not None]
+
+
+class KeywordExtractor:
+    """리뷰 x 단어 희소 행렬 기반 그룹별 키워드 추출기"""
+
+    def __init__(self, tokenizer=None, min_count=3, top_k=20, alpha=100.0):
+        """
+        Args:
+            tokenizer: 어절 토크나이저 (None이면 KoreanTokenizer)
+            min_count: 그룹 키워드로 사용할 최소 등장 리뷰 수
+            top_k: 그룹별 키워드 수
+            alpha: 로그 오즈비 사전분포 세기 (전체 코퍼스 빈도에 비례하여 나눔)
+        """
+        self.tokenizer = tokenizer or KoreanTokenizer()
+        self.min_count = min_count
+        self.top_k = top_k
+        self.alpha = alpha
+        self.vocabulary = np.array([], dtype=object)
+        self.doc_ids = np.array([], dtype=np.int64)
+        self.term_ids = np.array([], dtype=np.int64)
+        self.n_docs = 0
+
+    def fit(self, texts):
+        """
+        리뷰 x 단어 희소 행렬 구성 - 리뷰를 구분자로 이어 붙인 문자열 하나에서 어절을 찾고
+        어절 위치를 리뷰 번호로 변환 (같은 리뷰의 같은 단어는 한 번만)
+
+        Args:
+            texts: 리뷰 텍스트 리스트 또는 Series
+
+        Returns:
+            KeywordExtractor: 행렬이 구성된 추출기
+        """
+        started = time.time()
+        texts = ["" if pd.isna(text) else str(text) for text in texts]
+        self.n_docs = len(texts)
+
+        lengths = np.array(list(map(len, texts)), dtype=np.int64) + 1
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+        corpus = "\x00".join(texts)
+
+        # 어절 -> 어간 -> 단어 번호 (어간 처리는 토크나이저 캐시로 어절 종류마다 한 번)
+        stem = self.tokenizer.stem
+        term_index = {}
+        positions = []
+        terms = []
+        for match in WORD_PATTERN.finditer(corpus):
+            word = stem(match.group())
+            if word is None:
+                continue
+            positions.append(match.start())
+            terms.append(term_index.setdefault(word, len(term_index)))
+
+        doc_ids = np.searchsorted(starts, np.array(positions, dtype=np.int64), side='right') - 1
+        vocabulary_size = len(term_index)
+        pairs = np.unique(doc_ids * vocabulary_size + np.array(terms, dtype=np.int64))
+        self.doc_ids, self.term_ids = np.divmod(pairs, vocabulary_size) if vocabulary_size else (pairs, pairs)
+        self.vocabulary = np.array(list(term_index), dtype=object)
+
+        logger.info(f"키워드 행렬 구성: 리뷰 {self.n_docs}개, 단어 {vocabulary_size}개, "
+                    f"0이 아닌 항목 {len(pairs)}개, 어절 캐시 {len(self.tokenizer.cache)}개, "
+                    f"{time.time() - started:.2f}초")
+        return self
+
+    def group_counts(self, groups):
+        """
+        그룹 x 단어 등장 리뷰 수 (0이 아닌 항목만)
+
+        Args:
+            groups: 리뷰별 그룹 이름 (None/NaN이면 어느 그룹에도 넣지 않음)
+
+        Returns:
+            tuple: (그룹 이름 배열, 그룹 번호 배열, 단어 번호 배열, 등장 리뷰 수 배열, 그룹별 리뷰 수 배열)
+        """
+        group_codes, group_names = pd.factorize(pd.Series(list(groups), dtype=object))
+        if len(group_codes) != self.n_docs:
+            raise ValueError(f"그룹 수({len(group_codes)})가 리뷰 수({self.n_docs})와 다릅니다.")
+
+        doc_groups = group_codes[self.doc_ids]
+        mask = doc_groups >= 0
+        vocabulary_size = len(self.vocabulary)
+        cells, counts = np.unique(doc_groups[mask] * vocabulary_size + self.term_ids[mask], return_counts=True)
+        group_ids, term_ids = np.divmod(cells, vocabulary_size) if vocabulary_size else (cells, cells)
+        group_sizes = np.bincount(group_codes[group_codes >= 0], minlength=len(group_names))
+        return np.asarray(group_names, dtype=object), group_ids, term_ids, counts, group_sizes
+
+    def tfidf(self, groups, top_k=None):
+        """
+        그룹별 TF-IDF 키워드 (TF: 그룹 리뷰 중 단어가 나온 비율, IDF: 단어가 나온 그룹 수의 역수 로그)
+
+        Args:
+            groups: 리뷰별 그룹 이름 (도서코드 등)
+            top_k: 그룹별 키워드 수 (None이면 self.top_k)
+
+        Returns:
+            DataFrame: 그룹, 순위, 키워드, 점수, 리뷰수 컬럼
+        """
+        names, group_ids, term_ids, counts, group_sizes = self.group_counts(groups)
+        keep = counts >= self.min_count
+        group_ids, term_ids, counts = group_ids[keep], term_ids[keep], counts[keep]
+
+        group_frequency = np.bincount(term_ids, minlength=len(self.vocabulary))
+        idf = np.log((1 + len(names)) / (1 + group_frequency[term_ids])) + 1
+        scores = counts / group_sizes[group_ids] * idf
+        return self._top_keywords(names, group_ids, term_ids, counts, scores, top_k)
+
+    def log_odds(self, groups, top_k=None):
+        """
+        그룹별 로그 오즈비 키워드 - 전체 코퍼스 빈도를 사전분포로 하는 로그 오즈비를 표준편차로 나눈 z 점수
+        (그룹에 속하지 않은 리뷰도 비교 대상 '나머지'와 사전분포에 포함)
+
+        Args:
+            groups: 리뷰별 그룹 이름 (감성 등)
+            top_k: 그룹별 키워드 수 (None이면 self.top_k)
+
+        Returns:
+            DataFrame: 그룹, 순위, 키워드, 점수, 리뷰수 컬럼
+        """
+        names, group_ids, term_ids, counts, _ = self.group_counts(groups)
+
+        totals = np.bincount(self.term_ids, minlength=len(self.vocabulary)).astype(float)
+        total = totals.sum()
+        group_totals = np.bincount(group_ids, weights=counts, minlength=len(names))
+        prior = self.alpha * totals / total
+
+        keep = counts >= self.min_count
+        group_ids, term_ids, counts = group_ids[keep], term_ids[keep], counts[keep].astype(float)
+        a = prior[term_ids]
+        rest = totals[term_ids] - counts
+        in_group = np.log((counts + a) / (group_totals[group_ids] + self.alpha - counts - a))
+        out_group = np.log((rest + a) / (total - group_totals[group_ids] + self.alpha - rest - a))
+        scores = (in_group - out_group) / np.sqrt(1 / (counts + a) + 1 / (rest + a))
+        return self._top_keywords(names, group_ids, term_ids, counts.astype(np.int64), scores, top_k)
+
+    def _top_keywords(self, names, group_ids, term_ids, counts, scores, top_k):
+        """그룹별 점수 상위 키워드 (그룹 번호, 점수 내림차순 정렬 후 그룹마다 앞에서 top_k개)"""
+        top_k = top_k or self.top_k
+        order = np.lexsort((-scores, group_ids))
+        group_ids, term_ids, counts, scores = group_ids[order], term_ids[order], counts[order], scores[order]
+        group_starts = np.searchsorted(group_ids, group_ids, side='left')
+        ranks = np.arange(len(group_ids)) - group_starts
+        keep = ranks < top_k
+        return pd.DataFrame({
+            '그룹': names[group_ids[keep]],
+            '순위': ranks[keep] + 1,
+            '키워드': self.vocabulary[term_ids[keep]],
+            '점수': np.round(scores[keep], 4),
+            '리뷰수': counts[keep],
+        })
+
+
+def load_keyword_reviews(store=None, reviews_dir=None):
+    """
+    키워드 추출 대상 리뷰 로드 - 리뷰 통합 저장소가 있으면 저장소, 없으면 리뷰 CSV 디렉토리 (도서코드는 파일명에서 추출)
+
+    Returns:
+        DataFrame: 도서코드, 리뷰번호, 평점, 리뷰내용 컬럼
+    """
+    columns = ['도서코드', '리뷰번호', '평점', '리뷰내용']
+    if store is not None:
+        return store.load(columns=columns)
+
+    frames = []
+    for path in glob.glob(os.path.join(reviews_dir, "*.csv")):
+        match = re.search(r'_([A-Za-z0-9]+)_', os.path.basename(path))
+        if match:
+            frames.append(pd.read_csv(path, usecols=columns[1:]).assign(도서코드=match.group(1)))
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)[columns]
+
+
+def attach_sentiment(reviews, result_file=None):
+    """
+    리뷰별 감성 추가 - 감성분석 결과 파일의 감성을 우선 사용하고, 없는 리뷰는 평점 기준 감성 사용
+
+    Args:
+        reviews: load_keyword_reviews 결과
+        result_file: 감성분석 결과 CSV 경로 (도서코드, 리뷰번호, 감성 컬럼)
+
+    Returns:
+        DataFrame: 감성 컬럼이 추가된 리뷰
+    """
+    labels = rating_to_label(reviews['평점'])
+    rating_sentiment = np.where(labels >= 0, np.array(SENTIMENT_LABELS)[labels], None)
+    reviews = reviews.assign(감성=rating_sentiment)
+
+    if result_file and os.path.exists(result_file):
+        results = pd.read_csv(result_file, usecols=['도서코드', '리뷰번호', '감성'])
+        results = results.astype({'도서코드': str, '리뷰번호': str}).drop_duplicates(['도서코드', '리뷰번호'], keep='last')
+        keys = pd.MultiIndex.from_arrays([reviews['도서코드'].astype(str), reviews['리뷰번호'].astype(str)])
+        analyzed = results.set_index(['도서코드', '리뷰번호'])['감성'].reindex(keys).to_numpy()
+        reviews['감성'] = np.where(pd.isna(analyzed), reviews['감성'], analyzed)
+    return reviews
+
+
+def build_keyword_tables(reviews, extractor=None):
+    """
+    도서별(TF-IDF), 감성별(로그 오즈비) 키워드 표를 한 번에 생성
+
+    Args:
+        reviews: 도서코드, 리뷰내용, 감성 컬럼을 가진 DataFrame
+        extractor: 키워드 추출기 (None이면 기본 설정)
+
+    Returns:
+        DataFrame: 구분(도서/감성), 그룹, 순위, 키워드, 점수, 리뷰수 컬럼
+    """
+    started = time.time()
+    extractor = (extractor or KeywordExtractor()).fit(reviews['리뷰내용'])
+    tables = pd.concat([
+        extractor.tfidf(reviews['도서코드'].astype(str)).assign(구분='도서'),
+        extractor.log_odds(reviews['감성']).assign(구분='감성'),
+    ], ignore_index=True)
+    logger.info(f"키워드 표 생성 완료: 도서 {reviews['도서코드'].nunique()}권, 리뷰 {len(reviews)}개, "
+                f"{time.time() - started:.2f}초")
+    return tables[['구분', '그룹', '순위', '키워드', '점수', '리뷰수']]
+
+
+if __name__ == "__main__":
+    from kyobo_review_store import ReviewStore, DEFAULT_STORE_PATH
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = ReviewStore(DEFAULT_STORE_PATH) if os.path.exists(DEFAULT_STORE_PATH) else None
+    reviews = load_keyword_reviews(store, "homework/data/kyobo_reviews")
+    reviews = attach_sentiment(reviews, "result/kyobo_book_sentiment_analysis.csv")
+    tables = build_keyword_tables(reviews)
+    os.makedirs(os.path.dirname(DEFAULT_OUTPUT_PATH), exist_ok=True)
+    tables.to_csv(DEFAULT_OUTPUT_PATH, index=False, encoding='utf-8-sig')
+    logger.info(f"키워드 표 저장: {DEFAULT_OUTPUT_PATH} ({len(tables)}개 항목)")
@@ -0,0 +1,188 @@
+"""
+감성 사전 기반 리뷰 감성 점수 (벡터화)
+- 리뷰 컬럼 전체를 하나의 문자열로 이어 붙여 사전 단어별로 한 번씩만 검사 (리뷰마다 반복하지 않음)
+- 리뷰별 긍정/부정 단어 수로 감성, 감성 점수, 일치한 키워드 배열 반환 (기존 행 단위 규칙과 같은 결과)
+- 리뷰가 많으면 구간별로 나눠 여러 프로세스에서 처리
+- python kyobo_lexicon_sentiment.py: 기존 행 단위 함수와 처리 시간 비교
+"""
+
+import os
+import re
+import time
+import glob
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 감성 사전 (사전 순서가 키워드 순서)
+POSITIVE_WORDS = ['좋', '훌륭', '추천', '최고', '재미', '만족', '행복']
+NEGATIVE_WORDS = ['별로', '실망', '후회', '싫', '나쁨', '불만', '최악']
+
+# 일치한 단어가 없을 때 키워드
+NEUTRAL_KEYWORDS = ["중립적", "보통", "평범"]
+
+
+def score_row(review_text, positive_words=POSITIVE_WORDS, negative_words=NEGATIVE_WORDS):
+    """
+    리뷰 1개 감성 점수 (기존 행 단위 규칙, 비교 기준용)
+
+    Returns:
+        dict: sentiment, score, keywords
+    """
+    positive_count = sum([1 for word in positive_words if word in str(review_text)])
+    negative_count = sum([1 for word in negative_words if word in str(review_text)])
+
+    if positive_count > negative_count:
+        sentiment = "긍정"
+        score = min(0.5 + (positive_count - negative_count) * 0.1, 1.0)
+        keywords = [word for word in positive_words if word in str(review_text)][:3]
+    elif negative_count > positive_count:
+        sentiment = "부정"
+        score = max(-0.5 - (negative_count - positive_count) * 0.1, -1.0)
+        keywords = [word for word in negative_words if word in str(review_text)][:3]
+    else:
+        sentiment = "중립"
+        score = 0.0
+        keywords = list(NEUTRAL_KEYWORDS)
+
+    while len(keywords) < 3:
+        keywords.append("기타")
+
+    return {"sentiment": sentiment, "score": score, "keywords": keywords}
+
+
+class LexiconScorer:
+    """리뷰 목록 단위 감성 사전 점수기"""
+
+    def __init__(self, positive_words=POSITIVE_WORDS, negative_words=NEGATIVE_WORDS):
+        """
+        Args:
+            positive_words: 긍정 단어 리스트
+            negative_words: 부정 단어 리스트
+        """
+        self.positive_words = list(positive_words)
+        self.negative_words = list(negative_words)
+
+        # 단어별 정규식 (단어마다 코퍼스 전체를 한 번씩 검사하므로 '불만족'의 '불만'/'만족'처럼 겹친 단어도 모두 찾음)
+        self.patterns = [re.compile(re.escape(word)) for word in self.positive_words + self.negative_words]
+
+    def score(self, texts):
+        """
+        리뷰 목록 전체 감성 점수 - 리뷰를 구분자로 이어 붙인 문자열 하나를 단어별로 검사하고
+        일치 위치를 리뷰 번호로 변환하여 리뷰 x 단어 존재 행렬로 집계
+
+        Args:
+            texts: 리뷰 텍스트 리스트 또는 Series
+
+        Returns:
+            DataFrame: sentiment, score, keywords, positive_count, negative_count 컬럼 (입력 순서)
+        """
+        texts = [str(text) for text in texts]
+        n = len(texts)
+        words = self.positive_words + self.negative_words
+
+        # 리뷰 시작 위치 (구분자 1글자 포함)
+        lengths = np.array(list(map(len, texts)), dtype=np.int64) + 1
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+        corpus = "\x00".join(texts)
+
+        # 리뷰 x 단어 존재 행렬 (일치 위치 -> 리뷰 번호, 같은 단어는 한 번만)
+        presence = np.zeros((n, len(words)), dtype=bool)
+        for word_id, pattern in enumerate(self.patterns):
+            positions = np.array([match.start() for match in pattern.finditer(corpus)], dtype=np.int64)
+            presence[np.searchsorted(starts, positions, side='right') - 1, word_id] = True
+        positive_count = presence[:, :len(self.positive_words)].sum(axis=1)
+        negative_count = presence[:, len(self.positive_words):].sum(axis=1)
+        diff = positive_count - negative_count
+
+        sentiment = np.where(diff > 0, "긍정", np.where(diff < 0, "부정", "중립"))
+        score = np.where(diff > 0, np.minimum(0.5 + diff * 0.1, 1.0),
+                         np.where(diff < 0, np.maximum(-0.5 + diff * 0.1, -1.0), 0.0))
+
+        # 키워드: 우세한 쪽 단어를 사전 순서대로 최대 3개 ('기타'로 채움), 존재 패턴별로 한 번만 계산
+        dominant = np.sign(diff)
+        pattern_codes = presence.astype(np.int64) @ (1 << np.arange(len(words), dtype=np.int64)) * 3 + dominant + 1
+        unique_codes, inverse = np.unique(pattern_codes, return_inverse=True)
+        keyword_lists = np.empty(len(unique_codes), dtype=object)
+        for j, code in enumerate(unique_codes):
+            mask, side = divmod(int(code), 3)
+            if side == 1:
+                keyword_lists[j] = list(NEUTRAL_KEYWORDS)
+                continue
+            candidates = self.positive_words if side == 2 else self.negative_words
+            offset = 0 if side == 2 else len(self.positive_words)
+            found = [word for i, word in enumerate(candidates) if mask >> (offset + i) & 1]
+            keyword_lists[j] = (found[:3] + ["기타"] * 3)[:3]
+
+        return pd.DataFrame({
+            'sentiment': sentiment,
+            'score': score,
+            'keywords': keyword_lists[inverse.ravel()],  # 같은 패턴의 리뷰는 같은 리스트 객체를 공유
+            'positive_count': positive_count,
+            'negative_count': negative_count,
+        })
+
+    def score_parallel(self, texts, workers=None, chunk_size=50000):
+        """
+        리뷰가 많을 때 구간별로 나눠 여러 프로세스에서 점수 계산 (chunk_size 이하면 현재 프로세스에서 처리)
+
+        Args:
+            texts: 리뷰 텍스트 리스트 또는 Series
+            workers: 프로세스 수 (None이면 CPU 수)
+            chunk_size: 프로세스 하나가 처리할 리뷰 수
+
+        Returns:
+            DataFrame: score()와 같은 형식
+        """
+        texts = pd.Series(texts, dtype=object).reset_index(drop=True)
+        if len(texts) <= chunk_size:
+            return self.score(texts)
+
+        chunks = [texts.iloc[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return pd.concat(list(executor.map(self.score, chunks)), ignore_index=True)
+
+
+def benchmark(texts, repeat=3):
+    """
+    기존 행 단위 함수와 벡터화 점수기의 처리 시간 비교 (결과 일치 여부 포함)
+
+    Returns:
+        dict: 리뷰 수, 방식별 최소 처리 시간(초), 속도 향상 배수, 결과 일치 여부
+    """
+    texts = list(texts)
+    scorer = LexiconScorer()
+
+    def best_time(func):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - started)
+        return min(timings), result
+
+    row_seconds, row_results = best_time(lambda: [score_row(text) for text in texts])
+    vector_seconds, vector_results = best_time(lambda: scorer.score(texts))
+
+    same = (list(vector_results['sentiment']) == [r['sentiment'] for r in row_results]
+            and np.allclose(vector_results['score'], [r['score'] for r in row_results])
+            and list(vector_results['keywords']) == [r['keywords'] for r in row_results])
+
+    return {
+        'reviews': len(texts),
+        'row_seconds': round(row_seconds, 4),
+        'vectorized_seconds': round(vector_seconds, 4),
+        'speedup': round(row_seconds / vector_seconds, 1) if vector_seconds else None,
+        'same_result': same,
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    files = glob.glob(os.path.join("homework/data/kyobo_reviews", "*.csv"))
+    reviews = pd.concat([pd.read_csv(f, usecols=['리뷰내용']) for f in files], ignore_index=True)['리뷰내용']
+    logger.info(f"감성 사전 점수 비교: {benchmark(reviews)}")
@@ -0,0 +1,163 @@
+"""
+감성분석용 LLM 호출 스케줄러
+- 스레드 풀로 최대 N개의 요청을 동시에 보내고, 결과는 입력 순서대로 반환
+- 최근 60초 동안의 요청 수(RPM)와 토큰 수(TPM)가 한도를 넘지 않도록 요청 전에 대기
+- 429/5xx/연결 오류는 지수 백오프로 재시도, 429의 Retry-After는 모든 작업자가 함께 따름
+"""
+
+import time
+import random
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+# 요청 수/토큰 수 한도를 세는 구간(초)
+WINDOW_SECONDS = 60.0
+
+
+class LLMScheduler:
+    """RPM/TPM 한도 기반 동시 요청 스케줄러"""
+
+    def __init__(self, max_concurrency=4, rpm=60, tpm=60000, max_retries=5, backoff_base=1.0, backoff_max=60.0):
+        """
+        Args:
+            max_concurrency: 동시에 보낼 최대 요청 수
+            rpm: 분당 최대 요청 수
+            tpm: 분당 최대 토큰 수 (프롬프트 + 최대 응답 토큰 추정치 기준)
+            max_retries: 요청당 최대 재시도 횟수
+            backoff_base: 재시도 기본 대기 시간(초), 재시도마다 2배씩 증가
+            backoff_max: 재시도 대기 시간 상한(초)
+        """
+        self.max_concurrency = max_concurrency
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.window = deque()  # (요청 시각, 토큰 수)
+        self.window_tokens = 0
+        self.paused_until = 0.0  # 429 Retry-After로 전체 요청을 멈추는 시각
+        self.cond = threading.Condition()
+        self.stats = {'requests': 0, 'retries': 0, 'rate_limited': 0, 'wait_seconds': 0.0}
+
+    def acquire(self, tokens):
+        """
+        요청 1건을 보낼 수 있을 때까지 대기 (RPM/TPM 한도, Retry-After 일시 정지 반영)
+
+        Args:
+            tokens: 이번 요청의 토큰 수 추정치
+        """
+        tokens = min(tokens, self.tpm)
+        started = time.monotonic()
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                while self.window and now - self.window[0][0] >= WINDOW_SECONDS:
+                    self.window_tokens -= self.window.popleft()[1]
+
+                wait = self.paused_until - now
+                if wait <= 0 and self.window and (len(self.window) >= self.rpm or self.window_tokens + tokens > self.tpm):
+                    # 가장 오래된 요청이 구간을 벗어날 때까지 대기
+                    wait = WINDOW_SECONDS - (now - self.window[0][0])
+
+                if wait <= 0:
+                    self.window.append((now, tokens))
+                    self.window_tokens += tokens
+                    self.stats['requests'] += 1
+                    self.stats['wait_seconds'] += now - started
+                    return
+                self.cond.wait(wait)
+
+    @staticmethod
+    def error_status(error):
+        """
+        재시도할 오류인지 판단
+
+        Returns:
+            int, str 또는 None: 429/5xx 상태 코드, 연결 오류면 'connection', 재시도하지 않을 오류면 None
+        """
+        status = getattr(error, 'status_code', None)
+        if status is not None:
+            return status if status == 429 or status >= 500 else None
+        if isinstance(error, (openai.APIConnectionError, ConnectionError, TimeoutError)):
+            return 'connection'
+        return None
+
+    @classmethod
+    def is_fatal(cls, error):
+        """재시도하거나 요청을 나눠도 성공하지 않을 API 오류인지 확인 (인증 실패, 잘못된 요청, 없는 모델 등)"""
+        return isinstance(error, openai.APIError) and cls.error_status(error) is None
+
+    @staticmethod
+    def retry_after(error):
+        """오류 응답의 Retry-After 헤더 값(초), 없으면 None"""
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        try:
+            if headers.get('retry-after-ms') is not None:
+                return float(headers['retry-after-ms']) / 1000
+            if headers.get('retry-after') is not None:
+                return float(headers['retry-after'])
+        except (TypeError, ValueError):
+            pass
+        return None
+
+    def call(self, func, *args, tokens=0, **kwargs):
+        """
+        한도 안에서 함수 호출 - 재시도할 수 있는 오류는 지수 백오프 후 다시 호출
+
+        Args:
+            func: LLM 요청 함수
+            tokens: 요청 토큰 수 추정치
+
+        Returns:
+            func의 반환값 (재시도 횟수를 넘기거나 재시도할 수 없는 오류는 그대로 발생)
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire(tokens)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                status = self.error_status(e)
+                if status is None or attempt == self.max_retries:
+                    raise
+
+                delay = self.retry_after(e)
+                if delay is None:
+                    delay = min(self.backoff_base * (2 ** attempt), self.backoff_max) * random.uniform(1, 1.5)
+
+                with self.cond:
+                    self.stats['retries'] += 1
+                    if status == 429:
+                        # 한도 초과: 다른 작업자도 같은 시간 동안 요청하지 않도록 전체 일시 정지
+                        self.stats['rate_limited'] += 1
+                        self.paused_until = max(self.paused_until, time.monotonic() + delay)
+                        self.cond.notify_all()
+
+                logger.warning(f"LLM 요청 실패({status}), {delay:.1f}초 후 재시도 ({attempt+1}/{self.max_retries})")
+                time.sleep(delay)
+
+    def map(self, func, items):
+        """
+        작업들을 동시에 실행하고 결과를 입력 순서대로 반환 (제너레이터)
+
+        Args:
+            func: 작업 함수 (내부에서 call로 LLM 요청)
+            items: 작업 입력 리스트
+        """
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        try:
+            yield from executor.map(func, items)
+        finally:
+            # 작업 중 오류로 중단되면 아직 시작하지 않은 작업은 요청하지 않음
+            executor.shutdown(cancel_futures=True)
+
+    def log_summary(self):
+        """요청/재시도/대기 통계를 로그로 출력"""
+        logger.info(f"LLM 요청 통계: 요청 {self.stats['requests']}건, 재시도 {self.stats['retries']}회 "
+                    f"(429 {self.stats['rate_limited']}회), 한도 대기 {self.stats['wait_seconds']:.1f}초")
@@ -0,0 +1,248 @@
+"""
+교보문고 리뷰 로컬 감성분석 모델 (API 호출 없음, CPU 일괄 처리)
+- 리뷰 텍스트의 글자 n-gram(띄어쓰기/형태 변화가 많은 한국어 리뷰에 맞춤)을 특징으로 하는 나이브 베이즈 분류기
+- 별도 라벨 없이 수집한 평점을 약한 라벨로 학습 (4점: 긍정, 3점: 중립, 1~2점: 부정)
+- 리뷰 목록 전체를 한 번에 예측하여 감성, 감성 점수, 신뢰도, 근거 n-gram 반환
+- 신뢰도가 낮은 리뷰만 LLM으로 넘기는 단계적 분석(cascade)에 사용
+"""
+
+import os
+import re
+import glob
+import json
+import logging
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 기본 모델 저장 경로
+DEFAULT_MODEL_PATH = "homework/data/kyobo_local_sentiment.npz"
+
+# 클래스 순서 (예측 확률 배열의 열 순서)
+SENTIMENT_LABELS = ('부정', '중립', '긍정')
+
+# 평점 -> 약한 라벨 기준 (수집 데이터의 평점 범위 1~4)
+POSITIVE_MIN_RATING = 4
+NEGATIVE_MAX_RATING = 2
+
+
+def rating_to_label(ratings):
+    """
+    평점을 약한 라벨 인덱스로 변환
+
+    Returns:
+        ndarray: SENTIMENT_LABELS 인덱스 (평점이 없으면 -1)
+    """
+    ratings = pd.to_numeric(pd.Series(ratings), errors='coerce').to_numpy()
+    labels = np.full(len(ratings), 1)
+    labels[ratings >= POSITIVE_MIN_RATING] = 2
+    labels[ratings <= NEGATIVE_MAX_RATING] = 0
+    labels[np.isnan(ratings)] = -1
+    return labels
+
+
+class LocalSentimentModel:
+    """글자 n-gram 나이브 베이즈 감성 분류기"""
+
+    def __init__(self, ngram_range=(2, 3), min_df=2, max_features=200000, alpha=1.0, max_chars=500, temperature=5.0):
+        """
+        Args:
+            ngram_range: 글자 n-gram 길이 범위
+            min_df: 특징으로 사용할 n-gram의 최소 등장 리뷰 수
+            max_features: 최대 특징 수 (등장 리뷰 수가 많은 순)
+            alpha: 라플라스 평활 계수
+            max_chars: 리뷰당 사용할 최대 글자 수
+            temperature: 확률 보정 온도 (나이브 베이즈의 과신을 줄이기 위해 로그 우도를 나눔)
+        """
+        self.ngram_range = ngram_range
+        self.min_df = min_df
+        self.max_features = max_features
+        self.alpha = alpha
+        self.max_chars = max_chars
+        self.temperature = temperature
+        self.vocabulary = {}
+        self.features = np.array([], dtype=object)
+        self.feature_log_prob = None
+
+    def ngrams(self, text):
+        """리뷰 1개의 글자 n-gram 집합 (연속 공백은 하나로, 앞뒤에 경계 공백 추가)"""
+        text = " " + re.sub(r'\s+', ' ', str(text)).strip()[:self.max_chars] + " "
+        low, high = self.ngram_range
+        return {text[i:i+n] for n in range(low, high + 1) for i in range(len(text) - n + 1)}
+
+    def transform(self, texts):
+        """
+        리뷰 목록을 희소 특징 형식으로 변환
+
+        Returns:
+            tuple: (특징 인덱스 배열, 각 특징이 속한 리뷰 번호 배열)
+        """
+        vocabulary = self.vocabulary
+        indices = []
+        doc_ids = []
+        for doc_id, text in enumerate(texts):
+            ids = [vocabulary[gram] for gram in self.ngrams(text) if gram in vocabulary]
+            indices.extend(ids)
+            doc_ids.extend([doc_id] * len(ids))
+        return np.array(indices, dtype=np.int64), np.array(doc_ids, dtype=np.int64)
+
+    def fit(self, texts, ratings):
+        """
+        평점을 약한 라벨로 학습 (평점이 없는 리뷰는 제외, 클래스 비율과 무관하게 균등 사전확률 사용)
+
+        Args:
+            texts: 리뷰 텍스트 리스트
+            ratings: 평점 리스트
+
+        Returns:
+            LocalSentimentModel: 학습된 모델
+        """
+        labels = rating_to_label(ratings)
+        texts = [text for text, label in zip(texts, labels) if label >= 0]
+        labels = labels[labels >= 0]
+
+        # 어휘 구성 (등장 리뷰 수 기준)
+        document_frequency = Counter()
+        for text in texts:
+            document_frequency.update(self.ngrams(text))
+        grams = [gram for gram, count in document_frequency.most_common(self.max_features) if count >= self.min_df]
+        self.vocabulary = {gram: i for i, gram in enumerate(grams)}
+        self.features = np.array(grams, dtype=object)
+
+        # 클래스별 n-gram 빈도 -> 로그 확률
+        indices, doc_ids = self.transform(texts)
+        feature_labels = labels[doc_ids]
+        counts = np.stack([np.bincount(indices[feature_labels == c], minlength=len(grams))
+                           for c in range(len(SENTIMENT_LABELS))], axis=1).astype(float)
+        smoothed = counts + self.alpha
+        self.feature_log_prob = np.log(smoothed / smoothed.sum(axis=0))
+
+        logger.info(f"로컬 감성 모델 학습 완료: 리뷰 {len(texts)}개, 특징 {len(grams)}개, "
+                    f"라벨 분포 {dict(zip(SENTIMENT_LABELS, np.bincount(labels, minlength=3).tolist()))}")
+        return self
+
+    def predict_proba(self, texts, features=None):
+        """
+        클래스별 예측 확률
+
+        Args:
+            texts: 리뷰 텍스트 리스트
+            features: transform 결과 (이미 변환했으면 재사용)
+
+        Returns:
+            ndarray: (리뷰 수, 3) 확률 배열, 열 순서는 SENTIMENT_LABELS
+        """
+        indices, doc_ids = features if features is not None else self.transform(texts)
+        contributions = self.feature_log_prob[indices]
+        log_likelihood = np.stack([np.bincount(doc_ids, weights=contributions[:, c], minlength=len(texts))
+                                   for c in range(len(SENTIMENT_LABELS))], axis=1)
+        log_likelihood /= self.temperature
+        log_likelihood -= log_likelihood.max(axis=1, keepdims=True)
+        proba = np.exp(log_likelihood)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def predict(self, texts, top_k=3):
+        """
+        리뷰 목록 일괄 감성 예측
+
+        Args:
+            texts: 리뷰 텍스트 리스트
+            top_k: 리뷰별 근거 n-gram 수
+
+        Returns:
+            DataFrame: sentiment, score(P(긍정) - P(부정)), confidence(최대 확률), keywords 컬럼
+        """
+        texts = list(texts)
+        indices, doc_ids = self.transform(texts)
+        proba = self.predict_proba(texts, (indices, doc_ids))
+        predicted = proba.argmax(axis=1)
+        bounds = np.searchsorted(doc_ids, np.arange(len(texts) + 1))
+
+        # 예측 클래스 쪽으로 가장 크게 기여한 n-gram (다른 클래스 평균 대비 로그 확률 비, 서로 겹치는 n-gram 제외)
+        log_ratio = self.feature_log_prob - self.feature_log_prob.mean(axis=1, keepdims=True)
+        keywords = []
+        for doc_id, label in enumerate(predicted):
+            ids = indices[bounds[doc_id]:bounds[doc_id + 1]]
+            top = []
+            for i in ids[np.argsort(-log_ratio[ids, label])]:
+                gram = self.features[i].strip()
+                if len(gram) >= 2 and not any(gram in chosen or chosen in gram for chosen in top):
+                    top.append(gram)
+                if len(top) >= top_k:
+                    break
+            keywords.append(top)
+
+        return pd.DataFrame({
+            'sentiment': np.array(SENTIMENT_LABELS)[predicted],
+            'score': np.round(proba[:, 2] - proba[:, 0], 3),
+            'confidence': np.round(proba.max(axis=1), 3),
+            'keywords': keywords,
+        })
+
+    def save(self, path=DEFAULT_MODEL_PATH):
+        """모델 파일 저장 (.npz)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        params = {'ngram_range': list(self.ngram_range), 'min_df': self.min_df, 'max_features': self.max_features,
+                  'alpha': self.alpha, 'max_chars': self.max_chars, 'temperature': self.temperature}
+        np.savez_compressed(path, features=self.features.astype(str), feature_log_prob=self.feature_log_prob,
+                            params=json.dumps(params))
+        logger.info(f"로컬 감성 모델 저장: {path}")
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL_PATH):
+        """저장된 모델 파일 로드"""
+        data = np.load(path)
+        params = json.loads(str(data['params']))
+        params['ngram_range'] = tuple(params['ngram_range'])
+        model = cls(**params)
+        model.features = data['features'].astype(object)
+        model.vocabulary = {gram: i for i, gram in enumerate(model.features)}
+        model.feature_log_prob = data['feature_log_prob']
+        return model
+
+
+def load_training_reviews(store=None, reviews_dir=None):
+    """
+    학습용 리뷰(리뷰내용, 평점) 로드 - 리뷰 통합 저장소가 있으면 저장소, 없으면 리뷰 CSV 디렉토리
+
+    Returns:
+        DataFrame: 리뷰내용, 평점 컬럼
+    """
+    if store is not None:
+        return store.load(columns=['리뷰내용', '평점'])
+    files = glob.glob(os.path.join(reviews_dir, "*.csv"))
+    if not files:
+        return pd.DataFrame(columns=['리뷰내용', '평점'])
+    return pd.concat([pd.read_csv(f, usecols=['리뷰내용', '평점']) for f in files], ignore_index=True)
+
+
+def load_or_train(path=DEFAULT_MODEL_PATH, store=None, reviews_dir=None):
+    """
+    저장된 모델이 있으면 로드, 없으면 수집한 리뷰로 학습 후 저장
+
+    Returns:
+        LocalSentimentModel 또는 None: 학습할 리뷰가 없으면 None
+    """
+    if os.path.exists(path):
+        return LocalSentimentModel.load(path)
+
+    reviews = load_training_reviews(store, reviews_dir).dropna()
+    if reviews.empty:
+        logger.warning("로컬 감성 모델 학습용 리뷰가 없습니다.")
+        return None
+
+    model = LocalSentimentModel().fit(reviews['리뷰내용'].astype(str).tolist(), reviews['평점'].tolist())
+    model.save(path)
+    return model
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if os.path.exists(DEFAULT_MODEL_PATH):
+        os.remove(DEFAULT_MODEL_PATH)
+    load_or_train(reviews_dir="homework/data/kyobo_reviews")
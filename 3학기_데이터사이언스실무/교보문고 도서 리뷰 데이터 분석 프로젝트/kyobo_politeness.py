@@ -0,0 +1,115 @@
+"""
+교보문고 스크래퍼 요청 간격 조절 및 요청 시간 측정
+- AdaptiveDelay: 관측한 서버 응답 시간과 오류율(지수 이동 평균)에 따라 요청 간 대기 시간을 자동 조절
+- RequestMetrics: 요청별 소요 시간/성공 여부를 기록하고 종류별 통계(평균, p50, p95, 오류율) 제공
+"""
+
+import time
+import random
+import logging
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveDelay:
+    """서버 응답 시간과 오류율 기반 적응형 요청 간격"""
+
+    def __init__(self, min_delay=1.0, max_delay=15.0, latency_factor=2.0, error_penalty=10.0, smoothing=0.2):
+        """
+        Args:
+            min_delay: 최소 대기 시간(초)
+            max_delay: 최대 대기 시간(초)
+            latency_factor: 평균 응답 시간 대비 대기 시간 배수 (느려질수록 더 오래 쉼)
+            error_penalty: 오류율에 곱해 대기 시간을 늘리는 계수 (오류율 10% -> 2배)
+            smoothing: 지수 이동 평균 가중치 (클수록 최근 관측 반영이 빠름)
+        """
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.latency_factor = latency_factor
+        self.error_penalty = error_penalty
+        self.smoothing = smoothing
+        self.latency = None
+        self.error_rate = 0.0
+        self.last_request = None
+        self.lock = threading.Lock()
+
+    def record(self, seconds, ok=True):
+        """요청 결과(소요 시간, 성공 여부)를 반영하여 평균 응답 시간과 오류율 갱신"""
+        with self.lock:
+            if ok:
+                self.latency = seconds if self.latency is None else \
+                    (1 - self.smoothing) * self.latency + self.smoothing * seconds
+            self.error_rate = (1 - self.smoothing) * self.error_rate + self.smoothing * (0.0 if ok else 1.0)
+
+    @property
+    def delay(self):
+        """현재 요청 간 대기 시간(초)"""
+        base = self.min_delay if self.latency is None else max(self.min_delay, self.latency * self.latency_factor)
+        return min(self.max_delay, base * (1 + self.error_penalty * self.error_rate))
+
+    def wait(self):
+        """
+        직전 요청 이후 현재 대기 시간이 지날 때까지 대기 (±20% 랜덤)
+
+        Returns:
+            float: 실제 대기한 시간(초)
+        """
+        target = self.delay * random.uniform(0.8, 1.2)
+        remaining = 0.0 if self.last_request is None else max(0.0, target - (time.monotonic() - self.last_request))
+        if remaining > 0:
+            time.sleep(remaining)
+        self.last_request = time.monotonic()
+        return remaining
+
+
+class RequestMetrics:
+    """요청별 소요 시간 기록"""
+
+    def __init__(self):
+        self.records = []
+        self.lock = threading.Lock()
+
+    def record(self, kind, url, seconds, ok=True):
+        """
+        요청 1건 기록
+
+        Args:
+            kind: 요청 종류 (예: 'http', 'selenium')
+            url: 요청 URL
+            seconds: 소요 시간(초)
+            ok: 성공 여부
+        """
+        with self.lock:
+            self.records.append({'kind': kind, 'url': url, 'seconds': seconds, 'ok': ok, 'time': time.time()})
+
+    def summary(self):
+        """
+        요청 종류별 통계
+
+        Returns:
+            dict: {종류: {'count', 'mean', 'p50', 'p95', 'error_rate'}}
+        """
+        with self.lock:
+            records = list(self.records)
+
+        result = {}
+        for kind in sorted({record['kind'] for record in records}):
+            seconds = np.array([record['seconds'] for record in records if record['kind'] == kind])
+            errors = sum(1 for record in records if record['kind'] == kind and not record['ok'])
+            result[kind] = {
+                'count': len(seconds),
+                'mean': round(float(seconds.mean()), 3),
+                'p50': round(float(np.percentile(seconds, 50)), 3),
+                'p95': round(float(np.percentile(seconds, 95)), 3),
+                'error_rate': round(errors / len(seconds), 3),
+            }
+        return result
+
+    def log_summary(self):
+        """요청 종류별 통계를 로그로 출력"""
+        for kind, stat in self.summary().items():
+            logger.info(f"요청 시간 통계 [{kind}]: {stat['count']}건, 평균 {stat['mean']}초, "
+                        f"p50 {stat['p50']}초, p95 {stat['p95']}초, 오류율 {stat['error_rate']:.1%}")
@@ -0,0 +1,174 @@
+"""
+감성분석 결과 추가 전용 저장 (JSONL 저널 + 재개 키 인덱스)
+- 새 결과 행만 JSONL 파일 끝에 추가하고 fsync (전체 결과를 다시 쓰지 않음)
+- 저장한 행의 재개 키(파일명_리뷰번호)는 작은 인덱스 파일(.idx)에 따로 추가하여 재시작 시 인덱스만 읽음
+- 인덱스는 행이 디스크에 기록된 뒤에 추가되므로 인덱스에 있는 키는 항상 저널에 존재
+- 중단으로 잘린 마지막 줄은 다음 실행 시 잘라내고, 분석 종료 후 중복을 제거한 CSV로 압축(compact)
+"""
+
+import os
+import json
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def result_key(row):
+    """결과 행의 재개 키 (파일명_리뷰번호)"""
+    return f"{row.get('파일명')}_{row.get('리뷰번호')}"
+
+
+def _json_default(value):
+    """numpy 스칼라 등 JSON 기본 타입이 아닌 값 변환"""
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+def _truncate_partial_line(path):
+    """파일이 줄바꿈으로 끝나지 않으면 마지막 줄바꿈 이후(중단으로 잘린 줄)를 잘라냄"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            block = min(4096, position)
+            f.seek(position - block)
+            chunk = f.read(block)
+            newline = chunk.rfind(b'\n')
+            if newline != -1:
+                position = position - block + newline + 1
+                break
+            position -= block
+        if position != end:
+            f.truncate(position)
+            logger.warning(f"잘린 마지막 줄 제거: {path} ({end - position}바이트)")
+
+
+class ResultWriter:
+    """추가 전용 감성분석 결과 저장소"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: JSONL 저널 파일 경로 (인덱스는 path + '.idx')
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.index_path = f"{path}.idx"
+
+        _truncate_partial_line(self.path)
+        _truncate_partial_line(self.index_path)
+        if os.path.exists(self.path) and not os.path.exists(self.index_path):
+            self.rebuild_index()
+
+    def load_keys(self):
+        """
+        저장된 결과의 재개 키 집합 (인덱스 파일만 읽음)
+
+        Returns:
+            set: 파일명_리뷰번호 키 집합
+        """
+        if not os.path.exists(self.index_path):
+            return set()
+        with open(self.index_path, encoding='utf-8') as f:
+            return {line.rstrip('\n') for line in f if line.strip()}
+
+    def rebuild_index(self):
+        """저널 전체를 읽어 인덱스 파일 다시 생성"""
+        keys = [result_key(row) for row in self.iter_rows()]
+        self._write_atomic(self.index_path, "".join(f"{key}\n" for key in keys))
+        logger.info(f"결과 인덱스 재생성: {self.index_path} ({len(keys)}개 키)")
+
+    def iter_rows(self):
+        """저널의 결과 행을 순서대로 반환 (제너레이터)"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def append(self, rows):
+        """
+        새 결과 행 추가 - 저널에 쓰고 fsync 한 뒤 인덱스에 키 추가
+
+        Args:
+            rows: 결과 dict 리스트
+
+        Returns:
+            int: 추가한 행 수
+        """
+        if not rows:
+            return 0
+
+        lines = "".join(json.dumps(row, ensure_ascii=False, default=_json_default) + "\n" for row in rows)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write("".join(f"{result_key(row)}\n" for row in rows))
+            f.flush()
+            os.fsync(f.fileno())
+
+        return len(rows)
+
+    def import_csv(self, csv_path):
+        """
+        기존 결과 CSV를 저널로 가져오기 (저널이 없을 때 한 번만, 이전 버전 결과 이어서 사용)
+
+        Returns:
+            int: 가져온 행 수
+        """
+        if os.path.exists(self.path) or not os.path.exists(csv_path):
+            return 0
+        rows = pd.read_csv(csv_path).to_dict('records')
+        self.append(rows)
+        logger.info(f"기존 분석 결과 가져오기: {csv_path} -> {self.path} ({len(rows)}개 항목)")
+        return len(rows)
+
+    def compact(self, csv_path):
+        """
+        저널을 중복 제거(같은 키는 마지막 결과 유지)하여 CSV로 저장하고 저널/인덱스도 정리
+
+        Args:
+            csv_path: 저장할 CSV 파일 경로
+
+        Returns:
+            int: 저장한 행 수
+        """
+        rows = {}
+        for row in self.iter_rows():
+            rows[result_key(row)] = row
+        if not rows:
+            return 0
+
+        directory = os.path.dirname(csv_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{csv_path}.tmp"
+        pd.DataFrame(list(rows.values())).to_csv(temp_path, index=False, encoding='utf-8-sig')
+        os.replace(temp_path, csv_path)
+
+        self._write_atomic(self.path, "".join(
+            json.dumps(row, ensure_ascii=False, default=_json_default) + "\n" for row in rows.values()))
+        self._write_atomic(self.index_path, "".join(f"{key}\n" for key in rows))
+
+        logger.info(f"결과 압축 저장 완료: {csv_path} ({len(rows)}개 항목)")
+        return len(rows)
+
+    @staticmethod
+    def _write_atomic(path, content):
+        """임시 파일에 쓴 뒤 교체"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
@@ -0,0 +1,251 @@
+"""
+리뷰 유사 중복 탐지 (MinHash + LSH)
+- 공백/문장부호를 제거한 리뷰의 글자 n-gram(shingle) 집합으로 비교 (형태 변화가 많은 한국어 리뷰에 맞춤)
+- shingle은 실행마다 같은 값이 나오는 crc32로 해시 (군집과 절감량이 실행마다 같음)
+- 정규화 후 shingle 길이보다 짧은 리뷰(이모지/문장부호만 있는 리뷰 등)는 군집화하지 않음 (분석 비용이 작고 결과 복사가 부정확)
+- MinHash 서명을 numpy로 일괄 계산하고 LSH 밴드별 버킷으로 후보 쌍만 찾아 서명 일치율로 검증 (거의 선형 시간)
+- 검증된 쌍을 Union-Find로 묶어 유사 중복 군집 구성, 군집마다 대표 리뷰 1개만 분석하고 결과를 나머지에 복사
+- 리뷰 출처(저장소의 도서 또는 리뷰 파일)를 하나씩 읽어 리뷰번호/리뷰내용 컬럼만 로드하고 서명으로 바로 변환
+  (전체 리뷰 텍스트를 한 번에 메모리에 올리지 않고 리뷰 키와 서명만 유지), 분석 절감량 보고
+"""
+
+import re
+import time
+import zlib
+import logging
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# MinHash 해시 함수 (a * x + b) mod p 의 소수 (a, b를 p 범위 전체에서 뽑아 곱셈이 64비트에서 순환하도록 함)
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize_for_shingles(text):
+    """shingle용 텍스트 정규화 (유니코드 NFC, 소문자, 공백/문장부호 제거)"""
+    text = unicodedata.normalize('NFC', str(text)).lower()
+    return re.sub(r'[\W_]+', '', text)
+
+
+class MinHashDeduper:
+    """MinHash/LSH 기반 유사 중복 리뷰 군집화"""
+
+    def __init__(self, num_perm=64, bands=16, shingle_size=3, threshold=0.8, seed=42):
+        """
+        Args:
+            num_perm: MinHash 서명 길이 (bands로 나누어떨어져야 함)
+            bands: LSH 밴드 수 (밴드가 많을수록 후보를 넓게 찾음)
+            shingle_size: 글자 n-gram 길이
+            threshold: 유사 중복으로 판단할 최소 자카드 유사도 추정치 (서명 일치율)
+            seed: 해시 함수 난수 시드
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm})은 bands({bands})로 나누어떨어져야 합니다.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def is_eligible(self, normalized_text):
+        """군집화 대상인지 확인 (정규화한 텍스트로 shingle을 1개 이상 만들 수 있어야 함)"""
+        return len(normalized_text) >= self.shingle_size
+
+    def shingle_hashes(self, texts):
+        """
+        리뷰별 shingle 해시 (crc32, 프로세스와 무관하게 같은 값)
+
+        Args:
+            texts: 정규화한 리뷰 텍스트 리스트 (모두 군집화 대상)
+
+        Returns:
+            tuple: (모든 리뷰의 shingle 해시 배열, 리뷰별 시작 위치 배열)
+        """
+        k = self.shingle_size
+        hashes = []
+        offsets = np.zeros(len(texts), dtype=np.int64)
+        for i, text in enumerate(texts):
+            offsets[i] = len(hashes)
+            hashes.extend({zlib.crc32(text[j:j+k].encode('utf-8')) for j in range(len(text) - k + 1)})
+        return np.array(hashes, dtype=np.uint64), offsets
+
+    def signatures(self, texts):
+        """
+        MinHash 서명 일괄 계산 (해시 함수마다 전체 shingle 배열에 한 번씩 적용 후 리뷰 구간별 최솟값)
+
+        Args:
+            texts: 정규화한 리뷰 텍스트 리스트 (모두 군집화 대상)
+
+        Returns:
+            ndarray: (리뷰 수, num_perm) 서명
+        """
+        hashes, offsets = self.shingle_hashes(texts)
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint64)
+        if not len(texts):
+            return signatures
+        for i in range(self.num_perm):
+            values = (self.a[i] * hashes + self.b[i]) % np.uint64(_MERSENNE_PRIME)
+            signatures[:, i] = np.minimum.reduceat(values, offsets)
+        return signatures
+
+    def candidate_pairs(self, signatures):
+        """
+        LSH 밴드별로 서명이 같은 리뷰를 같은 버킷에 넣고, 버킷의 첫 리뷰와 나머지 리뷰를 후보 쌍으로 반환
+
+        Returns:
+            ndarray: (쌍 수, 2) 리뷰 인덱스 쌍 (중복 제거)
+        """
+        n = len(signatures)
+        pairs = []
+        for band in range(self.bands):
+            block = np.ascontiguousarray(signatures[:, band * self.rows:(band + 1) * self.rows])
+            keys = block.view(np.dtype((np.void, block.dtype.itemsize * self.rows))).ravel()
+            _, bucket = np.unique(keys, return_inverse=True)
+            order = np.lexsort((np.arange(n), bucket))
+            sorted_bucket = bucket[order]
+            starts = np.flatnonzero(np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1]])
+            heads = order[starts][np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, n]))]
+            members = order
+            mask = heads != members
+            pairs.append(np.stack([heads[mask], members[mask]], axis=1))
+        if not pairs:
+            return np.empty((0, 2), dtype=np.int64)
+        return np.unique(np.concatenate(pairs), axis=0)
+
+    def eligible_signatures(self, texts):
+        """
+        군집화 대상 리뷰만 골라 MinHash 서명 계산
+
+        Args:
+            texts: 리뷰 텍스트 리스트
+
+        Returns:
+            tuple: (군집화 대상 리뷰 인덱스 배열, (대상 리뷰 수, num_perm) 서명)
+        """
+        normalized = [normalize_for_shingles(text) for text in texts]
+        eligible = np.array([i for i, text in enumerate(normalized) if self.is_eligible(text)], dtype=np.int64)
+        return eligible, self.signatures([normalized[i] for i in eligible])
+
+    def cluster(self, texts):
+        """
+        유사 중복 군집화
+
+        Args:
+            texts: 리뷰 텍스트 리스트
+
+        Returns:
+            ndarray: 리뷰별 대표 리뷰 인덱스 (군집에서 가장 앞선 리뷰, 중복이 없거나 군집화 대상이 아니면 자기 자신)
+        """
+        eligible, signatures = self.eligible_signatures(texts)
+        representatives = np.arange(len(texts))
+        if len(eligible):
+            representatives[eligible] = eligible[self.cluster_signatures(signatures)]
+        return representatives
+
+    def cluster_signatures(self, signatures):
+        """
+        MinHash 서명으로 유사 중복 군집화
+
+        Args:
+            signatures: (리뷰 수, num_perm) 서명
+
+        Returns:
+            ndarray: 리뷰별 대표 리뷰 인덱스 (서명 배열 기준)
+        """
+        n = len(signatures)
+        pairs = self.candidate_pairs(signatures)
+
+        # 후보 쌍 검증: 서명 일치율(자카드 유사도 추정치)이 기준 이상인 쌍만 연결
+        if len(pairs):
+            similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+            pairs = pairs[similarity >= self.threshold]
+
+        parent = np.arange(n)
+
+        def find(i):
+            root = i
+            while parent[root] != root:
+                root = parent[root]
+            while parent[i] != root:
+                parent[i], i = root, parent[i]
+            return root
+
+        for left, right in pairs.tolist():
+            root_left, root_right = find(left), find(right)
+            if root_left != root_right:
+                # 더 앞선 리뷰를 대표로
+                parent[max(root_left, root_right)] = min(root_left, root_right)
+
+        return np.array([find(i) for i in range(n)], dtype=np.int64)
+
+    def find_duplicates(self, frames, key_columns=('도서코드', '리뷰번호'), text_column='리뷰내용'):
+        """
+        리뷰 목록의 유사 중복 군집 탐색 (DataFrame을 하나씩 서명으로 변환하고 리뷰 키와 서명만 유지)
+
+        Args:
+            frames: 리뷰 DataFrame 또는 DataFrame 이터러블 (예: iter_dedupe_frames 결과)
+            key_columns: 리뷰를 구분하는 컬럼
+            text_column: 리뷰 텍스트 컬럼
+
+        Returns:
+            tuple: (리뷰 키 -> 대표 리뷰 키 dict (2개 이상인 군집의 리뷰만), 통계 dict)
+        """
+        started = time.time()
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+
+        total = 0
+        keys = []
+        signature_blocks = []
+        for reviews in frames:
+            reviews = reviews.dropna(subset=[text_column])
+            reviews = reviews[reviews[text_column].astype(str).str.strip() != '']
+            total += len(reviews)
+            eligible, signatures = self.eligible_signatures(reviews[text_column].tolist())
+            frame_keys = list(zip(*[reviews[column].astype(str) for column in key_columns]))
+            keys.extend(frame_keys[i] for i in eligible)
+            signature_blocks.append(signatures)
+
+        # 군집화 대상이 아닌 리뷰는 항상 자기 자신이 대표이므로 대상 리뷰의 서명만으로 군집화
+        signatures = np.concatenate(signature_blocks) if signature_blocks else np.empty((0, self.num_perm), dtype=np.uint64)
+        representatives = self.cluster_signatures(signatures)
+
+        sizes = np.bincount(representatives, minlength=len(keys))
+        duplicated = sizes[representatives] > 1
+        clusters = {keys[i]: keys[representatives[i]] for i in np.flatnonzero(duplicated)}
+
+        stats = {
+            'reviews': total,
+            'clusters': int((sizes > 1).sum()),
+            'duplicates': int(duplicated.sum() - (sizes > 1).sum()),
+            'seconds': round(time.time() - started, 2),
+        }
+        stats['saving_ratio'] = round(stats['duplicates'] / stats['reviews'], 4) if stats['reviews'] else 0.0
+        logger.info(f"유사 중복 리뷰 탐지: 리뷰 {stats['reviews']}개 중 {stats['clusters']}개 군집, "
+                    f"분석 생략 가능 {stats['duplicates']}개 ({stats['saving_ratio']:.1%}), {stats['seconds']}초")
+        return clusters, stats
+
+
+def iter_dedupe_frames(sources):
+    """
+    유사 중복 탐지 대상 리뷰(도서코드, 리뷰번호, 리뷰내용)를 출처별로 로드 (필요한 컬럼만 읽음)
+
+    Args:
+        sources: KyoboReviewAnalyzer.iter_review_frames 결과 리스트
+
+    Yields:
+        DataFrame: 도서코드, 리뷰번호, 리뷰내용 컬럼
+    """
+    for _, book_code, load_reviews in sources:
+        if not book_code:
+            continue
+        df = load_reviews(columns=['리뷰번호', '리뷰내용'])
+        if '리뷰번호' in df.columns and '리뷰내용' in df.columns:
+            yield df[['리뷰번호', '리뷰내용']].assign(도서코드=book_code)
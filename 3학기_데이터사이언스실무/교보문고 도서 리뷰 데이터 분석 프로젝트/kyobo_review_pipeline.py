@@ -0,0 +1,145 @@
+"""
+제너레이터 기반 스트리밍 파이프라인 도구
+- prefetch: 앞 단계 제너레이터를 별도 스레드에서 실행하고 크기 제한 큐로 연결 (파일 읽기 등 I/O 단계)
+- ordered_map: 프로세스/스레드 풀에 최대 N개 작업만 넘기고 결과는 입력 순서대로 반환 (CPU 단계)
+- ThreadedSink: 마지막 저장 단계를 별도 스레드에서 실행, 쌓인 항목은 묶어서 한 번에 저장 (I/O 단계)
+- 각 단계 사이에 쌓이는 항목 수가 제한되어 입력 파일 수와 무관하게 메모리 사용량이 일정
+"""
+
+import queue
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# 제너레이터 종료 표시
+_DONE = object()
+
+
+def prefetch(iterable, maxsize=4):
+    """
+    앞 단계를 백그라운드 스레드에서 미리 실행 (큐가 가득 차면 앞 단계가 대기)
+
+    Args:
+        iterable: 앞 단계 제너레이터
+        maxsize: 미리 준비해 둘 최대 항목 수
+
+    Yields:
+        앞 단계 항목 (앞 단계에서 발생한 예외는 소비하는 쪽에서 다시 발생)
+    """
+    items = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(entry):
+        """큐에 넣기 (소비하는 쪽이 멈췄으면 False)"""
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except Exception as e:
+            put((_DONE, e))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        # 소비하는 쪽이 중간에 멈추면 앞 단계 스레드도 종료
+        stop.set()
+
+
+def ordered_map(func, iterable, executor, max_pending=4):
+    """
+    풀에서 작업을 병렬 실행하되 동시에 넘기는 작업 수를 제한하고 결과는 입력 순서대로 반환
+
+    Args:
+        func: 작업 함수 (프로세스 풀이면 모듈 최상위 함수)
+        iterable: 작업 입력 제너레이터
+        executor: concurrent.futures 풀
+        max_pending: 동시에 진행 중인 최대 작업 수
+
+    Yields:
+        func 결과
+    """
+    pending = deque()
+    for item in iterable:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class ThreadedSink:
+    """
+    마지막(저장) 단계를 백그라운드 스레드에서 실행 - 그동안 쌓인 항목은 한 번에 묶어서 처리
+    (큐가 가득 차면 put이 대기하여 저장이 분석보다 느려도 메모리가 늘지 않음)
+    """
+
+    def __init__(self, func, maxsize=16):
+        """
+        Args:
+            func: 항목 리스트를 받아 저장하는 함수
+            maxsize: 저장 대기 최대 항목 수
+        """
+        self.func = func
+        self.items = queue.Queue(maxsize=maxsize)
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        done = False
+        while not done:
+            batch = [self.items.get()]
+            while True:
+                try:
+                    batch.append(self.items.get_nowait())
+                except queue.Empty:
+                    break
+            if _DONE in batch:
+                done = True
+                batch = [item for item in batch if item is not _DONE]
+            if batch and self.error is None:
+                try:
+                    self.func(batch)
+                except Exception as e:
+                    logger.error(f"저장 단계 오류: {str(e)}")
+                    self.error = e
+
+    def put(self, item):
+        """저장할 항목 추가 (저장 단계에서 오류가 있었으면 발생)"""
+        if self.error is not None:
+            raise self.error
+        self.items.put(item)
+
+    def close(self):
+        """남은 항목을 모두 저장할 때까지 대기"""
+        if self.thread.is_alive():
+            self.items.put(_DONE)
+            self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
@@ -0,0 +1,219 @@
+"""
+교보문고 리뷰 통합 저장소 (SQLite)
+- 도서별/실행별 CSV(교보_<도서코드>_리뷰_<timestamp>.csv) 대신 하나의 테이블에 모든 리뷰 저장
+- (도서코드, 리뷰번호) 기본 키로 중복 제거 upsert, 같은 리뷰를 다시 수집하면 내용만 갱신
+- WITHOUT ROWID 테이블로 기본 키 순서대로 저장되어 도서별 조회가 인덱스 범위 스캔으로 처리됨
+- 도서코드/작성일시 조건과 필요한 컬럼만 SQL로 조회 (파일 전체를 읽지 않음)
+- 기존 CSV 디렉토리를 한 번에 가져오는 마이그레이션 함수 제공
+"""
+
+import os
+import re
+import glob
+import time
+import sqlite3
+import logging
+import threading
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 기본 저장소 경로
+DEFAULT_STORE_PATH = "homework/data/kyobo_reviews.db"
+
+# 저장 컬럼 (scrap_review / 비동기 수집기 CSV와 동일한 컬럼명)
+REVIEW_COLUMNS = ['리뷰번호', '회원ID', '작성일시', '평점', '리뷰내용', '감정키워드']
+
+
+def _sql_value(value):
+    """DataFrame 값을 SQLite에 넣을 수 있는 값으로 변환 (결측치 -> None, numpy 스칼라 -> 파이썬 값)"""
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+class ReviewStore:
+    """SQLite 기반 리뷰 통합 저장소"""
+
+    def __init__(self, db_path=DEFAULT_STORE_PATH):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS reviews (
+                "도서코드" TEXT NOT NULL,
+                "리뷰번호" INTEGER NOT NULL,
+                "회원ID" TEXT,
+                "작성일시" TEXT,
+                "평점" REAL,
+                "리뷰내용" TEXT,
+                "감정키워드" TEXT,
+                "수집시각" REAL NOT NULL,
+                PRIMARY KEY ("도서코드", "리뷰번호")
+            ) WITHOUT ROWID
+        """)
+        self.conn.commit()
+
+    def upsert(self, book_code, reviews):
+        """
+        리뷰 저장 - 이미 있는 (도서코드, 리뷰번호)는 내용만 갱신
+
+        Args:
+            book_code: 도서코드
+            reviews: 리뷰 dict 리스트 또는 DataFrame
+
+        Returns:
+            int: 새로 추가된 리뷰 수
+        """
+        records = reviews.to_dict('records') if isinstance(reviews, pd.DataFrame) else list(reviews)
+        now = time.time()
+        rows = []
+        for review in records:
+            if _sql_value(review.get('리뷰번호')) is None:
+                continue
+            rows.append([str(book_code)] + [_sql_value(review.get(column)) for column in REVIEW_COLUMNS] + [now])
+
+        with self.lock:
+            before = self.conn.execute('SELECT COUNT(*) FROM reviews WHERE "도서코드" = ?', (str(book_code),)).fetchone()[0]
+            self.conn.executemany("""
+                INSERT INTO reviews ("도서코드", "리뷰번호", "회원ID", "작성일시", "평점", "리뷰내용", "감정키워드", "수집시각")
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT("도서코드", "리뷰번호") DO UPDATE SET
+                    "회원ID" = excluded."회원ID",
+                    "작성일시" = excluded."작성일시",
+                    "평점" = excluded."평점",
+                    "리뷰내용" = excluded."리뷰내용",
+                    "감정키워드" = COALESCE(excluded."감정키워드", reviews."감정키워드"),
+                    "수집시각" = excluded."수집시각"
+            """, rows)
+            self.conn.commit()
+            after = self.conn.execute('SELECT COUNT(*) FROM reviews WHERE "도서코드" = ?', (str(book_code),)).fetchone()[0]
+
+        return after - before
+
+    def count(self, book_code=None):
+        """저장된 리뷰 수 (도서코드를 지정하면 해당 도서만)"""
+        with self.lock:
+            if book_code is None:
+                return self.conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+            return self.conn.execute('SELECT COUNT(*) FROM reviews WHERE "도서코드" = ?', (str(book_code),)).fetchone()[0]
+
+    def book_codes(self):
+        """저장된 도서코드 목록"""
+        with self.lock:
+            return [row[0] for row in self.conn.execute('SELECT DISTINCT "도서코드" FROM reviews ORDER BY "도서코드"')]
+
+    def latest_key(self, book_code):
+        """
+        도서별 최신 리뷰 키 (증분 수집 기준점)
+
+        Returns:
+            tuple 또는 None: (작성일시, 리뷰번호), 저장된 리뷰가 없으면 None
+        """
+        with self.lock:
+            row = self.conn.execute("""
+                SELECT COALESCE("작성일시", ''), "리뷰번호" FROM reviews WHERE "도서코드" = ?
+                ORDER BY "작성일시" DESC, "리뷰번호" DESC LIMIT 1
+            """, (str(book_code),)).fetchone()
+        return None if row is None else (row[0], int(row[1]))
+
+    def load(self, book_codes=None, columns=None, since=None, until=None):
+        """
+        조건에 맞는 리뷰만 조회 (필터와 컬럼 선택을 SQL에서 처리)
+
+        Args:
+            book_codes: 조회할 도서코드 리스트 (None이면 전체)
+            columns: 조회할 컬럼 리스트 (None이면 도서코드 + 전체 리뷰 컬럼)
+            since: 작성일시 하한 (이상)
+            until: 작성일시 상한 (미만)
+
+        Returns:
+            DataFrame: 리뷰 데이터
+        """
+        columns = columns or ['도서코드'] + REVIEW_COLUMNS
+        for column in columns:
+            if column not in ['도서코드', '수집시각'] + REVIEW_COLUMNS:
+                raise ValueError(f"알 수 없는 컬럼: {column}")
+
+        query = "SELECT " + ", ".join(f'"{column}"' for column in columns) + " FROM reviews WHERE 1 = 1"
+        params = []
+        if book_codes is not None:
+            book_codes = [str(code) for code in book_codes]
+            query += ' AND "도서코드" IN (' + ", ".join("?" * len(book_codes)) + ")"
+            params.extend(book_codes)
+        if since is not None:
+            query += ' AND "작성일시" >= ?'
+            params.append(str(since))
+        if until is not None:
+            query += ' AND "작성일시" < ?'
+            params.append(str(until))
+        query += ' ORDER BY "도서코드", "작성일시" DESC, "리뷰번호" DESC'
+
+        with self.lock:
+            return pd.read_sql_query(query, self.conn, params=params)
+
+    def import_csv(self, file_path, book_code=None):
+        """
+        리뷰 CSV 파일 1개 가져오기 (도서코드를 주지 않으면 파일명에서 추출)
+
+        Returns:
+            int: 새로 추가된 리뷰 수
+        """
+        if book_code is None:
+            match = re.search(r'교보_([A-Za-z0-9]+)_리뷰', os.path.basename(file_path))
+            if not match:
+                logger.warning(f"파일명에서 도서코드를 추출할 수 없음: {file_path}")
+                return 0
+            book_code = match.group(1)
+
+        # 파일마다 컬럼 순서가 다를 수 있으므로 컬럼명 기준으로 맞춤 (없는 컬럼은 빈 값)
+        df = pd.read_csv(file_path, encoding='utf-8-sig').reindex(columns=REVIEW_COLUMNS)
+        return self.upsert(book_code, df)
+
+    def import_csv_dir(self, reviews_dir):
+        """
+        기존 리뷰 CSV 디렉토리 전체 가져오기 (같은 도서의 여러 실행 결과는 중복 제거되어 합쳐짐)
+
+        Returns:
+            int: 새로 추가된 리뷰 수
+        """
+        files = sorted(glob.glob(os.path.join(reviews_dir, "교보_*_리뷰_*.csv")))
+        added = 0
+        for file_path in files:
+            try:
+                added += self.import_csv(file_path)
+            except Exception as e:
+                logger.error(f"리뷰 파일 가져오기 실패: {file_path} - {str(e)}")
+
+        self.vacuum()
+        logger.info(f"리뷰 파일 {len(files)}개 가져오기 완료: 신규 {added}개, 전체 {self.count()}개")
+        return added
+
+    def vacuum(self):
+        """대량 입력 후 DB 파일 재정리 (빈 페이지 제거)"""
+        with self.lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.execute("VACUUM")
+
+    def close(self):
+        """DB 연결 종료"""
+        with self.lock:
+            self.conn.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = ReviewStore()
+    store.import_csv_dir("homework/data/kyobo_reviews")
+    store.close()
@@ -0,0 +1,111 @@
+"""
+감성분석 결과 캐시 (SQLite, 내용 주소 방식)
+- 정규화한 리뷰 텍스트 + 모델 + 프롬프트 버전의 해시를 키로 감성분석 결과 저장
+- 파일명/리뷰번호와 무관하게 같은 리뷰 텍스트는 다시 API를 호출하지 않음
+  (재수집으로 파일명이 바뀐 경우, 여러 도서에 같은 리뷰가 있는 경우 포함)
+- 프롬프트나 모델이 바뀌면 키가 달라져 자동으로 새로 분석
+- 조회 적중률 집계, 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+"""
+
+import re
+import json
+import time
+import hashlib
+import logging
+import unicodedata
+
+from kyobo_sqlite_lru import LRUTable
+
+logger = logging.getLogger(__name__)
+
+# 기본 캐시 경로
+DEFAULT_SENTIMENT_CACHE_PATH = "homework/data/kyobo_sentiment_cache.db"
+
+
+def normalize_review_text(text):
+    """캐시 키용 리뷰 텍스트 정규화 (유니코드 NFC, 연속 공백 하나로, 앞뒤 공백 제거)"""
+    text = unicodedata.normalize('NFC', str(text))
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class SentimentCache:
+    """크기 제한이 있는 감성분석 결과 캐시"""
+
+    def __init__(self, db_path=DEFAULT_SENTIMENT_CACHE_PATH, max_bytes=50 * 1024 * 1024):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+            max_bytes: 저장 결과 전체 크기 상한(바이트)
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.stats = {'hit': 0, 'miss': 0}
+        self.table = LRUTable(db_path, 'sentiments', [
+            "model TEXT NOT NULL",
+            "prompt_version TEXT NOT NULL",
+            "result TEXT NOT NULL",
+            "created_at REAL NOT NULL",
+        ], max_bytes, label='감성분석 캐시')
+
+    @staticmethod
+    def make_key(text, model, prompt_version):
+        """정규화한 리뷰 텍스트, 모델, 프롬프트 버전으로 캐시 키 생성"""
+        raw = json.dumps([model, prompt_version, normalize_review_text(text)], ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, text, model, prompt_version):
+        """
+        감성분석 결과 조회 (조회 시 마지막 사용 시각 갱신)
+
+        Returns:
+            dict 또는 None: 캐시된 감성분석 결과
+        """
+        row = self.table.get(self.make_key(text, model, prompt_version), 'result')
+        if row is None:
+            self.stats['miss'] += 1
+            return None
+        self.stats['hit'] += 1
+        return json.loads(row['result'])
+
+    def put(self, text, model, prompt_version, result):
+        """감성분석 결과 저장 후 크기 상한을 넘으면 오래된 항목 삭제"""
+        self.put_many([(text, result)], model, prompt_version)
+
+    def put_many(self, items, model, prompt_version):
+        """
+        여러 감성분석 결과를 한 트랜잭션으로 저장
+
+        Args:
+            items: (리뷰 텍스트, 감성분석 결과) 튜플 리스트
+            model: 모델 이름
+            prompt_version: 프롬프트 버전
+        """
+        now = time.time()
+        rows = []
+        for text, result in items:
+            body = json.dumps(result, ensure_ascii=False)
+            rows.append({
+                'key': self.make_key(text, model, prompt_version),
+                'model': model,
+                'prompt_version': prompt_version,
+                'result': body,
+                'created_at': now,
+                'size': len(body.encode('utf-8')),
+            })
+        self.table.put_many(rows)
+
+    @property
+    def hit_rate(self):
+        """이번 실행의 조회 적중률 (조회가 없으면 0)"""
+        total = self.stats['hit'] + self.stats['miss']
+        return self.stats['hit'] / total if total else 0.0
+
+    def log_summary(self):
+        """적중률과 저장 항목 수를 로그로 출력"""
+        count = self.table.count()
+        logger.info(f"감성분석 캐시: 적중 {self.stats['hit']}건, 미적중 {self.stats['miss']}건 "
+                    f"(적중률 {self.hit_rate:.1%}), 저장 항목 {count}개")
+
+    def close(self):
+        """DB 연결 종료"""
+        self.table.close()
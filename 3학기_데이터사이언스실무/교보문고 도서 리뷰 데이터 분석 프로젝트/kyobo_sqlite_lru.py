@@ -0,0 +1,131 @@
+"""
+크기 제한이 있는 SQLite 키-값 테이블 (응답 캐시, 감성분석 결과 캐시 공통)
+- key(기본 키), 마지막 사용 시각(last_access), 항목 크기(size) 컬럼을 공통으로 두고 값 컬럼은 사용하는 쪽에서 정의
+- 조회 시 마지막 사용 시각 갱신, 저장 후 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- 여러 스레드에서 같은 연결을 잠금으로 보호해 사용
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class LRUTable:
+    """크기 제한(LRU 삭제)이 있는 SQLite 테이블"""
+
+    def __init__(self, db_path, table, columns, max_bytes, label='캐시'):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+            table: 테이블 이름
+            columns: 공통 컬럼(key, last_access, size) 외 값 컬럼 정의 리스트 (예: "body TEXT NOT NULL")
+            max_bytes: 항목 크기(size) 합계 상한(바이트)
+            label: 로그에 표시할 이름
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.table = table
+        self.max_bytes = max_bytes
+        self.label = label
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                {", ".join(columns)},
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_access ON {table} (last_access)")
+        self.conn.commit()
+
+    def get(self, key, fields='*'):
+        """
+        항목 조회 (조회 시 마지막 사용 시각 갱신)
+
+        Args:
+            key: 항목 키
+            fields: 조회할 컬럼 (SELECT 절)
+
+        Returns:
+            sqlite3.Row 또는 None: 조회한 행
+        """
+        with self.lock:
+            row = self.conn.execute(f"SELECT {fields} FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        return row
+
+    def touch(self, key, **values):
+        """마지막 사용 시각과 지정한 값 컬럼 갱신"""
+        values['last_access'] = time.time()
+        assignments = ", ".join(f"{column} = ?" for column in values)
+        with self.lock:
+            self.conn.execute(f"UPDATE {self.table} SET {assignments} WHERE key = ?", (*values.values(), key))
+            self.conn.commit()
+
+    def put_many(self, rows):
+        """
+        여러 항목을 한 트랜잭션으로 저장(같은 키는 교체) 후 크기 상한을 넘으면 오래된 항목 삭제
+
+        Args:
+            rows: 컬럼 이름 -> 값 dict 리스트 (key, size와 값 컬럼 포함, 모두 같은 컬럼)
+        """
+        if not rows:
+            return
+        now = time.time()
+        columns = list(rows[0]) + ['last_access']
+        with self.lock:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [(*row.values(), now) for row in rows])
+            self.conn.commit()
+        self.evict()
+
+    def evict(self):
+        """
+        전체 크기가 max_bytes 이하가 될 때까지 가장 오래 사용하지 않은 항목 삭제
+
+        Returns:
+            int: 삭제한 항목 수
+        """
+        with self.lock:
+            total = self.conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+
+            expired = []
+            for key, size in self.conn.execute(f"SELECT key, size FROM {self.table} ORDER BY last_access"):
+                if total <= self.max_bytes:
+                    break
+                expired.append((key,))
+                total -= size
+
+            self.conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", expired)
+            self.conn.commit()
+
+        logger.info(f"{self.label} 크기 상한 초과로 {len(expired)}개 항목 삭제")
+        return len(expired)
+
+    def count(self):
+        """저장 항목 수"""
+        with self.lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def close(self):
+        """DB 연결 종료"""
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,25 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+# 프로젝트 디렉토리의 모듈을 테스트에서 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_analyzer(tmp_path, monkeypatch):
+    """대역 LLM 서버를 사용하는 분석기 생성 (모듈 import 시 만드는 로그 파일과 결과 파일은 임시 디렉토리에 생성)"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    analysis = importlib.import_module('kyobo_book_analysis')
+    from kyobo_llm_scheduler import LLMScheduler
+
+    def make(server, max_retries=1, **kwargs):
+        analyzer = analysis.KyoboReviewAnalyzer('reviews', 'books.csv', 'result.csv', base_url=server.base_url,
+                                                **kwargs)
+        analyzer.scheduler = LLMScheduler(max_retries=max_retries, backoff_base=0.01, backoff_max=0.01)
+        return analyzer
+
+    return make
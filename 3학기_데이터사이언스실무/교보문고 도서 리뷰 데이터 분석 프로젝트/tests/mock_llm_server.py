@@ -0,0 +1,72 @@
+"""OpenAI 호환 chat completions 대역 서버 (테스트용, 별도 스레드의 이벤트 루프에서 실행)"""
+
+import asyncio
+import json
+import re
+import threading
+
+from aiohttp import web
+
+# 배치 프롬프트에 담긴 리뷰 목록 (json.dumps 결과는 한 줄)
+_REVIEWS_PATTERN = re.compile(r'^\s*(\[\{"id": .*\])\s*$', re.M)
+
+
+def sentiment_item(review_id, sentiment='긍정'):
+    """정상 응답 항목 1개"""
+    return {'id': review_id, 'sentiment': sentiment, 'score': 0.8, 'keywords': ['재미'], 'summary': '요약'}
+
+
+class MockLLMServer:
+    """
+    요청마다 respond(리뷰 목록)를 호출해 응답하는 대역 서버
+
+    respond 반환값: 응답 본문 문자열 또는 오류 상태 코드(int)
+    리뷰 목록: 배치 프롬프트면 [{"id", "review"}, ...], 리뷰 1개 프롬프트면 None
+    """
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.requests = []
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.runner = None
+        self.base_url = None
+
+    async def handle(self, request):
+        body = await request.json()
+        match = _REVIEWS_PATTERN.search(body['messages'][-1]['content'])
+        reviews = json.loads(match.group(1)) if match else None
+        self.requests.append(reviews)
+
+        result = self.respond(reviews)
+        if isinstance(result, int):
+            return web.json_response({'error': {'message': f'mock error {result}', 'type': 'mock'}}, status=result)
+        return web.json_response({
+            'id': f'chatcmpl-{len(self.requests)}',
+            'object': 'chat.completion',
+            'created': 0,
+            'model': body['model'],
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': result}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+        })
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post('/v1/chat/completions', self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        return site._server.sockets[0].getsockname()[1]
+
+    def __enter__(self):
+        self.thread.start()
+        port = asyncio.run_coroutine_threadsafe(self.start(), self.loop).result()
+        self.base_url = f"http://127.0.0.1:{port}/v1"
+        return self
+
+    def __exit__(self, *exc_info):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
@@ -0,0 +1,27 @@
+"""크롤링 상태 저장소 완료 작업 유효 기간 테스트"""
+
+import time
+
+from kyobo_crawl_ledger import CrawlLedger
+
+
+def test_done_items_expire_after_max_age(tmp_path):
+    ledger = CrawlLedger(str(tmp_path / 'state.db'), max_attempts=2, max_age=60)
+    ledger.mark_done('page', 'url', result=['a'])
+    now = time.time()
+
+    assert not ledger.should_fetch('page', 'url', now=now)
+    assert ledger.done_result('page', 'url') == ['a']
+    assert ledger.should_fetch('page', 'url', now=now + 61)
+
+    # 만료 후 다시 수행하다 실패하면 시도 횟수를 처음부터 셈
+    assert ledger.mark_failure('page', 'url', '오류') == 1
+    ledger.close()
+
+
+def test_done_items_never_expire_without_max_age(tmp_path):
+    ledger = CrawlLedger(str(tmp_path / 'state.db'), max_age=None)
+    ledger.mark_done('book', 'url', result=['a'])
+
+    assert not ledger.should_fetch('book', 'url', now=time.time() + 365 * 24 * 3600)
+    ledger.close()
@@ -0,0 +1,41 @@
+"""드라이버 풀 워커 오류 처리 테스트 (브라우저 대신 가짜 스크래퍼 사용)"""
+
+from kyobo_driver_pool import DriverPool
+
+
+class FakeDriver:
+    def quit(self):
+        pass
+
+
+class FlakyScraper:
+    """페이지마다 결과를 반환하지만 드라이버 재생성은 항상 실패하는 스크래퍼"""
+
+    def __init__(self):
+        self.driver = FakeDriver()
+        self.pages_loaded = 0
+
+    def restart_driver_if_needed(self):
+        if self.driver is None:
+            self.driver = FakeDriver()
+
+    def initialize_driver(self):
+        raise RuntimeError("브라우저 시작 실패")
+
+    def get_book_info(self, book_url):
+        self.pages_loaded += 1
+        if book_url.endswith('bad'):
+            raise ValueError("추출 실패")
+        return "제목", book_url, 1
+
+
+def test_recycle_failure_keeps_workers_alive():
+    pool = DriverPool(FlakyScraper, size=2, page_budget=1, delay=(0, 0))
+    try:
+        urls = [f"https://example.com/{i}" for i in range(6)] + ["https://example.com/bad"]
+        results = pool.map(urls)
+        assert results[:6] == [("제목", url, 1) for url in urls[:6]]
+        assert results[6] == ("오류", urls[6], 0)
+        assert all(worker.is_alive() for worker in pool.workers)
+    finally:
+        pool.close()
@@ -0,0 +1,123 @@
+"""LLM 호출 스케줄러 한도 대기/재시도/순서 보존 테스트"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+import kyobo_llm_scheduler
+from kyobo_llm_scheduler import LLMScheduler
+
+
+@pytest.fixture(autouse=True)
+def short_window(monkeypatch):
+    """60초 한도 구간을 테스트용으로 짧게"""
+    monkeypatch.setattr(kyobo_llm_scheduler, 'WINDOW_SECONDS', 0.3)
+
+
+def status_error(status, retry_after=None):
+    """상태 코드(와 Retry-After 헤더)가 있는 openai 오류"""
+    headers = {'retry-after': str(retry_after)} if retry_after is not None else {}
+    response = SimpleNamespace(status_code=status, headers=headers, request=None)
+    error_class = openai.RateLimitError if status == 429 else openai.BadRequestError
+    return error_class(f"HTTP {status}", response=response, body=None)
+
+
+def test_acquire_waits_for_rpm_window():
+    scheduler = LLMScheduler(rpm=2)
+    started = time.monotonic()
+    for _ in range(3):
+        scheduler.acquire(1)
+
+    assert time.monotonic() - started >= 0.25
+    assert scheduler.stats['requests'] == 3
+
+
+def test_acquire_waits_for_tpm_window():
+    scheduler = LLMScheduler(tpm=100)
+    scheduler.acquire(60)
+    started = time.monotonic()
+    scheduler.acquire(60)
+
+    assert time.monotonic() - started >= 0.25
+
+
+def test_retry_after_pauses_every_worker():
+    scheduler = LLMScheduler(backoff_base=0.01)
+    failed = threading.Event()
+    times = {}
+
+    def flaky():
+        if not failed.is_set():
+            times['failed'] = time.monotonic()
+            failed.set()
+            raise status_error(429, retry_after=0.3)
+        return 'ok'
+
+    def other_worker():
+        failed.wait()
+        scheduler.acquire(1)
+        times['other'] = time.monotonic()
+
+    thread = threading.Thread(target=other_worker)
+    thread.start()
+    assert scheduler.call(flaky) == 'ok'
+    thread.join()
+
+    assert times['other'] - times['failed'] >= 0.25
+    assert (scheduler.stats['retries'], scheduler.stats['rate_limited']) == (1, 1)
+
+
+def test_gives_up_after_max_retries():
+    scheduler = LLMScheduler(max_retries=2)
+    calls = []
+
+    def always_limited():
+        calls.append(1)
+        raise status_error(429, retry_after=0)
+
+    with pytest.raises(openai.RateLimitError):
+        scheduler.call(always_limited)
+    assert len(calls) == 3
+
+
+def test_non_retryable_error_is_raised_at_once():
+    scheduler = LLMScheduler()
+    calls = []
+
+    def bad_request():
+        calls.append(1)
+        raise status_error(400)
+
+    with pytest.raises(openai.BadRequestError):
+        scheduler.call(bad_request)
+    assert len(calls) == 1
+    assert LLMScheduler.is_fatal(status_error(400)) and not LLMScheduler.is_fatal(status_error(429))
+
+
+def test_map_returns_results_in_input_order():
+    scheduler = LLMScheduler(max_concurrency=4)
+
+    def slow_square(x):
+        time.sleep(0.02 * (5 - x))
+        return x * x
+
+    assert list(scheduler.map(slow_square, range(5))) == [0, 1, 4, 9, 16]
+
+
+def test_map_cancels_pending_tasks_after_error():
+    scheduler = LLMScheduler(max_concurrency=1)
+    calls = []
+
+    def fail_first(x):
+        calls.append(x)
+        if x == 0:
+            raise status_error(400)
+        time.sleep(0.05)
+        return x
+
+    with pytest.raises(openai.BadRequestError):
+        list(scheduler.map(fail_first, range(10)))
+    assert len(calls) < 10
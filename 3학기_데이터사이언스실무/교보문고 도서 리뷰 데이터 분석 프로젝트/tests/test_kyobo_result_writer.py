@@ -0,0 +1,68 @@
+"""감성분석 결과 저널 중단 복구/압축 테스트"""
+
+import os
+
+import pandas as pd
+import pytest
+
+import kyobo_result_writer
+from kyobo_result_writer import ResultWriter
+
+
+def row(review_id, sentiment='긍정', file_name='reviews.csv'):
+    return {'파일명': file_name, '리뷰번호': review_id, '감성': sentiment}
+
+
+def test_torn_last_lines_are_cut_on_restart(tmp_path):
+    path = str(tmp_path / 'result.jsonl')
+    ResultWriter(path).append([row(1), row(2)])
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"파일명": "reviews.csv", "리뷰')
+    with open(f"{path}.idx", 'a', encoding='utf-8') as f:
+        f.write('reviews.csv_')
+
+    writer = ResultWriter(path)
+
+    assert [r['리뷰번호'] for r in writer.iter_rows()] == [1, 2]
+    assert writer.load_keys() == {'reviews.csv_1', 'reviews.csv_2'}
+    writer.append([row(3)])
+    assert writer.load_keys() == {'reviews.csv_1', 'reviews.csv_2', 'reviews.csv_3'}
+
+
+def test_missing_index_is_rebuilt_from_journal(tmp_path):
+    path = str(tmp_path / 'result.jsonl')
+    ResultWriter(path).append([row(1), row(2, file_name='other.csv')])
+    os.remove(f"{path}.idx")
+
+    assert ResultWriter(path).load_keys() == {'reviews.csv_1', 'other.csv_2'}
+
+
+def test_index_key_is_written_only_after_row_is_synced(tmp_path, monkeypatch):
+    path = str(tmp_path / 'result.jsonl')
+    writer = ResultWriter(path)
+    writer.append([row(1)])
+
+    def failing_fsync(fd):
+        raise OSError("디스크 오류")
+
+    monkeypatch.setattr(kyobo_result_writer.os, 'fsync', failing_fsync)
+    with pytest.raises(OSError):
+        writer.append([row(2)])
+
+    assert writer.load_keys() == {'reviews.csv_1'}
+
+
+def test_compact_keeps_last_row_per_key(tmp_path):
+    path = str(tmp_path / 'result.jsonl')
+    csv_path = str(tmp_path / 'result.csv')
+    writer = ResultWriter(path)
+    writer.append([row(1, '오류'), row(2)])
+    writer.append([row(1, '부정')])
+
+    assert writer.compact(csv_path) == 2
+
+    df = pd.read_csv(csv_path)
+    assert df.set_index('리뷰번호')['감성'].to_dict() == {1: '부정', 2: '긍정'}
+    assert [r['감성'] for r in writer.iter_rows()] == ['부정', '긍정']
+    with open(f"{path}.idx", encoding='utf-8') as f:
+        assert f.read().splitlines() == ['reviews.csv_1', 'reviews.csv_2']
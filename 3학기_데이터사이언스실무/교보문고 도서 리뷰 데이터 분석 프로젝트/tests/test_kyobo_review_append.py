@@ -0,0 +1,65 @@
+"""증분 리뷰 수집 시 기존 CSV 컬럼 순서 유지 테스트 (로컬 대역 리뷰 API 서버 사용)"""
+
+import asyncio
+
+import pandas as pd
+from aiohttp import web
+
+from kyobo_book_reviews_async import AsyncReviewCollector
+from kyobo_review_store import ReviewStore
+
+# 기존 수집 파일(scrap_review 출력) 형식
+BASELINE_COLUMNS = ['리뷰번호', '회원ID', '작성일시', '리뷰내용', '감정키워드', '평점']
+
+NEW_REVIEWS = [
+    {'revwNum': 300, 'mmbrId': 'new2', 'cretDttm': '2024-03-02 10:00:00', 'revwRvgr': 4, 'revwCntt': '새 리뷰 둘'},
+    {'revwNum': 200, 'mmbrId': 'new1', 'cretDttm': '2024-03-01 10:00:00', 'revwRvgr': 2, 'revwCntt': '새 리뷰 하나'},
+    {'revwNum': 100, 'mmbrId': 'old1', 'cretDttm': '2024-01-01 10:00:00', 'revwRvgr': 4, 'revwCntt': '기존 리뷰'},
+]
+
+
+async def review_api(request):
+    """최신순 리뷰 목록 1페이지 반환"""
+    return web.json_response({'data': {'reviewList': NEW_REVIEWS, 'totalCount': len(NEW_REVIEWS)}})
+
+
+async def collect_incremental(output_dir):
+    app = web.Application()
+    app.router.add_get('/api/review/list', review_api)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        collector = AsyncReviewCollector(str(output_dir), base_url=f"http://127.0.0.1:{port}/api/review/list",
+                                         incremental=True, rate=100, burst=10)
+        return await collector.collect([('S000000000001', '테스트 도서')])
+    finally:
+        await runner.cleanup()
+
+
+def test_incremental_append_keeps_baseline_columns(tmp_path):
+    file_path = tmp_path / "교보_S000000000001_리뷰_20240101_000000.csv"
+    pd.DataFrame([{'리뷰번호': 100, '회원ID': 'old1', '작성일시': '2024-01-01 10:00:00',
+                   '리뷰내용': '기존 리뷰', '감정키워드': '재미', '평점': 4}],
+                 columns=BASELINE_COLUMNS).to_csv(file_path, index=False, encoding='utf-8-sig')
+
+    results = asyncio.run(collect_incremental(tmp_path))
+    assert results[0]['status'] == 'success'
+    assert results[0]['new_count'] == 2
+
+    df = pd.read_csv(file_path, encoding='utf-8-sig')
+    assert list(df.columns) == BASELINE_COLUMNS
+    assert df['리뷰번호'].tolist() == [100, 300, 200]
+    assert df['리뷰내용'].tolist() == ['기존 리뷰', '새 리뷰 둘', '새 리뷰 하나']
+    assert df['평점'].tolist() == [4, 4, 2]
+    assert df['감정키워드'].iloc[0] == '재미' and df['감정키워드'].iloc[1:].isna().all()
+
+    # 저장소 가져오기도 컬럼명 기준으로 읽음
+    store = ReviewStore(str(tmp_path / "reviews.db"))
+    assert store.import_csv(str(file_path)) == 3
+    stored = store.load(columns=['리뷰번호', '평점', '리뷰내용']).set_index('리뷰번호')
+    assert stored.loc[200, '리뷰내용'] == '새 리뷰 하나'
+    assert stored.loc[200, '평점'] == 2
+    store.close()
@@ -0,0 +1,88 @@
+"""리뷰 비동기 수집 테스트 (canned 리뷰 페이지를 돌려주는 로컬 대역 서버 사용)"""
+
+import asyncio
+import time
+
+import pandas as pd
+from aiohttp import web
+
+from kyobo_book_reviews_async import AsyncReviewCollector
+
+BOOK_CODE = 'S000001'
+
+
+def canned_review(number):
+    """리뷰번호가 클수록 최근에 작성된 리뷰 API 항목"""
+    return {'revwNum': number, 'mmbrId': f"user{number}", 'cretDttm': f"2024-01-{number:02d} 12:00:00",
+            'revwRvgr': 5, 'revwCntt': f"리뷰 {number}"}
+
+
+class CannedReviewServer:
+    """최신순 리뷰 목록을 page/pageLimit 단위로 나눠 응답하는 리뷰 API 대역"""
+
+    def __init__(self, count):
+        self.count = count
+        self.pages = []  # 요청받은 페이지 번호
+        self.times = []  # 요청 도착 시각
+
+    async def handler(self, request):
+        page = int(request.query['page'])
+        limit = int(request.query['pageLimit'])
+        self.pages.append(page)
+        self.times.append(time.monotonic())
+        numbers = list(range(self.count, 0, -1))[(page - 1) * limit:page * limit]
+        return web.json_response({'data': {'reviewList': [canned_review(n) for n in numbers],
+                                           'totalCount': self.count}})
+
+    async def collect(self, output_dir, **kwargs):
+        """서버를 띄우고 AsyncReviewCollector로 도서 1권을 수집한 결과 dict 반환"""
+        app = web.Application()
+        app.router.add_get('/api', self.handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        options = {'rate': 100, 'burst': 10, 'page_limit': 10, 'max_retries': 0, **kwargs}
+        collector = AsyncReviewCollector(output_dir, base_url=f"http://127.0.0.1:{port}/api", **options)
+        try:
+            return (await collector.collect([(BOOK_CODE, '테스트 도서')]))[0]
+        finally:
+            await runner.cleanup()
+
+
+def test_collect_fetches_every_page(tmp_path):
+    server = CannedReviewServer(25)
+    result = asyncio.run(server.collect(str(tmp_path)))
+
+    assert sorted(server.pages) == [1, 2, 3]
+    assert (result['status'], result['review_count']) == ('success', 25)
+    df = pd.read_csv(result['file'], encoding='utf-8-sig')
+    assert sorted(df['리뷰번호']) == list(range(1, 26))
+    assert df.loc[df['리뷰번호'] == 7, '리뷰내용'].item() == '리뷰 7'
+
+
+def test_token_bucket_limits_request_rate(tmp_path):
+    server = CannedReviewServer(60)
+    asyncio.run(server.collect(str(tmp_path), rate=20, burst=2))
+
+    # 버스트 2건은 바로 나가고, 나머지 4건은 초당 20건 속도로 보충된 토큰을 기다림
+    assert len(server.pages) == 6
+    elapsed = server.times[-1] - server.times[0]
+    assert 4 / 20 * 0.8 <= elapsed < 2
+
+
+def test_incremental_stops_at_known_review(tmp_path):
+    server = CannedReviewServer(25)
+    first = asyncio.run(server.collect(str(tmp_path)))
+
+    # 새 리뷰 3개가 올라온 뒤 증분 수집 - 첫 페이지에서 기존 최신 리뷰를 만나면 더 요청하지 않음
+    server.count = 28
+    server.pages = []
+    result = asyncio.run(server.collect(str(tmp_path), incremental=True))
+
+    assert server.pages == [1]
+    assert result['file'] == first['file']
+    assert (result['new_count'], result['review_count']) == (3, 28)
+    df = pd.read_csv(result['file'], encoding='utf-8-sig')
+    assert sorted(df['리뷰번호']) == list(range(1, 29))
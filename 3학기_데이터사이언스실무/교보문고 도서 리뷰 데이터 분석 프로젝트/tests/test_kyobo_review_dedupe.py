@@ -0,0 +1,66 @@
+"""유사 중복 리뷰 탐지 테스트"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from kyobo_review_dedupe import MinHashDeduper
+from mock_llm_server import MockLLMServer, sentiment_item
+
+TEXTS = [
+    '정말 재미있게 잘 읽었습니다 감사합니다',
+    '정말 재미있게 잘 읽었습니다! 감사합니다^^',
+    '배송이 빠르고 포장도 꼼꼼해서 좋았어요',
+    '배송이 빠르고 포장도 꼼꼼해서 좋았어요.',
+    '번역이 어색해서 끝까지 읽기 힘들었어요',
+]
+
+
+def test_near_duplicates_share_first_review_as_representative():
+    assert MinHashDeduper().cluster(TEXTS).tolist() == [0, 0, 2, 2, 4]
+
+
+def test_short_or_symbol_only_reviews_are_not_clustered():
+    assert MinHashDeduper().cluster(['👍', '...', '!!!', '최고', '최고']).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_clusters_do_not_depend_on_hash_seed():
+    code = "from kyobo_review_dedupe import MinHashDeduper; print(MinHashDeduper().signatures(['정말재미있게잘읽었습니다']).tolist())"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    outputs = {subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True,
+                              env={**os.environ, 'PYTHONHASHSEED': seed}).stdout for seed in ('1', '2')}
+    assert len(outputs) == 1
+
+
+def test_find_duplicates_across_frames():
+    frames = [pd.DataFrame({'도서코드': code, '리뷰번호': range(len(texts)), '리뷰내용': texts})
+              for code, texts in (('A', TEXTS[:3]), ('B', TEXTS[3:] + [None, '👍']))]
+    clusters, stats = MinHashDeduper().find_duplicates(iter(frames))
+    assert clusters == {('A', '0'): ('A', '0'), ('A', '1'): ('A', '0'),
+                        ('A', '2'): ('A', '2'), ('B', '0'): ('A', '2')}
+    assert (stats['reviews'], stats['clusters'], stats['duplicates']) == (6, 2, 2)
+
+
+def test_failed_representative_is_not_copied_to_duplicates(make_analyzer):
+    def respond(reviews):
+        # 군집 대표 리뷰의 첫 요청만 실패
+        if len(server.requests) == 1:
+            return 503
+        return json.dumps(sentiment_item(0), ensure_ascii=False)
+
+    chunk = {'file_name': 'reviews.csv', 'book_code': 'B1', 'book_title': '도서',
+             'rows': [(0, {'리뷰번호': '1', '리뷰내용': TEXTS[0]}), (1, {'리뷰번호': '2', '리뷰내용': TEXTS[1]})]}
+    with MockLLMServer(respond) as server:
+        analyzer = make_analyzer(server, max_retries=0)
+        analyzer.duplicate_of = {('B1', '1'): ('B1', '1'), ('B1', '2'): ('B1', '1')}
+        processed_reviews = set()
+        analyzer.analyze_chunk(analyzer.select_pending(chunk, processed_reviews), processed_reviews)
+
+    rows = {row['리뷰번호']: row for row in analyzer.writer.iter_rows()}
+    assert (rows['1']['감성'], rows['1']['분석방식']) == ('오류', 'llm')
+    assert (rows['2']['감성'], rows['2']['분석방식']) == ('긍정', 'llm')
+    assert len(server.requests) == 2
+    assert analyzer.dedupe_stats['propagated'] == 0
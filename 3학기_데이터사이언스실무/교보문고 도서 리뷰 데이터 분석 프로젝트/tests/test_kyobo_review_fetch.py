@@ -0,0 +1,59 @@
+"""리뷰 API 요청 재시도 정책 테스트 (로컬 대역 서버 사용)"""
+
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from kyobo_book_reviews_async import AsyncReviewCollector
+
+
+async def fetch_with_status(status):
+    """항상 status로 응답하는 서버에 요청하고 (결과 또는 예외, 서버가 받은 요청 수) 반환"""
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if status == 200:
+            return web.json_response({'data': {'reviewList': [], 'totalCount': 0}})
+        return web.Response(status=status, headers={'Retry-After': '0'})
+
+    app = web.Application()
+    app.router.add_get('/api', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    collector = AsyncReviewCollector('.', base_url=f"http://127.0.0.1:{port}/api", rate=100, burst=10,
+                                     max_retries=3, backoff_base=0.01)
+    collector.semaphore = asyncio.Semaphore(2)
+    try:
+        async with aiohttp.ClientSession() as session:
+            try:
+                return await collector.fetch_json(session, {'page': 1}), len(calls)
+            except RuntimeError as e:
+                return e, len(calls)
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.parametrize('status', [400, 403, 404])
+def test_client_errors_are_not_retried(status):
+    error, calls = asyncio.run(fetch_with_status(status))
+    assert isinstance(error, RuntimeError) and f"HTTP {status}" in str(error)
+    assert calls == 1
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_throttling_and_server_errors_are_retried(status):
+    error, calls = asyncio.run(fetch_with_status(status))
+    assert isinstance(error, RuntimeError) and "최대 재시도 초과" in str(error)
+    assert calls == 4
+
+
+def test_success_returns_json():
+    payload, calls = asyncio.run(fetch_with_status(200))
+    assert payload == {'data': {'reviewList': [], 'totalCount': 0}}
+    assert calls == 1
@@ -0,0 +1,90 @@
+"""스트리밍 파이프라인 도구(prefetch, ordered_map, ThreadedSink) 테스트"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from kyobo_review_pipeline import ThreadedSink, ordered_map, prefetch
+
+
+def test_prefetch_yields_items_in_order():
+    assert list(prefetch(iter(range(20)), maxsize=2)) == list(range(20))
+
+
+def test_prefetch_reraises_producer_error_after_earlier_items():
+    def producer():
+        yield 1
+        yield 2
+        raise ValueError("읽기 실패")
+
+    consumed = []
+    with pytest.raises(ValueError, match="읽기 실패"):
+        for item in prefetch(producer()):
+            consumed.append(item)
+    assert consumed == [1, 2]
+
+
+def test_prefetch_stops_producer_when_consumer_stops():
+    produced = []
+
+    def endless():
+        while True:
+            produced.append(len(produced))
+            yield produced[-1]
+
+    items = prefetch(endless(), maxsize=2)
+    assert [next(items) for _ in range(3)] == [0, 1, 2]
+    items.close()
+    time.sleep(0.3)
+    count = len(produced)
+    time.sleep(0.3)
+
+    # 큐 크기만큼만 앞서 읽고, 소비하는 쪽이 멈춘 뒤에는 더 읽지 않음
+    assert len(produced) == count <= 3 + 2 + 2
+
+
+def test_ordered_map_keeps_input_order_and_limits_pending():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow_square(x):
+        with lock:
+            running.append(x)
+            peak.append(len(running))
+        time.sleep(0.01 * (x % 3))
+        with lock:
+            running.remove(x)
+        return x * x
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(ordered_map(slow_square, iter(range(12)), executor, max_pending=3))
+
+    assert results == [x * x for x in range(12)]
+    assert max(peak) <= 3
+
+
+def test_sink_saves_every_item_in_order():
+    saved = []
+    with ThreadedSink(saved.extend, maxsize=2) as sink:
+        for i in range(50):
+            sink.put(i)
+    assert saved == list(range(50))
+
+
+def test_sink_error_is_raised_from_put_and_close():
+    def failing_save(batch):
+        raise OSError("디스크 가득 참")
+
+    sink = ThreadedSink(failing_save)
+    sink.put(1)
+    deadline = time.monotonic() + 2
+    while sink.error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    with pytest.raises(OSError):
+        sink.put(2)
+    with pytest.raises(OSError):
+        sink.close()
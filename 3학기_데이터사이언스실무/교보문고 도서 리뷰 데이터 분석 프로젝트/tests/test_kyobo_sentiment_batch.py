@@ -0,0 +1,60 @@
+"""배치 감성분석 재요청/실패 처리 테스트 (OpenAI 호환 대역 서버 사용)"""
+
+import json
+
+import openai
+import pytest
+
+from mock_llm_server import MockLLMServer, sentiment_item
+
+TEXTS = ['정말 재미있어요', '감동적인 이야기', '조금 지루했어요', '번역이 아쉬워요']
+
+
+def test_truncated_and_missing_ids_are_split_and_requested_again(make_analyzer):
+    def respond(reviews):
+        if reviews is None:
+            # 리뷰 1개 요청
+            return json.dumps(sentiment_item(0, '부정'), ensure_ascii=False)
+        if len(reviews) == 4:
+            # 두 번째 항목 중간에서 잘린 응답
+            text = json.dumps([sentiment_item(0), sentiment_item(1)], ensure_ascii=False)
+            return text[:len(text) - 20]
+        # id 1 누락
+        return json.dumps([sentiment_item(0)], ensure_ascii=False)
+
+    with MockLLMServer(respond) as server:
+        results = make_analyzer(server, batch_size=len(TEXTS)).analyze_sentiment_batch(TEXTS)
+
+    assert [result['sentiment'] for result in results] == ['긍정', '긍정', '부정', '부정']
+    assert [reviews and [review['review'] for review in reviews] for reviews in server.requests] == \
+        [TEXTS, TEXTS[1:3], None, None]
+
+
+def test_non_retryable_error_fails_fast_without_splitting(make_analyzer):
+    with MockLLMServer(lambda reviews: 400) as server:
+        with pytest.raises(openai.BadRequestError):
+            make_analyzer(server, batch_size=len(TEXTS)).analyze_sentiment_batch(TEXTS)
+
+    assert len(server.requests) == 1
+
+
+def test_exhausted_retries_mark_batch_as_error_without_splitting(make_analyzer):
+    with MockLLMServer(lambda reviews: 503) as server:
+        results = make_analyzer(server, batch_size=len(TEXTS)).analyze_sentiment_batch(TEXTS)
+
+    assert [result['sentiment'] for result in results] == ['오류'] * len(TEXTS)
+    # 최초 요청 + 스케줄러 재시도 1회
+    assert len(server.requests) == 2
+
+
+def test_failed_requests_are_left_out_of_local_llm_agreement(make_analyzer):
+    def respond(reviews):
+        return 503 if len(server.requests) == 1 else json.dumps(sentiment_item(0), ensure_ascii=False)
+
+    chunk = {'file_name': 'reviews.csv', 'book_code': 'B1', 'book_title': '도서'}
+    pending = [('1', {}, TEXTS[0]), ('2', {}, TEXTS[1])]
+    with MockLLMServer(respond) as server:
+        analyzer = make_analyzer(server, max_retries=0)
+        analyzer.analyze_batches(chunk, pending, {'1': '긍정', '2': '긍정'}, set())
+
+    assert (analyzer.cascade_stats['llm_compared'], analyzer.cascade_stats['llm_agree']) == (1, 1)
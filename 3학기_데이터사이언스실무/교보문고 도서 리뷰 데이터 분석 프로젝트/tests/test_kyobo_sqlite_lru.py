@@ -0,0 +1,30 @@
+"""크기 제한 SQLite 캐시 LRU 삭제 테스트"""
+
+from kyobo_http_cache import ResponseCache
+from kyobo_sentiment_cache import SentimentCache
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'http.db'), max_bytes=25)
+    cache.put('https://a', 'a' * 10)
+    cache.put('https://b', 'b' * 10)
+    assert cache.get('https://a')['body'] == 'a' * 10
+    cache.put('https://c', 'c' * 10)
+
+    assert cache.get('https://b') is None
+    assert cache.get('https://a') is not None and cache.get('https://c') is not None
+    cache.close()
+
+
+def test_sentiment_cache_keeps_results_across_connections(tmp_path):
+    path = str(tmp_path / 'sentiment.db')
+    cache = SentimentCache(path)
+    cache.put_many([('좋아요', {'sentiment': '긍정'}), ('별로예요', {'sentiment': '부정'})], 'model', 'v1')
+    cache.close()
+
+    cache = SentimentCache(path, max_bytes=0)
+    assert cache.get(' 좋아요 ', 'model', 'v1') == {'sentiment': '긍정'}
+    assert cache.get('좋아요', 'model', 'v2') is None
+    cache.put('그저 그래요', 'model', 'v1', {'sentiment': '중립'})
+    assert cache.table.count() == 0
+    cache.close()